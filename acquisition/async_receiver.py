@@ -0,0 +1,272 @@
+"""
+AsyncUDPReceiver: receptor asyncio para muchos ESP32-ADXL345 en un solo hilo.
+Mismo formato de paquete que udp_receiver (PACKET_DTYPE, 100 bytes).
+Exponemos:
+    - Clase AsyncUDPReceiver: un DatagramProtocol para todos los sensores,
+      con un buffer por sensor (demultiplexado por dirección de origen o
+      por una función 'key' propia) y API `async for seq, block in stream(s)`
+    - Seguimiento de seq por sensor (SequenceTracker): paquetes en orden,
+      contadores de pérdidas y stream_released() con índice absoluto
+    - Clase SyncReceiverAdapter: ejecuta el bucle asyncio en un hilo y
+      ofrece get_next(sensor, timeout) síncrono
+    - Función get_packet(timeout=0.05, sensor=None), equivalente a la de
+      udp_receiver pero servida por el receptor asyncio
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+from typing import AsyncIterator, Callable, Hashable
+
+import numpy as np
+
+from acquisition.sequencing import REORDER_WINDOW, Released, SequenceTracker
+from acquisition.udp_receiver import (
+    BATCH_SIZE,
+    PACKET_SIZE,
+    RCVBUF_BYTES,
+    UDP_IP,
+    UDP_PORT,
+    decode_packets,
+)
+
+# ──── 1. CONFIGURACIÓN ─────────────────────────────────────────────
+
+QUEUE_PACKETS = 1024   # paquetes retenidos por sensor (~20 s a 800 Hz)
+
+
+def by_address(addr: tuple, packet: np.ndarray) -> Hashable:
+    """Clave de sensor por defecto: IP de origen del datagrama."""
+    return addr[0]
+
+# ──── 2. BUFFERS POR SENSOR ────────────────────────────────────────
+
+class SensorBuffer:
+    """Cola acotada de paquetes Released (ya en orden) de un sensor."""
+
+    def __init__(self, maxsize: int = QUEUE_PACKETS,
+                 reorder_window: int = REORDER_WINDOW, fill: str | None = None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.tracker  = SequenceTracker(BATCH_SIZE, reorder_window, fill)
+        self.received = 0
+        self.dropped  = 0
+
+    @property
+    def stats(self):
+        """Contadores de pérdidas del sensor (SequenceStats)."""
+        return self.tracker.stats
+
+    def put(self, item) -> None:
+        """Encolar descartando el paquete más antiguo si está llena."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+        self.received += 1
+
+    def wake(self) -> None:
+        """Despertar a un lector bloqueado sin contar ni desplazar datos.
+
+        Un lector solo espera con la cola vacía; si hay paquetes pendientes
+        los consume y ve el cierre sin necesidad del centinela ``None``.
+        """
+        if not self.queue.full():
+            self.queue.put_nowait(None)
+
+# ──── 3. PROTOCOLO Y RECEPTOR ──────────────────────────────────────
+
+class _SensorProtocol(asyncio.DatagramProtocol):
+    def __init__(self, receiver: "AsyncUDPReceiver"):
+        self.receiver = receiver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.receiver._on_datagram(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        print(f"[WARN] AsyncUDPReceiver: {exc}")
+
+
+class AsyncUDPReceiver:
+    """
+    - Un único endpoint UDP atiende a todos los sensores
+    - Cada sensor (según 'key') tiene su propia cola acotada
+    - stream(sensor) es un iterador asíncrono de (seq, ndarray int16 16×3)
+    """
+
+    def __init__(
+        self,
+        ip: str = UDP_IP,
+        port: int = UDP_PORT,
+        key: Callable[[tuple, np.ndarray], Hashable] = by_address,
+        queue_packets: int = QUEUE_PACKETS,
+        rcvbuf: int | None = RCVBUF_BYTES,
+        reorder_window: int = REORDER_WINDOW,
+        fill: str | None = None,
+    ):
+        self.ip            = ip
+        self.port          = port
+        self.key           = key
+        self.queue_packets = queue_packets
+        self.rcvbuf        = rcvbuf
+        self.reorder_window = reorder_window
+        self.fill          = fill
+        self.transport: asyncio.DatagramTransport | None = None
+        self.invalid       = 0
+
+        self._buffers: dict[Hashable, SensorBuffer] = {}
+        self._default_sensor: Hashable | None = None
+        self._first_packet: asyncio.Event | None = None
+        self._closed = False
+
+    # ── API pública ────────────────────────────────────────────────
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._first_packet = asyncio.Event()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        sock.bind((self.ip, self.port))
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _SensorProtocol(self), sock=sock
+        )
+        print(f"[AsyncUDPReceiver] Escuchando en {self.ip}:{self.port}")
+
+    def close(self) -> None:
+        self._closed = True
+        if self.transport is not None:
+            self.transport.close()
+            print("[AsyncUDPReceiver] Socket cerrado.")
+        for buf in self._buffers.values():
+            buf.wake()  # despierta a los stream() pendientes
+
+    def sensors(self) -> list[Hashable]:
+        """Sensores de los que se ha recibido algo (o con suscriptores)."""
+        return list(self._buffers)
+
+    def buffer(self, sensor: Hashable) -> SensorBuffer:
+        """Buffer de un sensor; se crea si aún no existe."""
+        buf = self._buffers.get(sensor)
+        if buf is None:
+            buf = self._buffers[sensor] = SensorBuffer(
+                self.queue_packets, self.reorder_window, self.fill
+            )
+        return buf
+
+    async def stream(self, sensor: Hashable) -> AsyncIterator[tuple[int, np.ndarray]]:
+        """`async for seq, block in receiver.stream(sensor)`"""
+        async for rel in self.stream_released(sensor):
+            yield rel.seq, rel.block
+
+    async def stream_released(self, sensor: Hashable) -> AsyncIterator[Released]:
+        """Como stream() pero con índice absoluto y marcas de hueco/relleno."""
+        buf = self.buffer(sensor)
+        while not self._closed:
+            item = await buf.queue.get()
+            if item is None:
+                break
+            yield item
+
+    async def get_next(self, sensor: Hashable | None = None, timeout: float = 0.05):
+        """
+        Siguiente paquete del sensor (o del primer sensor visto si es None).
+        Lanza socket.timeout si no llega nada en 'timeout' s en total.
+        """
+        if self._first_packet is None:
+            raise RuntimeError("AsyncUDPReceiver no iniciado: llama antes a start()")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            if sensor is None:
+                await asyncio.wait_for(self._first_packet.wait(), timeout)
+                sensor = self._default_sensor
+            queue = self.buffer(sensor).queue
+            if queue.empty():
+                item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0.0))
+            else:
+                item = queue.get_nowait()
+        except asyncio.TimeoutError:
+            raise socket.timeout from None
+        if item is None:
+            raise socket.timeout
+        return item.seq, item.block
+
+    # ── Recepción ─────────────────────────────────────────────────
+    def _on_datagram(self, data: bytes, addr) -> None:
+        if len(data) != PACKET_SIZE:
+            self.invalid += 1
+            return
+        pkt = decode_packets(data, 1)[0]
+        if pkt["cnt"] != BATCH_SIZE:
+            print(f"[WARN] 'count' {pkt['cnt']} ≠ {BATCH_SIZE} desde {addr}")
+
+        sensor = self.key(addr, pkt)
+        buf = self.buffer(sensor)
+        for rel in buf.tracker.push(pkt["seq"], pkt["samples"].copy()):
+            buf.put(rel)
+        if self._default_sensor is None:
+            self._default_sensor = sensor
+            self._first_packet.set()
+
+# ──── 4. ADAPTADOR SÍNCRONO ────────────────────────────────────────
+
+class SyncReceiverAdapter:
+    """Ejecuta un AsyncUDPReceiver en un hilo propio con API bloqueante."""
+
+    def __init__(self, receiver: AsyncUDPReceiver | None = None):
+        self.receiver = receiver or AsyncUDPReceiver()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.receiver.start(), self._loop).result()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self.receiver.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def get_next(self, sensor: Hashable | None = None, timeout: float = 0.05):
+        """Devuelve (seq:int, ndarray 16×3). Lanza socket.timeout si no llega nada."""
+        fut = asyncio.run_coroutine_threadsafe(
+            self.receiver.get_next(sensor, timeout), self._loop
+        )
+        return fut.result()
+
+# ──── 5. Atajo global get_packet() ────────────────────────────────
+_adapter_singleton: SyncReceiverAdapter | None = None
+_singleton_lock = threading.Lock()
+
+def _ensure_adapter():
+    global _adapter_singleton
+    with _singleton_lock:
+        if _adapter_singleton is None:
+            _adapter_singleton = SyncReceiverAdapter()
+            _adapter_singleton.start()
+    return _adapter_singleton
+
+def get_packet(timeout: float = 0.05, sensor: Hashable | None = None):
+    """
+    Igual que udp_receiver.get_packet pero multi-sensor:
+        seq:int, ndarray shape (16,3)
+    """
+    return _ensure_adapter().get_next(sensor, timeout)
+
+# ──── 6. Modo CLI para probar rápidamente ─────────────────────────
+if __name__ == "__main__":
+    async def _main():
+        rx = AsyncUDPReceiver()
+        await rx.start()
+        print("Esperando paquetes… Ctrl+C para salir")
+        while True:
+            await asyncio.sleep(2.0)
+            for sensor in rx.sensors():
+                buf = rx.buffer(sensor)
+                print(f"{sensor}: {buf.received} paquetes, {buf.dropped} descartados, "
+                      f"{buf.stats.lost} perdidos")
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        print("\nBye!")
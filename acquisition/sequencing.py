@@ -0,0 +1,237 @@
+"""
+Seguimiento del número de secuencia uint16 de los paquetes del ESP32.
+Exponemos:
+    - Clase SequenceTracker: desenrolla el seq (wraparound), reordena con una
+      ventana pequeña, cuenta pérdidas / reordenados / duplicados y asigna
+      un índice absoluto de muestra a cada paquete, rellenando huecos
+      opcionalmente ("hold" o "linear")
+    - Función split_on_gaps(index, samples) para que las etapas posteriores
+      sepan dónde reiniciar su estado
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+
+# ──── 1. CONFIGURACIÓN ─────────────────────────────────────────────
+
+SEQ_MODULO       = 1 << 16
+REORDER_WINDOW   = 4      # paquetes retenidos esperando a uno desordenado
+MAX_FILL_PACKETS = 64     # huecos mayores no se rellenan (≈1.3 s a 800 Hz)
+FILL_MODES       = (None, "hold", "linear")
+RESTART_RUN      = 3      # paquetes seguidos muy atrás que confirman un reinicio
+RESTART_JUMP     = 1024   # retroceso (paquetes, ≈20 s) que basta por sí solo
+
+
+class Released(NamedTuple):
+    """Paquete entregado en orden por SequenceTracker."""
+
+    index: int          # índice absoluto de la primera muestra
+    seq: int            # seq original (uint16); -1 si es relleno
+    block: np.ndarray   # muestras (n, 3)
+    gap: bool           # True si hay muestras perdidas justo antes
+    filled: bool        # True si el bloque es relleno sintético
+
+
+class SequenceStats:
+    """Contadores de calidad del enlace de un sensor."""
+
+    def __init__(self):
+        self.received   = 0
+        self.lost       = 0   # paquetes nunca recibidos (o llegados tarde)
+        self.reordered  = 0   # llegaron desordenados pero a tiempo
+        self.duplicates = 0
+        self.late       = 0   # llegaron después de darse por perdidos
+        self.gaps       = 0   # huecos (rachas de paquetes perdidos)
+        self.restarts   = 0   # saltos hacia atrás tratados como reinicio del emisor
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v}" for k, v in vars(self).items())
+        return f"SequenceStats({fields})"
+
+# ──── 2. SEGUIMIENTO DE SECUENCIA ──────────────────────────────────
+
+class SequenceTracker:
+    """
+    - push(seq, block) devuelve la lista de Released listos, en orden
+    - flush() entrega lo retenido en la ventana de reordenación
+    - stats contiene los contadores de pérdidas
+    """
+
+    def __init__(
+        self,
+        samples_per_packet: int,
+        reorder_window: int = REORDER_WINDOW,
+        fill: str | None = None,
+        max_fill_packets: int = MAX_FILL_PACKETS,
+    ):
+        if fill not in FILL_MODES:
+            raise ValueError(f"fill debe ser uno de {FILL_MODES}")
+        self.samples_per_packet = samples_per_packet
+        self.reorder_window     = reorder_window
+        self.fill               = fill
+        self.max_fill_packets   = max_fill_packets
+        self.stats              = SequenceStats()
+
+        self._first: int | None = None      # seq absoluto del primer paquete
+        self._base = 0                      # índice de muestra de _first
+        self._next: int | None = None       # próximo seq absoluto esperado
+        self._highest: int | None = None
+        self._pending: dict[int, tuple[int, np.ndarray]] = {}
+        self._skipped: deque[int] = deque(maxlen=4 * max(reorder_window, 1))
+        self._last_block: np.ndarray | None = None
+        self._gap_pending = False
+        self._backward: list[tuple[int, np.ndarray, int]] = []   # posible reinicio
+
+    def _unwrap(self, seq: int) -> int:
+        if self._highest is None:
+            return seq
+        diff = (seq - self._highest) % SEQ_MODULO
+        if diff >= SEQ_MODULO // 2:
+            diff -= SEQ_MODULO
+        return self._highest + diff
+
+    def push(self, seq: int, block: np.ndarray) -> list[Released]:
+        """Registrar un paquete recibido y devolver los que ya pueden salir."""
+        self.stats.received += 1
+        abs_seq = self._unwrap(int(seq))
+        if self._first is None:
+            self._first = self._next = self._highest = abs_seq
+
+        behind = self._highest - abs_seq
+        if behind > self._skipped.maxlen and abs_seq not in self._skipped:
+            # Muy atrás: o un rezagado o el emisor se reinició. Solo un salto
+            # enorme o una racha de paquetes consecutivos confirma el reinicio
+            return self._backward_run(int(seq), block, abs_seq, behind)
+        self._drop_backward()
+
+        if abs_seq < self._next:
+            if abs_seq in self._skipped:
+                self.stats.late += 1
+            else:
+                self.stats.duplicates += 1
+            return []
+        if abs_seq in self._pending:
+            self.stats.duplicates += 1
+            return []
+
+        if abs_seq < self._highest:
+            self.stats.reordered += 1
+        self._highest = max(self._highest, abs_seq)
+        self._pending[abs_seq] = (int(seq), np.asarray(block))
+
+        out: list[Released] = []
+        self._release(out)
+        while len(self._pending) > self.reorder_window:
+            self._skip_to(min(self._pending), out)
+            self._release(out)
+        return out
+
+    def flush(self) -> list[Released]:
+        """Entregar todo lo retenido, dando por perdidos los huecos."""
+        out: list[Released] = []
+        while self._pending:
+            self._skip_to(min(self._pending), out)
+            self._release(out)
+        return out
+
+    def _backward_run(self, seq: int, block: np.ndarray, abs_seq: int,
+                      behind: int) -> list[Released]:
+        run = self._backward
+        if run and abs_seq != run[-1][2] + 1:
+            self._drop_backward()
+            run = self._backward
+        run.append((seq, np.asarray(block), abs_seq))
+        if behind <= RESTART_JUMP and len(run) < RESTART_RUN:
+            return []   # a la espera de confirmarse
+        self._backward = []
+        self.stats.received -= len(run)   # push() los volverá a contar
+        out = self._restart(run[0][2])
+        for seq, block, _ in run:
+            out += self.push(seq, block)
+        return out
+
+    def _drop_backward(self) -> None:
+        """Una racha hacia atrás que no se confirmó eran rezagados."""
+        self.stats.duplicates += len(self._backward)
+        self._backward = []
+
+    def _restart(self, seq: int) -> list[Released]:
+        """Entregar lo retenido y volver a numerar a partir de ``seq``.
+
+        El índice de muestra sigue creciendo, con un paquete de separación
+        para que ``split_on_gaps`` vea el hueco.
+        """
+        self.stats.restarts += 1
+        self.stats.gaps += 1
+        out = self.flush()
+        self._base = self._index(self._next) + self.samples_per_packet
+        self._first = self._next = self._highest = seq
+        self._skipped.clear()
+        self._last_block = None
+        self._gap_pending = True
+        return out
+
+    def _index(self, abs_seq: int) -> int:
+        return self._base + (abs_seq - self._first) * self.samples_per_packet
+
+    def _release(self, out: list[Released]) -> None:
+        while self._next in self._pending:
+            seq, block = self._pending.pop(self._next)
+            out.append(Released(self._index(self._next), seq, block,
+                                self._gap_pending, False))
+            self._gap_pending = False
+            self._last_block = block
+            self._next += 1
+
+    def _skip_to(self, abs_seq: int, out: list[Released]) -> None:
+        """Declarar perdidos los paquetes [_next, abs_seq)."""
+        missing = abs_seq - self._next
+        if missing <= 0:
+            return
+        self.stats.lost += missing
+        self.stats.gaps += 1
+        last_skipped = min(abs_seq, self._next + self._skipped.maxlen)
+        self._skipped.extend(range(self._next, last_skipped))
+
+        if (self.fill is None or self._last_block is None
+                or missing > self.max_fill_packets):
+            self._gap_pending = True
+        else:
+            n = missing * self.samples_per_packet
+            left = self._last_block[-1].astype(float)
+            if self.fill == "hold":
+                filled = np.repeat(left[None, :], n, axis=0)
+            else:
+                right = self._pending[abs_seq][1][0].astype(float)
+                frac = np.arange(1, n + 1)[:, None] / (n + 1)
+                filled = left + (right - left) * frac
+            filled = filled.astype(self._last_block.dtype)
+            out.append(Released(self._index(self._next), -1, filled, False, True))
+        self._next = abs_seq
+
+# ──── 3. UTILIDADES PARA ETAPAS POSTERIORES ────────────────────────
+
+def split_on_gaps(index: np.ndarray, samples: np.ndarray,
+                  prev_index: int | None = None):
+    """
+    Divide un lote (index (n,), samples (n,3)) en tramos contiguos.
+    Devuelve una lista de (índice_inicial, tramo, hubo_hueco_antes). El
+    primer tramo marca hueco si no continúa a 'prev_index' (último índice
+    del lote anterior, None si no lo hay).
+    """
+    if index.size == 0:
+        return []
+    cuts = np.flatnonzero(np.diff(index) != 1) + 1
+    bounds = np.concatenate(([0], cuts, [index.size]))
+    first_gap = prev_index is not None and int(index[0]) != prev_index + 1
+    return [
+        (int(index[a]), samples[a:b], k > 0 or first_gap)
+        for k, (a, b) in enumerate(zip(bounds[:-1], bounds[1:]))
+    ]
@@ -2,20 +2,26 @@
 UDPReceiver: recibe paquetes UDP de 100 bytes enviados por el ESP32-ADXL345
 Formato: <seq:uint16><cnt:uint16><16*(x:int16,y:int16,z:int16)>
 Exponemos:
-    - Clase UDPReceiver (igual que antes, ahora con get_next)
+    - Clase UDPReceiver (igual que antes, ahora con get_next y get_batch)
     - Función get_packet(timeout=0.05) para consumo directo del dashboard
+    - Función get_batch(max_samples, timeout) para consumir sin pérdidas
+    - Seguimiento de seq (pérdidas, desorden, duplicados) con índice
+      absoluto de muestra; ver acquisition.sequencing
 """
 
 from __future__ import annotations
 
-import os
+import errno
+import select
 import socket
 import struct
 import time
 import threading
-import pandas as pd
 import numpy as np   # ← nuevo para devolver ndarray
 
+from acquisition.sequencing import REORDER_WINDOW, SequenceTracker
+from storage import RawSegmentWriter
+
 # ──── 1. CONFIGURACIÓN ─────────────────────────────────────────────
 
 UDP_IP   = "0.0.0.0"   # escucha en todas las interfaces
@@ -27,28 +33,118 @@ SAMPLE_FMT   = "<" + "hhh" * BATCH_SIZE      # 16 tríadas int16
 HEADER_SIZE  = struct.calcsize(HEADER_FMT)   # 4
 PACKET_SIZE  = HEADER_SIZE + struct.calcsize("hhh") * BATCH_SIZE  # 100 bytes
 
-OUTPUT_CSV            = None                # None = no guardar CSV
+# Vista estructurada de un paquete para decodificar sin objetos Python
+PACKET_DTYPE = np.dtype([
+    ("seq",     "<u2"),
+    ("cnt",     "<u2"),
+    ("samples", "<i2", (BATCH_SIZE, 3)),
+])
+assert PACKET_DTYPE.itemsize == PACKET_SIZE
+
+RAW_DIR               = None                # None = no guardar datos crudos
+RING_CAPACITY         = 16384               # muestras (~20 s a 800 Hz)
+RECV_BATCH            = 64                  # datagramas máx. por despertar
+RCVBUF_BYTES          = 1 << 20             # SO_RCVBUF solicitado (None = SO)
+POLL_TIMEOUT          = 0.2                 # s entre comprobaciones de running
 TIMEOUT_THRESHOLD     = 2.0
 HEALTH_CHECK_INTERVAL = 1.0
+SAMPLE_RATE           = 800                 # Hz, para fechar los bloques crudos
+
+# Datagrama mayor que el buffer: se descarta ese y se sigue drenando
+_MSGSIZE_ERRNOS = {errno.EMSGSIZE, 10040}   # 10040 = WSAEMSGSIZE
+
+# ──── 2. RECEPCIÓN POR LOTES ───────────────────────────────────────
+
+def open_socket(ip: str, port: int, rcvbuf: int | None = RCVBUF_BYTES) -> socket.socket:
+    """Crear el socket UDP no bloqueante, con SO_RCVBUF opcional."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.bind((ip, port))
+    sock.setblocking(False)
+    return sock
+
+
+def new_slab(max_packets: int = RECV_BATCH) -> bytearray:
+    """Buffer reutilizable para recv_packets() (1 byte extra de guarda)."""
+    return bytearray(PACKET_SIZE * max_packets + 1)
+
+
+def decode_packets(buf, count: int = -1, offset: int = 0) -> np.ndarray:
+    """Vista estructurada (seq, cnt, samples[16,3]) sobre ``buf`` sin copias."""
+    return np.frombuffer(buf, dtype=PACKET_DTYPE, count=count, offset=offset)
 
-# ──── 2. CLASE UDPReceiver ─────────────────────────────────────────
+
+def recv_packets(sock: socket.socket, slab: bytearray,
+                 timeout: float = POLL_TIMEOUT) -> np.ndarray:
+    """
+    Espera hasta 'timeout' s y drena todos los datagramas disponibles
+    (hasta llenar 'slab') con recv_into, sin crear objetos bytes.
+    Devuelve una vista estructurada PACKET_DTYPE de los paquetes válidos;
+    la vista se sobrescribe en la siguiente llamada.
+    """
+    ready, _, _ = select.select([sock], [], [], timeout)
+    if not ready:
+        return decode_packets(slab, 0)
+
+    view = memoryview(slab)
+    max_packets = (len(slab) - 1) // PACKET_SIZE
+    n = 0
+    while n < max_packets:
+        off = n * PACKET_SIZE
+        try:
+            # PACKET_SIZE + 1 para detectar datagramas demasiado largos
+            nbytes = sock.recv_into(view[off : off + PACKET_SIZE + 1])
+        except (BlockingIOError, InterruptedError):
+            break
+        except OSError as e:
+            if e.errno in _MSGSIZE_ERRNOS:   # WSAEMSGSIZE en Windows
+                print(f"[WARN] Datagrama descartado: {e}")
+                continue
+            if e.errno == errno.EBADF:       # socket cerrado por stop()
+                break
+            raise
+        if nbytes != PACKET_SIZE:
+            print(f"[WARN] Tamaño {nbytes} ≠ {PACKET_SIZE}. Ignorado.")
+            continue
+        n += 1
+    return decode_packets(slab, n)
+
+# ──── 3. CLASE UDPReceiver ─────────────────────────────────────────
 
 class UDPReceiver:
     """
     - Recibe paquetes UDP y valida tamaño / formato
     - Desempaqueta las 16 muestras (X,Y,Z) en ndarray int16 shape (16,3)
-    - Guarda CSV opcional
+    - Guarda opcionalmente los datos crudos en segmentos binarios (storage)
     - Expone get_next(timeout) para obtener la última trama recibida
+    - Guarda todas las tramas, en orden, en un buffer circular int16 y
+      las entrega con get_batch(max_samples, timeout)
+    - Reordena por seq, cuenta pérdidas (stats) y numera cada muestra con
+      un índice absoluto; los huecos se rellenan si fill="hold"/"linear"
     """
 
-    def __init__(self, ip: str, port: int, output_csv: str | None = OUTPUT_CSV):
+    def __init__(
+        self,
+        ip: str,
+        port: int,
+        raw_dir: str | None = RAW_DIR,
+        ring_capacity: int = RING_CAPACITY,
+        rcvbuf: int | None = RCVBUF_BYTES,
+        reorder_window: int = REORDER_WINDOW,
+        fill: str | None = None,
+        fs: int = SAMPLE_RATE,
+    ):
         self.ip           = ip
+        self.fs           = fs
         self.port         = port
-        self.output_csv   = output_csv
+        self.raw_dir      = raw_dir
+        self.raw_writer   = RawSegmentWriter(raw_dir) if raw_dir else None
+        self.rcvbuf       = rcvbuf
         self.sock         = None
         self.running      = False
 
-        self.last_seq            = None
+        self.tracker             = SequenceTracker(BATCH_SIZE, reorder_window, fill)
         self.last_received_time  = None
         self.alerted             = False
 
@@ -56,10 +152,15 @@ class UDPReceiver:
         self._last_arr: np.ndarray | None = None
         self._last_seq: int | None        = None
         self._lock = threading.Lock()
+        self._data_ready = threading.Condition(self._lock)
 
-        if self.output_csv and not os.path.exists(self.output_csv):
-            pd.DataFrame(columns=["timestamp", "seq", "sample_idx", "x", "y", "z"])\
-              .to_csv(self.output_csv, index=False)
+        # Buffer circular sin pérdidas para get_batch()
+        self._ring = np.zeros((ring_capacity, 3), dtype=np.int16)
+        self._ring_index = np.zeros(ring_capacity, dtype=np.int64)
+        self._written = 0           # muestras escritas desde el arranque
+        self._read = 0              # muestras consumidas desde el arranque
+        self.overflow_samples = 0   # muestras descartadas por desbordamiento
+        self.overflow_events = 0
 
     # ── API pública ────────────────────────────────────────────────
     def start(self):
@@ -73,66 +174,155 @@ class UDPReceiver:
         if self.sock:
             self.sock.close()
             print("[UDPReceiver] Socket cerrado.")
+        if self.raw_writer:
+            self.raw_writer.close()
 
     def get_next(self, timeout: float = 0.05):
         """
         Bloquea hasta 'timeout' s máx. Devuelve (seq:int, ndarray 16×3).
         Lanza socket.timeout si no llega nada.
         """
-        start = time.time()
-        while True:
-            with self._lock:
-                if self._last_arr is not None:
-                    return self._last_seq, self._last_arr.copy()
-            if time.time() - start > timeout:
+        with self._data_ready:
+            if not self._data_ready.wait_for(
+                lambda: self._last_arr is not None, timeout
+            ):
                 raise socket.timeout
-            time.sleep(0.002)
+            return self._last_seq, self._last_arr.copy()
+
+    @property
+    def stats(self):
+        """Contadores de pérdidas / desorden / duplicados (SequenceStats)."""
+        return self.tracker.stats
+
+    def get_batch(self, max_samples: int | None = None, timeout: float = 0.05,
+                  with_index: bool = False):
+        """
+        Devuelve todas las muestras pendientes (hasta max_samples) como un
+        único ndarray int16 contiguo de forma (n, 3), en orden de seq.
+        Con with_index=True devuelve (index (n,) int64, ndarray (n,3)); un
+        salto en index indica muestras perdidas (ver split_on_gaps).
+        Bloquea hasta 'timeout' s si no hay nada pendiente; en ese caso
+        lanza socket.timeout.
+        """
+        with self._data_ready:
+            if not self._data_ready.wait_for(
+                lambda: self._written > self._read, timeout
+            ):
+                raise socket.timeout
+            n = self._written - self._read
+            if max_samples is not None:
+                n = min(n, max_samples)
+            cap = self._ring.shape[0]
+            start = self._read % cap
+            stop = start + n
+            if stop <= cap:
+                out = self._ring[start:stop].copy()
+                idx = self._ring_index[start:stop].copy()
+            else:
+                out = np.concatenate((self._ring[start:], self._ring[: stop - cap]))
+                idx = np.concatenate((self._ring_index[start:],
+                                      self._ring_index[: stop - cap]))
+            self._read += n
+            return (idx, out) if with_index else out
+
+    def pending(self) -> int:
+        """Número de muestras recibidas aún no consumidas por get_batch()."""
+        with self._lock:
+            return self._written - self._read
+
+    def _push(self, packets: np.ndarray, timestamp: float | None = None) -> None:
+        """Guardar tramas PACKET_DTYPE en el buffer circular y despertar lectores."""
+        if packets.size == 0:
+            return
+        packets = packets.copy()   # la vista del slab se reutiliza
+        released = []
+        for pkt in packets:
+            released.extend(self.tracker.push(pkt["seq"], pkt["samples"]))
+        if not released:
+            return
+        if self.raw_writer:
+            # 'ts' es la llegada de la ráfaga, es decir, el final de su
+            # última muestra: cada bloque se fecha hacia atrás según su
+            # índice para que sus intervalos no se solapen
+            ts = time.time() if timestamp is None else timestamp
+            end = released[-1].index + released[-1].block.shape[0]
+            for r in released:
+                start = ts - (end - r.index) / self.fs
+                self.raw_writer.append(r.block, r.seq & 0xFFFF, r.index, start)
+        arr = np.concatenate([r.block for r in released])
+        idx = np.concatenate([
+            np.arange(r.index, r.index + r.block.shape[0]) for r in released
+        ])
+
+        with self._data_ready:
+            cap = self._ring.shape[0]
+            n = arr.shape[0]
+            if n > cap:
+                arr, idx = arr[-cap:], idx[-cap:]
+                self._written += n - cap
+                n = cap
+            start = self._written % cap
+            stop = start + n
+            if stop <= cap:
+                self._ring[start:stop] = arr
+                self._ring_index[start:stop] = idx
+            else:
+                split = cap - start
+                self._ring[start:] = arr[:split]
+                self._ring[: n - split] = arr[split:]
+                self._ring_index[start:] = idx[:split]
+                self._ring_index[: n - split] = idx[split:]
+            self._written += n
+
+            lag = self._written - self._read
+            if lag > cap:
+                self.overflow_samples += lag - cap
+                self.overflow_events  += 1
+                self._read = self._written - cap
+
+            self._last_arr  = packets["samples"][-1]
+            self._last_seq  = int(packets["seq"][-1])
+            self._data_ready.notify_all()
 
     # ── Hilos internos ────────────────────────────────────────────
     def _run(self):
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.sock.bind((self.ip, self.port))
+            self.sock = open_socket(self.ip, self.port, self.rcvbuf)
+            slab = new_slab()
             while self.running:
-                packet, _ = self.sock.recvfrom(1024)
-
-                if len(packet) != PACKET_SIZE:
-                    print(f"[WARN] Tamaño {len(packet)} ≠ {PACKET_SIZE}. Ignorado.")
+                packets = recv_packets(self.sock, slab)
+                if packets.size == 0:
                     continue
 
-                seq, count = struct.unpack_from(HEADER_FMT, packet, 0)
-                if count != BATCH_SIZE:
-                    print(f"[WARN] 'count' {count} ≠ {BATCH_SIZE}")
+                bad = packets["cnt"] != BATCH_SIZE
+                if bad.any():
+                    print(f"[WARN] 'count' {packets['cnt'][bad][0]} ≠ {BATCH_SIZE}")
 
-                samples = struct.unpack_from(SAMPLE_FMT, packet, HEADER_SIZE)
-                arr = np.array(samples, dtype=np.int16).reshape(BATCH_SIZE, 3)
-
-                # actualizar marca temporal y cache para get_next()
-                with self._lock:
-                    self._last_arr  = arr
-                    self._last_seq  = seq
+                # actualizar marca temporal, buffer y cache para get_next()
                 self.last_received_time = time.time()
-
-                # CSV opcional
-                if self.output_csv:
-                    base_ts = int(self.last_received_time * 1000)
-                    df = pd.DataFrame([{
-                        "timestamp":  base_ts,
-                        "seq":        int(seq),
-                        "sample_idx": i,
-                        "x": int(arr[i,0]), "y": int(arr[i,1]), "z": int(arr[i,2])
-                    } for i in range(BATCH_SIZE)])
-                    df.to_csv(self.output_csv, mode="a", header=False, index=False)
+                self._push(packets, self.last_received_time)
 
         except Exception as e:
-            print(f"[ERROR] UDPReceiver _run: {e}")
+            if self.running:
+                print(f"[ERROR] UDPReceiver _run: {e}")
         finally:
             if self.sock:
                 self.sock.close()
 
     def _health_monitor(self):
+        reported_overflows = 0
+        reported_lost = 0
         while self.running:
             time.sleep(HEALTH_CHECK_INTERVAL)
+            stats = self.tracker.stats
+            if stats.lost != reported_lost:
+                reported_lost = stats.lost
+                print(f"[HEALTH] Paquetes perdidos: {stats.lost} "
+                      f"(reordenados {stats.reordered}, duplicados {stats.duplicates})")
+            if self.overflow_events != reported_overflows:
+                reported_overflows = self.overflow_events
+                print(f"[HEALTH] Buffer desbordado: {self.overflow_samples} "
+                      "muestras descartadas en total.")
             if self.last_received_time is None:
                 if not self.alerted:
                     print("[HEALTH] Aún no llegan paquetes.")
@@ -146,7 +336,7 @@ class UDPReceiver:
                 print("[HEALTH] Datos restablecidos.")
                 self.alerted = False
 
-# ──── 3. Atajo global get_packet() para el dashboard ──────────────
+# ──── 4. Atajo global get_packet() para el dashboard ──────────────
 _receiver_singleton: UDPReceiver | None = None
 _singleton_lock = threading.Lock()
 
@@ -154,7 +344,7 @@ def _ensure_receiver():
     global _receiver_singleton
     with _singleton_lock:
         if _receiver_singleton is None:
-            _receiver_singleton = UDPReceiver(UDP_IP, UDP_PORT, output_csv=None)
+            _receiver_singleton = UDPReceiver(UDP_IP, UDP_PORT, raw_dir=None)
             _receiver_singleton.start()
     return _receiver_singleton
 
@@ -166,7 +356,16 @@ def get_packet(timeout: float = 0.05):
     rx = _ensure_receiver()
     return rx.get_next(timeout)
 
-# ──── 4. Modo CLI para probar rápidamente ─────────────────────────
+def get_batch(max_samples: int | None = None, timeout: float = 0.05,
+              with_index: bool = False):
+    """
+    Consume todas las muestras pendientes sin pérdidas:
+        ndarray int16 shape (n,3)  ó  (index (n,), ndarray (n,3))
+    """
+    rx = _ensure_receiver()
+    return rx.get_batch(max_samples, timeout, with_index)
+
+# ──── 5. Modo CLI para probar rápidamente ─────────────────────────
 if __name__ == "__main__":
     print("Esperando paquetes… Ctrl+C para salir")
     try:
@@ -1,4 +1,7 @@
+import sys
+
 from dashboard.live_dashboard import run_dashboard
 
 if __name__ == "__main__":
-    run_dashboard()
\ No newline at end of file
+    # python app.py [nombre_canal]  → leer del canal compartido de real_time.py
+    run_dashboard(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -1,40 +1,132 @@
+from __future__ import annotations
+
+import threading
+from typing import Hashable
+
 import numpy as np
 
 FS = 800  # Hz
 
+class RunningStats:
+    """Media y varianza por eje en memoria constante (Welford por bloques)."""
+
+    def __init__(self, channels: int = 3):
+        self.count = 0
+        self.mean = np.zeros(channels, dtype=float)
+        self._m2 = np.zeros(channels, dtype=float)
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean[:] = 0.0
+        self._m2[:] = 0.0
+
+    def add_block(self, block: np.ndarray) -> None:
+        """Incorporar un bloque (n, ejes) combinando sus estadísticos (Chan et al.)."""
+        arr = np.asarray(block, dtype=float)
+        if arr.ndim == 1:
+            arr = arr[None, :]
+        n = arr.shape[0]
+        if n == 0:
+            return
+        block_mean = arr.mean(axis=0)
+        block_m2 = ((arr - block_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = block_mean - self.mean
+        self.mean += delta * (n / total)
+        self._m2 += block_m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Varianza muestral por eje (NaN con menos de dos muestras)."""
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+
 class Calibration:
     """Gestiona el cálculo de un offset promedio de velocidad."""
 
     def __init__(self, duration_s: float = 2.0):
         self.samples_required = int(duration_s * FS)
         self.offset = np.zeros(3, dtype=float)
-        self._data: list[np.ndarray] = []
+        self.noise = np.full(3, np.nan)  # desviación típica durante la captura
+        self._stats = RunningStats()
         self.capturing = False
+        # El hilo de procesamiento alimenta y cierra la captura mientras la
+        # interfaz puede reiniciarla desde otro hilo
+        self._lock = threading.RLock()
+
+    @property
+    def samples(self) -> int:
+        """Muestras acumuladas en la captura actual."""
+        return self._stats.count
 
     def start_capture(self) -> None:
         """Iniciar la captura de datos para calibrar."""
-        self._data.clear()
-        self.capturing = True
+        with self._lock:
+            self._stats.reset()
+            self.capturing = True
+
+    def add_block(self, block: np.ndarray) -> None:
+        """Agregar un bloque (n, 3) de velocidades; ignora lo que sobre."""
+        if not self.capturing:
+            return
+        arr = np.asarray(block)
+        if arr.ndim == 1:
+            arr = arr[None, :]
+        with self._lock:
+            if not self.capturing:
+                return
+            missing = self.samples_required - self._stats.count
+            self._stats.add_block(arr[:missing])
+            if self._stats.count >= self.samples_required:
+                self.capturing = False
 
     def add_sample(self, sample: np.ndarray) -> None:
         """Agregar una nueva muestra de velocidad."""
-        if self.capturing:
-            self._data.append(sample)
-            if len(self._data) >= self.samples_required:
-                self.capturing = False
+        self.add_block(sample)
 
     def is_complete(self) -> bool:
         """Comprobar si ya se reunieron los datos suficientes."""
-        return not self.capturing and len(self._data) >= self.samples_required
+        return not self.capturing and self._stats.count >= self.samples_required
 
     def compute_offset(self) -> np.ndarray:
         """Calcular y almacenar el offset medio."""
-        if not self.is_complete():
-            raise RuntimeError("Calibración incompleta")
-        arr = np.vstack(self._data)
-        self.offset = np.mean(arr, axis=0)
-        self._data.clear()
-        return self.offset
+        with self._lock:
+            if not self.is_complete():
+                raise RuntimeError("Calibración incompleta")
+            self.offset = self._stats.mean.copy()
+            self.noise = self._stats.std
+            self._stats.reset()
+            return self.offset
+
+    def finish(self) -> bool:
+        """Calcular el offset si la captura acaba de completarse."""
+        with self._lock:
+            if not self.is_complete():
+                return False
+            self.compute_offset()
+            return True
+
+
+_calibrations: dict[Hashable, Calibration] = {}
+
+def get_calibration(sensor: Hashable | None = None) -> Calibration:
+    """Calibración propia de cada sensor (se crea la primera vez)."""
+    cal = _calibrations.get(sensor)
+    if cal is None:
+        cal = _calibrations[sensor] = Calibration()
+    return cal
+
+def calibrations() -> dict[Hashable, Calibration]:
+    """Calibraciones creadas hasta ahora, por sensor."""
+    return dict(_calibrations)
 
 
-calibration = Calibration()
\ No newline at end of file
+# Calibración del sensor por defecto (compatibilidad con el código existente)
+calibration = get_calibration()
@@ -69,13 +69,23 @@ integración trapezoidal.
 # FIN DE INSTRUCCIONES PARA CODEX
 """
 
+from __future__ import annotations
+
 import numpy as np
+from scipy.signal import butter, lfilter, lfilter_zi
 
 # Constantes de conversión
 G_TO_M_S2 = 9.80665  # 1 g = 9.80665 m/s²
 M_S_TO_MM_S = 1000.0  # 1 m/s = 1000 mm/s
 
 
+def _check_shape(accel_array: np.ndarray) -> np.ndarray:
+    arr = np.asarray(accel_array, dtype=float)
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError("accel_array debe ser un array de forma (N, 3)")
+    return arr
+
+
 def acc_to_velocity(accel_array: np.ndarray, fs: int) -> np.ndarray:
     """Convierte un array de aceleraciones en g a velocidades en mm/s por eje.
 
@@ -94,32 +104,85 @@ def acc_to_velocity(accel_array: np.ndarray, fs: int) -> np.ndarray:
     Notes
     -----
     Se asume velocidad inicial cero. La integración se realiza con el
-    método trapezoidal y no se aplica ninguna corrección de deriva.
+    método trapezoidal (suma acumulada sobre los tres ejes a la vez) y no
+    se aplica ninguna corrección de deriva. Para integrar bloques
+    consecutivos sin discontinuidades usar :class:`VelocityIntegrator`.
     """
-    # Validar dimensiones de entrada
-    if accel_array.ndim != 2 or accel_array.shape[1] != 3:
-        raise ValueError("accel_array debe ser un array de forma (N, 3)")
-
-    samples = accel_array.shape[0]
-    dt = 1.0 / fs
+    arr = _check_shape(accel_array)
+    vel_array = np.zeros(arr.shape, dtype=float)
+    if arr.shape[0] < 2:
+        return vel_array
+
+    # Trapecios en m/s → mm/s en un único factor
+    scale = 0.5 * G_TO_M_S2 * M_S_TO_MM_S / fs
+    np.add(arr[1:], arr[:-1], out=vel_array[1:])
+    np.cumsum(vel_array[1:], axis=0, out=vel_array[1:])
+    vel_array[1:] *= scale
+    return vel_array
 
-    vel_array = np.zeros((samples, 3), dtype=float)
 
-    for axis in range(3):
-        # Convertir g a m/s²
-        accel_ms2 = accel_array[:, axis] * G_TO_M_S2
+class VelocityIntegrator:
+    """Integrador trapezoidal con estado para flujos de bloques (N, 3).
 
-        # Integración trapezoidal
-        vel_ms = np.zeros(samples, dtype=float)
-        for n in range(1, samples):
-            vel_ms[n] = vel_ms[n - 1] + 0.5 * (
-                accel_ms2[n] + accel_ms2[n - 1]
-            ) * dt
+    Conserva la última aceleración y la última velocidad entre llamadas, de
+    modo que integrar bloque a bloque produce exactamente el mismo resultado
+    que integrar la señal completa con :func:`acc_to_velocity`.
 
-        # Convertir a mm/s
-        vel_array[:, axis] = vel_ms * M_S_TO_MM_S
+    Parameters
+    ----------
+    fs : int
+        Frecuencia de muestreo en Hz.
+    highpass_hz : float | None
+        Si se indica, aplica un pasa-altos Butterworth de primer orden
+        (causal, con estado) a la velocidad para eliminar la deriva.
+    """
 
-    return vel_array
+    def __init__(self, fs: int, highpass_hz: float | None = None):
+        self.fs = fs
+        self.highpass_hz = highpass_hz
+        self._scale = 0.5 * G_TO_M_S2 * M_S_TO_MM_S / fs
+        self._last_acc: np.ndarray | None = None
+        self._last_vel = np.zeros(3, dtype=float)
+        self._hp_ba = None
+        self._hp_zi: np.ndarray | None = None
+        if highpass_hz is not None:
+            if not 0 < highpass_hz < 0.5 * fs:
+                raise ValueError("highpass_hz debe estar entre 0 y fs/2")
+            self._hp_ba = butter(1, highpass_hz / (0.5 * fs), btype="highpass")
+
+    def reset(self) -> None:
+        """Olvidar el estado (p.ej. tras una pérdida de paquetes)."""
+        self._last_acc = None
+        self._last_vel[:] = 0.0
+        self._hp_zi = None
+
+    def process(self, accel_array: np.ndarray) -> np.ndarray:
+        """Integrar un bloque de aceleraciones (g) y devolver mm/s."""
+        arr = _check_shape(accel_array)
+        n = arr.shape[0]
+        vel = np.empty((n, 3), dtype=float)
+        if n == 0:
+            return vel
+
+        if self._last_acc is None:
+            vel[0] = 0.0
+        else:
+            vel[0] = (arr[0] + self._last_acc) * self._scale
+        np.add(arr[1:], arr[:-1], out=vel[1:])
+        vel[1:] *= self._scale
+        np.cumsum(vel, axis=0, out=vel)
+        vel += self._last_vel
+
+        self._last_acc = arr[-1].copy()
+        self._last_vel[:] = vel[-1]
+
+        if self._hp_ba is None:
+            return vel
+        b, a = self._hp_ba
+        if self._hp_zi is None:
+            self._hp_zi = lfilter_zi(b, a)[:, None] * vel[0]
+        vel, self._hp_zi = lfilter(b, a, vel, axis=0, zi=self._hp_zi)
+        return vel
 
 
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+// Cliente SSE del dashboard: aplica los deltas de /live/stream directamente
+// sobre los gráficos. Mientras la conexión está abierta, window.vibLiveSSE
+// desactiva el sondeo de respaldo de Dash.
+(function () {
+    var RATE_HZ = 20;
+    var RETRY_MS = 500;
+
+    function plot(id) {
+        var el = document.getElementById(id);
+        return el && el.querySelector(".js-plotly-plot");
+    }
+
+    function connect() {
+        var timeDiv = plot("time-graph");
+        var fftDiv = plot("fft-graph");
+        if (!timeDiv || !fftDiv || !window.Plotly) {
+            // Dash aún no ha montado los gráficos
+            setTimeout(connect, RETRY_MS);
+            return;
+        }
+        var width = timeDiv.offsetWidth || window.innerWidth;
+        var source = new EventSource(
+            "/live/stream?rate=" + RATE_HZ + "&width=" + width
+        );
+        source.onopen = function () { window.vibLiveSSE = true; };
+        source.onerror = function () {
+            // EventSource reintenta solo; el servidor reenvía la ventana completa
+            window.vibLiveSSE = false;
+        };
+        source.onmessage = function (event) {
+            var msg = JSON.parse(event.data);
+            if (msg.time.full) {
+                // Ventana completa (conexión nueva): sustituir, no ampliar
+                Plotly.restyle(timeDiv, {x: msg.time.x, y: msg.time.y}, [0, 1, 2]);
+            } else {
+                Plotly.extendTraces(
+                    timeDiv, {x: msg.time.x, y: msg.time.y}, [0, 1, 2],
+                    msg.time.maxPoints
+                );
+            }
+            var update = {y: msg.fft.y};
+            if (msg.fft.x) { update.x = msg.fft.x; }
+            Plotly.restyle(fftDiv, update, [0, 1, 2]);
+        };
+    }
+
+    if (window.EventSource) {
+        window.addEventListener("load", connect);
+    }
+})();
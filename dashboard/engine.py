@@ -0,0 +1,227 @@
+"""Motor de procesamiento del dashboard, desacoplado de los callbacks de Dash.
+
+Un único hilo drena continuamente el receptor UDP, pasa cada lote por un
+``pipeline.Pipeline`` (escala, integra, calibra, filtra) que alimenta la
+ventana y el espectro, y publica instantáneas inmutables. Los callbacks
+solo leen ``latest()``, de modo que N pestañas abiertas cuestan un único
+pipeline y ninguna "roba" paquetes a las demás.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from calibration import Calibration, calibration
+from dashboard.rms_history import RmsHistory
+from live_channel import LiveChannelSubscriber
+from pipeline import (
+    ACC_LSB_TO_G,
+    Bandpass,
+    Calibrate,
+    Chunk,
+    Integrate,
+    Pipeline,
+    Scale,
+    Tap,
+    batch_chunks,
+)
+from ring_buffer import RingBuffer
+from signal_processing import FS, compute_rms, spectral_plan
+from sliding_dft import SlidingDFT
+from spectrogram import StreamingSTFT
+
+PUBLISH_INTERVAL = 0.05  # s mínimos entre instantáneas
+POLL_TIMEOUT = 0.1       # s de espera por datos en cada vuelta
+
+
+class Snapshot(NamedTuple):
+    """Estado publicado por el motor; los arrays son de solo lectura."""
+
+    generation: int
+    timestamp: float
+    samples: int          # muestras procesadas hasta la última de 'velocity'
+    velocity: np.ndarray  # (window, 3) mm/s
+    freqs: np.ndarray     # (bins,) Hz
+    amps: np.ndarray      # (bins, 3) mm/s
+    rms: np.ndarray       # (3,) mm/s
+
+
+def _frozen(arr: np.ndarray) -> np.ndarray:
+    out = np.array(arr, dtype=float)
+    out.flags.writeable = False
+    return out
+
+
+class _EngineThread:
+    """Base común: hilo daemon, arranque perezoso, instantánea atómica e
+    histórico de RMS."""
+
+    def __init__(self, window: int, fs: int = FS):
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._running = False
+        self._generation = 0
+        self.history = RmsHistory()
+        self._updated = threading.Condition()
+        freqs = spectral_plan(window, fs).freqs
+        self._snapshot = Snapshot(
+            0, 0.0, 0, _frozen(np.zeros((window, 3))), _frozen(freqs),
+            _frozen(np.zeros((freqs.size, 3))), _frozen(np.zeros(3)),
+        )
+
+    def ensure_started(self) -> None:
+        """Arrancar el hilo la primera vez que se necesita."""
+        with self._start_lock:
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def waterfall(self):
+        """Cascada ``(tiempos, freqs, amps (F, bins, 3))`` o None si no hay."""
+        return None
+
+    def latest(self) -> Snapshot:
+        """Última instantánea publicada (lectura sin bloqueo)."""
+        return self._snapshot
+
+    def wait_newer(self, generation: int | None, timeout: float) -> Snapshot:
+        """Esperar hasta ``timeout`` s a una instantánea distinta de ``generation``.
+
+        Devuelve siempre la más reciente: si se publicaron varias mientras el
+        llamador estaba ocupado, las intermedias se omiten.
+        """
+        with self._updated:
+            self._updated.wait_for(
+                lambda: self._snapshot.generation != generation, timeout
+            )
+            return self._snapshot
+
+    def _publish(self, samples, velocity, freqs, amps, rms) -> None:
+        self._generation += 1
+        now = time.time()
+        # Asignación atómica de una tupla ya construida: los lectores ven
+        # siempre una instantánea completa, y los que esperan se despiertan.
+        snapshot = Snapshot(
+            self._generation, now, samples, _frozen(velocity), _frozen(freqs),
+            _frozen(amps), _frozen(rms),
+        )
+        with self._updated:
+            self._snapshot = snapshot
+            self._updated.notify_all()
+        self.history.append(now, rms)
+
+    def _run(self) -> None:
+        raise NotImplementedError
+
+
+class ProcessingEngine(_EngineThread):
+    """Pipeline UDP → velocidad → calibración → pasabanda → espectro.
+
+    Parameters
+    ----------
+    source : callable
+        Función ``get_batch(timeout=..., with_index=True)`` que devuelve
+        ``(index, muestras int16 (n, 3))`` o lanza ``socket.timeout``.
+    fs : int
+        Frecuencia de muestreo en Hz.
+    window : int
+        Muestras de la ventana de velocidad y del espectro.
+    cal : Calibration
+        Calibración de offset a aplicar.
+    """
+
+    def __init__(self, source: Callable, fs: int = FS, window: int = FS,
+                 cal: Calibration = calibration):
+        super().__init__(window, fs)
+        self.source = source
+        self.fs = fs
+        self.calibration = cal
+        self.buffer = RingBuffer(window)
+        self.buffer.append(np.zeros((window, 3)))
+        self._window = np.empty((window, 3), dtype=float)
+        self.spectrum = SlidingDFT(window, fs)
+        self.stft = StreamingSTFT(window, fs=fs, averaging="exponential")
+        self._fft_out = np.empty((window // 2 + 1, 3), dtype=float)
+        self._last_index: int | None = None
+        self.pipeline = Pipeline(
+            Scale(ACC_LSB_TO_G),
+            Integrate(fs),
+            Calibrate(cal),
+            Bandpass(fs),
+            Tap(self._update),
+        )
+
+    def _update(self, chunk: Chunk) -> None:
+        self.buffer.append(chunk.data)
+        self.spectrum.update(chunk.data)
+        self.stft.update(chunk.data)
+
+    def process(self, index: np.ndarray, data: np.ndarray) -> np.ndarray:
+        """Procesar un lote crudo y actualizar ventana y espectro.
+
+        Cada tramo contiguo pasa por el pipeline por separado, de modo que
+        integrador y pasabanda se reinician tras un hueco.
+        """
+        out = []
+        for chunk in batch_chunks(index, data, self._last_index):
+            out += self.pipeline.push(chunk)
+        self._last_index = int(index[-1])
+        return np.vstack([c.data for c in out])
+
+    def _run(self) -> None:
+        next_publish = 0.0
+        dirty = False
+        while self._running:
+            try:
+                index, data = self.source(timeout=POLL_TIMEOUT, with_index=True)
+                self.process(index, data)
+                dirty = True
+            except socket.timeout:
+                pass
+            except Exception as e:
+                print(f"[ERROR] ProcessingEngine: {e}")
+            now = time.monotonic()
+            if dirty and now >= next_publish:
+                freqs, amps = self.spectrum.spectrum(out=self._fft_out)
+                window = self.buffer.unwrap(out=self._window)
+                self._publish(self.buffer.total - self.buffer.capacity, window,
+                              freqs, amps, compute_rms(window))
+                next_publish = now + PUBLISH_INTERVAL
+                dirty = False
+
+    def waterfall(self):
+        return self.stft.waterfall()
+
+
+class ChannelFollower(_EngineThread):
+    """Sigue un canal de live_channel publicado por otro proceso."""
+
+    def __init__(self, channel: LiveChannelSubscriber):
+        super().__init__(channel.window)
+        self.channel = channel
+        self._samples = 0
+
+    def _run(self) -> None:
+        generation = None
+        while self._running:
+            snap = self.channel.read(since=generation)
+            if snap is None:
+                time.sleep(PUBLISH_INTERVAL)
+                continue
+            generation = snap.generation
+            # Sin índice de muestra en el canal: cada publicación cuenta
+            # como una ventana completa nueva.
+            self._samples += self.channel.window
+            self._publish(self._samples, snap.velocity, snap.freqs, snap.amps, snap.rms)
@@ -1,24 +1,48 @@
 from __future__ import annotations
 
 import os
-import socket
+from datetime import datetime, timezone
+
 import numpy as np
 import dash
-from dash import dcc, html
+from dash import Patch, dcc, html, no_update
 from dash.dependencies import Input, Output, State
 import plotly.graph_objs as go
 
-from acquisition.udp_receiver import get_packet
-from conversion import acc_to_velocity
-from signal_processing import apply_hanning_window, compute_fft, compute_rms
+from acquisition.udp_receiver import get_batch
 from calibration import calibration
+from dashboard.engine import ChannelFollower, ProcessingEngine
+from dashboard.live_stream import PLOT_WIDTH, fft_delta, register_stream, time_delta
+from live_channel import LiveChannelSubscriber
 
 FS = 800
-ACC_LSB_TO_G = 0.004  # Sensibilidad del ADXL345 en rango ±2g
-BUFFER = np.zeros((FS, 3), dtype=float)
+FALLBACK_MS = 500     # sondeo de respaldo si el navegador no mantiene el SSE
+SLOW_MS = 1000        # tendencia RMS, controles y comprobación del SSE
+
+# Un único motor de procesamiento por servidor; los callbacks solo leen su
+# última instantánea. run_dashboard(channel=...) lo sustituye por un
+# seguidor del canal compartido de otro proceso.
+ENGINE: ProcessingEngine | ChannelFollower = ProcessingEngine(get_batch, FS)
+
+def _empty_figure(xtitle: str, ytitle: str, band: bool = False, **layout) -> go.Figure:
+    """Figura inicial con las trazas vacías; los ticks solo le envían deltas."""
+    fig = go.Figure()
+    for axis in "XYZ":
+        if band:
+            # Banda min/max de los agregados (invisible con puntos crudos)
+            fig.add_trace(go.Scatter(x=[], y=[], mode="lines", line={"width": 0},
+                                     showlegend=False, hoverinfo="skip"))
+            fig.add_trace(go.Scatter(x=[], y=[], mode="lines", line={"width": 0},
+                                     fill="tonexty", showlegend=False,
+                                     hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=[], y=[], mode="lines", name=axis))
+    fig.update_layout(xaxis_title=xtitle, yaxis_title=ytitle, **layout)
+    return fig
 
 app = dash.Dash(__name__)
 app.title = "Monitor de Vibraciones"
+# Canal push principal; assets/live_stream.js lo consume
+register_stream(app, lambda: ENGINE, FS)
 
 app.layout = html.Div(
     [
@@ -30,75 +54,153 @@ app.layout = html.Div(
             ],
             style={"margin": "10px"},
         ),
-        dcc.Graph(id="time-graph"),
-        dcc.Graph(id="rms-graph"),
-        dcc.Graph(id="fft-graph"),
-        dcc.Interval(id="timer", interval=500, n_intervals=0),
-        dcc.Store(id="rms-store", data=[]),
+        dcc.Graph(id="time-graph", figure=_empty_figure(
+            "Tiempo (s)", "Velocidad (mm/s)", uirevision="time")),
+        dcc.Graph(id="rms-graph", figure=_empty_figure(
+            "Hora (UTC)", "RMS (mm/s)", band=True, uirevision="rms")),
+        dcc.Graph(id="fft-graph", figure=_empty_figure(
+            "Frecuencia (Hz)", "Amplitud (mm/s)", uirevision="fft")),
+        # Respaldo: solo se activa si el SSE no está conectado
+        dcc.Interval(id="timer", interval=FALLBACK_MS, n_intervals=0, disabled=True),
+        dcc.Graph(id="waterfall-graph", figure=go.Figure(
+            go.Heatmap(x=[], y=[], z=[], colorscale="Viridis",
+                       colorbar={"title": "mm/s"}),
+            layout={"xaxis_title": "Frecuencia (Hz)", "yaxis_title": "Tiempo (s)",
+                    "uirevision": "waterfall"},
+        )),
+        dcc.Interval(id="slow-timer", interval=SLOW_MS, n_intervals=0),
+        dcc.Store(id="plot-width", data=PLOT_WIDTH),
+        # Por cliente: última instantánea enviada (unos pocos enteros)
+        dcc.Store(id="cursor", data=None),
     ]
 )
 
-def _process_packet() -> np.ndarray:
-    try:
-        _, data = get_packet(timeout=0.05)
-    except socket.timeout:
-        return np.zeros((0, 3))
-    accel_g = data.astype(float) * ACC_LSB_TO_G
-    vel = acc_to_velocity(accel_g, FS)
-    for sample in vel:
-        if calibration.capturing:
-            calibration.add_sample(sample)
-    if calibration.is_complete():
-        calibration.compute_offset()
-    vel -= calibration.offset
-    return vel
+# Ancho real del gráfico, medido una vez en el navegador
+app.clientside_callback(
+    """
+    function(id) {
+        var el = document.getElementById(id);
+        return (el && el.offsetWidth) || window.innerWidth;
+    }
+    """,
+    Output("plot-width", "data"),
+    Input("time-graph", "id"),
+)
+
+# Sondeo de respaldo mientras el SSE (window.vibLiveSSE) no esté abierto.
+# Mientras el SSE dibuja, el cursor del respaldo se anula: al activarse, su
+# primer envío es la ventana completa y sustituye lo que dibujó el SSE.
+app.clientside_callback(
+    """
+    function(_) {
+        var sse = !!window.vibLiveSSE;
+        return [sse, sse ? null : window.dash_clientside.no_update];
+    }
+    """,
+    Output("timer", "disabled"),
+    Output("cursor", "data", allow_duplicate=True),
+    Input("slow-timer", "n_intervals"),
+    prevent_initial_call=True,
+)
+
+def _fft_patch(snap, width: int, full: bool) -> Patch:
+    """Actualización parcial del espectro: solo 'y' salvo que cambie 'x'."""
+    patch = Patch()
+    xs, ys = fft_delta(snap, width, full)
+    for i in range(3):
+        if xs is not None:
+            patch["data"][i]["x"] = xs[i]
+        patch["data"][i]["y"] = ys[i]
+    return patch
+
+def _time_patch(xs, ys) -> Patch:
+    """Sustituir las tres trazas de velocidad (envío completo)."""
+    patch = Patch()
+    for i in range(3):
+        patch["data"][i]["x"] = xs[i]
+        patch["data"][i]["y"] = ys[i]
+    return patch
 
 @app.callback(
+    Output("time-graph", "extendData"),
     Output("time-graph", "figure"),
     Output("fft-graph", "figure"),
-    Output("rms-store", "data"),
+    Output("cursor", "data"),
     Input("timer", "n_intervals"),
-    State("rms-store", "data"),
+    State("plot-width", "data"),
+    State("cursor", "data"),
 )
-def update_signals(_, rms_history):
-    global BUFFER
-    new_vel = _process_packet()
-    if new_vel.size:
-        BUFFER = np.vstack([BUFFER[len(new_vel) :], new_vel])
-    rms_val = compute_rms(BUFFER)
-    rms_history = (rms_history or []) + [rms_val.tolist()]
-
-    freqs, amps = compute_fft(apply_hanning_window(BUFFER), FS)
-
-    t = np.arange(BUFFER.shape[0]) / FS
-    fig_time = go.Figure()
-    for i, axis in enumerate("XYZ"):
-        fig_time.add_trace(go.Scatter(x=t, y=BUFFER[:, i], mode="lines", name=axis))
-    fig_time.update_layout(xaxis_title="Tiempo (s)", yaxis_title="Velocidad (mm/s)")
-
-    fig_fft = go.Figure()
-    for i, axis in enumerate("XYZ"):
-        fig_fft.add_trace(go.Scatter(x=freqs, y=amps[:, i], mode="lines", name=axis))
-    fig_fft.update_layout(xaxis_title="Frecuencia (Hz)", yaxis_title="Amplitud (mm/s)")
-
-    return fig_time, fig_fft, rms_history
-
-@app.callback(Output("rms-graph", "figure"), Input("rms-store", "data"))
-def draw_rms(data):
-    fig = go.Figure()
-    if data:
-        arr = np.array(data)
-        x = list(range(len(arr)))
-        for i, axis in enumerate("XYZ"):
-            fig.add_trace(go.Scatter(x=x, y=arr[:, i], mode="lines", name=axis))
-    fig.update_layout(xaxis_title="Iteración", yaxis_title="RMS (mm/s)")
-    return fig
+def update_signals(_, width, cursor):
+    ENGINE.ensure_started()
+    snap = ENGINE.latest()
+    if snap.generation == 0 or (cursor and cursor["generation"] == snap.generation):
+        return no_update, no_update, no_update, no_update
+    width = int(width or PLOT_WIDTH)
+    # Cliente nuevo o tras reinicio del motor: ventana completa y eje x
+    full = not cursor or cursor["samples"] > snap.samples
+    sent = snap.samples - snap.velocity.shape[0] if full else cursor["samples"]
+    cursor = {"generation": snap.generation, "samples": snap.samples}
+    xs, ys, points = time_delta(snap, sent, width, FS)
+    if full:
+        return no_update, _time_patch(xs, ys), _fft_patch(snap, width, full), cursor
+    extend = (dict(x=xs, y=ys), [0, 1, 2], points)
+    return extend, no_update, _fft_patch(snap, width, full), cursor
+
+def _visible_range(relayout: dict | None) -> tuple[float | None, float | None]:
+    """Rango temporal visible (s epoch) a partir de relayoutData, o (None, None)."""
+    if not relayout or relayout.get("xaxis.autorange"):
+        return None, None
+    bounds = relayout.get("xaxis.range") or [
+        relayout.get("xaxis.range[0]"), relayout.get("xaxis.range[1]")
+    ]
+    if None in bounds:
+        return None, None
+    t0, t1 = (
+        datetime.fromisoformat(str(b)).replace(tzinfo=timezone.utc).timestamp()
+        for b in bounds
+    )
+    return t0, t1
+
+@app.callback(
+    Output("rms-graph", "figure"),
+    Input("slow-timer", "n_intervals"),
+    Input("rms-graph", "relayoutData"),
+    State("plot-width", "data"),
+)
+def draw_rms(_, relayout, width):
+    # El histórico vive en el servidor; solo viaja el tramo visible, con
+    # como mucho un punto por píxel y eje, como actualización parcial.
+    series = ENGINE.history.query(*_visible_range(relayout),
+                                  max_points=int(width or PLOT_WIDTH))
+    x = (series.t * 1000).astype("datetime64[ms]")
+    patch = Patch()
+    for i in range(3):
+        for k, y in enumerate((series.hi, series.lo, series.mean)):
+            patch["data"][3 * i + k]["x"] = x
+            patch["data"][3 * i + k]["y"] = y[:, i]
+    return patch
+
+@app.callback(
+    Output("waterfall-graph", "figure"),
+    Input("slow-timer", "n_intervals"),
+)
+def draw_waterfall(_):
+    # Cascada de la STFT solapada del motor: módulo de los tres ejes
+    data = ENGINE.waterfall()
+    if data is None or data[2].shape[0] == 0:
+        return no_update
+    times, freqs, amps = data
+    patch = Patch()
+    patch["data"][0]["x"] = freqs
+    patch["data"][0]["y"] = times
+    patch["data"][0]["z"] = np.sqrt((amps ** 2).sum(axis=2)).astype(np.float32)
+    return patch
 
 @app.callback(
     Output("btn-cal", "disabled"),
     Input("btn-cal", "n_clicks"),
     Input("btn-stop", "n_clicks"),
-    Input("timer", "n_intervals"),
+    Input("slow-timer", "n_intervals"),
     prevent_initial_call=True,
 )
 def manage_controls(cal_clicks, stop_clicks, _):
@@ -111,12 +213,14 @@ def manage_controls(cal_clicks, stop_clicks, _):
         return True
     if trigger == "btn-stop":
         os._exit(0)
-    if calibration.is_complete():
-        calibration.compute_offset()
-        return False
+    # El motor cierra la captura y calcula el offset; aquí solo se consulta
     return calibration.capturing
 
-def run_dashboard():
+def run_dashboard(channel: str | None = None):
+    """Arrancar Dash; con 'channel' lee del canal compartido en lugar de UDP."""
+    global ENGINE
+    if channel:
+        ENGINE = ChannelFollower(LiveChannelSubscriber(channel))
     app.run(debug=True)
 
 if __name__ == "__main__":
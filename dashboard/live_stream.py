@@ -0,0 +1,127 @@
+"""Actualizaciones en vivo por Server-Sent Events (SSE).
+
+El servidor Flask de Dash expone ``STREAM_ROUTE``: cada cliente mantiene una
+conexión abierta y recibe, en cuanto el motor publica, solo las muestras
+nuevas de velocidad y el espectro actual (``assets/live_stream.js`` los
+aplica con ``Plotly.extendTraces`` / ``Plotly.restyle``). El primer mensaje
+de cada conexión lleva la ventana completa con ``time.full`` y sustituye las
+trazas en lugar de ampliarlas. Así la latencia ya
+no depende del periodo de un ``dcc.Interval`` y un cliente sin novedades no
+genera peticiones.
+
+Cada conexión tiene su propio límite de frecuencia (``rate``, acotado a
+``MAX_RATE_HZ``) y coalesce: si se publicaron varias instantáneas mientras
+esperaba, envía solo la última, con todas las muestras acumuladas desde el
+último envío.
+
+Las funciones ``time_delta`` y ``fft_delta`` son las mismas que usa el
+sondeo de respaldo de ``live_dashboard``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from typing import Callable
+
+import numpy as np
+from flask import Response, request, stream_with_context
+from plotly.utils import PlotlyJSONEncoder
+
+from dashboard.downsample import lttb
+from dashboard.engine import Snapshot
+
+STREAM_ROUTE = "/live/stream"
+DEFAULT_RATE_HZ = 20.0
+MAX_RATE_HZ = 30.0
+KEEPALIVE_S = 15.0
+PLOT_WIDTH = 1000   # px supuestos si el cliente no informa del ancho
+
+
+def time_delta(snap: Snapshot, sent: int, width: int, fs: float):
+    """Muestras de velocidad posteriores a ``sent``, reducidas con LTTB.
+
+    Devuelve ``(x, y, max_points)`` con ``x``/``y`` como listas de tres
+    arrays (un eje por traza), listo para ``extendData``.
+    """
+    window = snap.velocity.shape[0]
+    new = min(snap.samples - sent, window)
+    seg = snap.velocity[window - new:]
+    x = (snap.samples - new + np.arange(new)) / fs
+    # Como mucho ~un punto por píxel en toda la ventana
+    points = min(window, width)
+    n_out = max(3, math.ceil(new * points / window))
+    xs, ys = zip(*(lttb(x, seg[:, i], n_out) for i in range(3)))
+    return list(xs), list(ys), points
+
+
+def fft_delta(snap: Snapshot, width: int, full: bool):
+    """Espectro a enviar: ``(xs | None, ys)``; ``xs`` solo si cambia el eje."""
+    if snap.freqs.size > width:
+        xs, ys = zip(*(lttb(snap.freqs, snap.amps[:, i], width) for i in range(3)))
+        return list(xs), list(ys)
+    ys = [snap.amps[:, i] for i in range(3)]
+    return ([snap.freqs] * 3 if full else None), ys
+
+
+def _param(name: str, default: float, lo: float, hi: float) -> float:
+    try:
+        value = float(request.args.get(name, default))
+    except ValueError:
+        value = default
+    return min(max(value, lo), hi)
+
+
+def _events(get_engine: Callable, fs: float, rate: float, width: int):
+    """Generador SSE de una conexión."""
+    engine = get_engine()
+    engine.ensure_started()
+    period = 1.0 / rate
+    generation = 0      # no hay nada que enviar hasta la primera publicación
+    sent = None
+    next_send = time.monotonic()
+    while True:
+        snap = engine.wait_newer(generation, KEEPALIVE_S)
+        if snap.generation == generation:
+            yield ": keepalive\n\n"
+            continue
+        # Primer envío (o motor reiniciado): ventana completa y eje x
+        full = sent is None or sent > snap.samples
+        if full:
+            sent = snap.samples - snap.velocity.shape[0]
+        tx, ty, points = time_delta(snap, sent, width, fs)
+        fx, fy = fft_delta(snap, width, full)
+        message = {
+            "generation": snap.generation,
+            # full: el cliente debe sustituir las trazas, no ampliarlas
+            "time": {"x": tx, "y": ty, "maxPoints": points, "full": full},
+            "fft": {"x": fx, "y": fy},
+        }
+        yield f"data: {json.dumps(message, cls=PlotlyJSONEncoder)}\n\n"
+        generation, sent = snap.generation, snap.samples
+
+        # Límite por cliente: lo publicado mientras tanto se coalesce
+        next_send = max(next_send, time.monotonic()) + period
+        delay = next_send - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def register_stream(app, get_engine: Callable, fs: float) -> None:
+    """Registrar ``STREAM_ROUTE`` en el servidor Flask de ``app``.
+
+    ``get_engine`` se evalúa en cada conexión, de modo que el dashboard
+    puede sustituir el motor (p. ej. por un ``ChannelFollower``) tras
+    registrar la ruta.
+    """
+
+    @app.server.route(STREAM_ROUTE)
+    def live_stream():
+        rate = _param("rate", DEFAULT_RATE_HZ, 0.1, MAX_RATE_HZ)
+        width = int(_param("width", PLOT_WIDTH, 50, 10_000))
+        return Response(
+            stream_with_context(_events(get_engine, fs, rate, width)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
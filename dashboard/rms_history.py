@@ -0,0 +1,173 @@
+"""Histórico de RMS acotado y multirresolución, guardado en el servidor.
+
+Sustituye al ``dcc.Store`` que crecía sin límite y viajaba entero entre
+navegador y servidor en cada tick. Los puntos recientes se guardan tal cual
+y, para periodos más largos, se mantienen agregados min/max/media por
+intervalos de tiempo fijos. Cada nivel es un ``RingBuffer`` de capacidad
+fija, así que la memoria está acotada por construcción.
+
+``query(t0, t1, max_points)`` elige el nivel más fino que cubre el rango
+visible sin superar ``max_points``; el tamaño de la respuesta no depende de
+cuánto tiempo lleve el dashboard en marcha.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from ring_buffer import RingBuffer
+
+RAW_POINTS = 12_000                  # ~10 min a 20 instantáneas/s
+ROLLUPS = ((1.0, 21_600),            # 1 s durante 6 h
+           (60.0, 10_080))           # 1 min durante 7 días
+MAX_POINTS = 1_000
+
+# Columnas de las filas agregadas: t, min(3), max(3), media(3)
+_ROLLUP_COLUMNS = 10
+
+
+class RmsSeries(NamedTuple):
+    """Resultado de una consulta; ``lo``/``hi`` son iguales a ``mean`` en crudo."""
+
+    t: np.ndarray     # (n,) segundos epoch (inicio del intervalo si agregado)
+    mean: np.ndarray  # (n, 3) mm/s
+    lo: np.ndarray    # (n, 3)
+    hi: np.ndarray    # (n, 3)
+    resolution: float | None  # segundos por punto; None si son puntos crudos
+
+
+class _Rollup:
+    """Un nivel de agregación: intervalo en curso + anillo de cerrados."""
+
+    def __init__(self, width: float, capacity: int):
+        self.width = width
+        self.ring = RingBuffer(capacity, channels=_ROLLUP_COLUMNS)
+        self._bucket: int | None = None
+        self._min = np.empty(3)
+        self._max = np.empty(3)
+        self._sum = np.zeros(3)
+        self._count = 0
+
+    def add(self, t: float, rms: np.ndarray) -> None:
+        bucket = math.floor(t / self.width)
+        if bucket != self._bucket:
+            self._close()
+            self._bucket = bucket
+            self._min[:] = rms
+            self._max[:] = rms
+            self._sum[:] = 0.0
+            self._count = 0
+        np.minimum(self._min, rms, out=self._min)
+        np.maximum(self._max, rms, out=self._max)
+        self._sum += rms
+        self._count += 1
+
+    def _close(self) -> None:
+        if self._count:
+            self.ring.append(np.concatenate((
+                [self._bucket * self.width], self._min, self._max,
+                self._sum / self._count,
+            )))
+            self._count = 0
+
+    def rows(self) -> np.ndarray:
+        """Filas cerradas más el intervalo en curso, en orden cronológico."""
+        rows = self.ring.unwrap()
+        if self._count:
+            current = np.concatenate((
+                [self._bucket * self.width], self._min, self._max,
+                self._sum / self._count,
+            ))
+            rows = np.vstack([rows, current])
+        return rows
+
+
+class RmsHistory:
+    """Histórico de RMS tri-axial con resolución decreciente hacia el pasado.
+
+    Parameters
+    ----------
+    raw_points : int
+        Puntos crudos recientes retenidos.
+    rollups : sequence of (float, int)
+        Niveles agregados como ``(segundos por intervalo, capacidad)``,
+        de más fino a más grueso.
+    """
+
+    def __init__(self, raw_points: int = RAW_POINTS, rollups=ROLLUPS):
+        self._raw = RingBuffer(raw_points, channels=4)
+        self._levels = [_Rollup(w, n) for w, n in sorted(rollups)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._raw.total
+
+    def append(self, t: float, rms: np.ndarray) -> None:
+        """Registrar el RMS ``(3,)`` de la instantánea del instante ``t``."""
+        rms = np.asarray(rms, dtype=float)
+        with self._lock:
+            self._raw.append(np.concatenate(([t], rms)))
+            for level in self._levels:
+                level.add(t, rms)
+
+    def query(self, t0: float | None = None, t1: float | None = None,
+              max_points: int = MAX_POINTS) -> RmsSeries:
+        """Serie del rango ``[t0, t1]`` con como mucho ``max_points`` puntos."""
+        with self._lock:
+            raw = self._raw.unwrap()
+            candidates = [(None, raw, self._raw.is_full())] + [
+                (lv.width, lv.rows(), lv.ring.is_full()) for lv in self._levels
+            ]
+
+        if t0 is None:
+            t0 = min((rows[0, 0] for _, rows, _ in candidates if len(rows)), default=0.0)
+        if t1 is None:
+            t1 = math.inf
+
+        chosen = None
+        for width, rows, full in candidates:
+            if not len(rows):
+                continue
+            # Un nivel cubre el rango si su dato más antiguo es anterior a t0
+            # o si nunca ha descartado nada.
+            covers = rows[0, 0] <= t0 or not full
+            sel = rows[(rows[:, 0] >= t0 - (width or 0.0)) & (rows[:, 0] <= t1)]
+            chosen = (width, sel)
+            if covers and sel.shape[0] <= max_points:
+                break
+
+        if chosen is None:
+            empty = np.empty((0, 3))
+            return RmsSeries(np.empty(0), empty, empty, empty, None)
+        width, sel = chosen
+        if width is None:
+            t, mean = sel[:, 0], sel[:, 1:4]
+            series = RmsSeries(t, mean, mean, mean, None)
+        else:
+            series = RmsSeries(sel[:, 0], sel[:, 7:10], sel[:, 1:4], sel[:, 4:7], width)
+        return _reduce(series, max_points)
+
+
+def _reduce(series: RmsSeries, max_points: int) -> RmsSeries:
+    """Agrupar puntos consecutivos si aún se supera ``max_points``."""
+    n = series.t.size
+    if n <= max_points:
+        return series
+    k = -(-n // max_points)
+    starts = np.arange(0, n, k)
+    counts = np.diff(np.append(starts, n))[:, None]
+    if series.resolution is None:
+        resolution = (series.t[-1] - series.t[0]) / (n - 1) * k
+    else:
+        resolution = series.resolution * k
+    return RmsSeries(
+        series.t[starts],
+        np.add.reduceat(series.mean, starts, axis=0) / counts,
+        np.minimum.reduceat(series.lo, starts, axis=0),
+        np.maximum.reduceat(series.hi, starts, axis=0),
+        resolution,
+    )
@@ -1,45 +1,39 @@
-import socket
-import struct
-import numpy as np
-
-from calibration import calibration
-from conversion import acc_to_velocity
-from signal_processing import apply_hanning_window, compute_rms, compute_fft
+from acquisition.udp_receiver import UDPReceiver
+from pipeline import (
+    ACC_LSB_TO_G,
+    Calibrate,
+    Integrate,
+    Pipeline,
+    Scale,
+    Spectrum,
+    Window,
+    udp_source,
+)
 
 FS = 800
-ACC_LSB_TO_G = 0.004  # Sensibilidad del ADXL345 en rango ±2g
 
 HOST = ""          # 0.0.0.0  → todas las interfaces
 PORT = 5005
-
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-sock.bind((HOST, PORT))
-
-PKT_SIZE = 4 + 16 * 6  # 100 bytes
-fmt_head = "<HH"      # seq (uint16), cnt (uint16)
-fmt_block = "<hhh"    # x,y,z (int16)
-
-while True:
-    data, addr = sock.recvfrom(PKT_SIZE)
-    if len(data) != PKT_SIZE:
-        print("Paquete incompleto")
-        continue
-
-    seq, cnt = struct.unpack_from(fmt_head, data, 0)
-    samples = struct.iter_unpack(fmt_block, data[4:])
-    arr = np.array(list(samples), dtype=np.int16)
-
-    accel_g = arr.astype(float) * ACC_LSB_TO_G
-    vel = acc_to_velocity(accel_g, FS)
-
-    for sample in vel:
-        if calibration.capturing:
-            calibration.add_sample(sample)
-
-    if calibration.is_complete():
-        calibration.compute_offset()
-
-    vel -= calibration.offset
-    rms = compute_rms(vel)
-    freqs, amps = compute_fft(apply_hanning_window(vel), FS)
-    print(f"Seq {seq:5d}  RMS_x={rms[0]:.1f}")
\ No newline at end of file
+WINDOW = FS        # muestras analizadas en cada FFT (1 s)
+QUEUE_SIZE = 64    # bloques recibidos en espera de procesarse
+
+pipe = Pipeline(
+    Scale(ACC_LSB_TO_G),
+    Integrate(FS),
+    Calibrate(),
+    Window(WINDOW),          # analizar tras cada bloque, con la ventana llena
+    Spectrum(FS),
+)
+
+# El receptor ordena por seq y numera las muestras: los huecos por paquetes
+# perdidos llegan a las etapas como Chunk.gap y reinician su estado.
+receiver = UDPReceiver(HOST or "0.0.0.0", PORT, raw_dir=None)
+receiver.start()
+
+# La recepción corre en su propio hilo; la cola acotada la frena si el
+# análisis se retrasa (el exceso queda en el buffer circular del receptor).
+try:
+    for analysis in pipe.run(udp_source(receiver.get_batch), queue_size=QUEUE_SIZE):
+        print(f"Muestra {analysis.index:7d}  RMS_x={analysis.rms[0]:.1f}")
+finally:
+    receiver.stop()
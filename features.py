@@ -0,0 +1,199 @@
+"""Indicadores de condición de vibración por ventana.
+
+Calcula en una sola pasada vectorizada sobre un lote ``(B, N, 3)`` los
+indicadores habituales de monitorización: RMS, pico, pico a pico, factor de
+cresta, asimetría (skewness), curtosis y RMS en bandas de frecuencia (ISO
+10816 y la banda de proceso ``DEFAULT_FMIN``–``DEFAULT_FMAX``). Las bandas se
+obtienen del espectro de :func:`signal_processing.compute_fft_batch`, que
+puede pasarse ya calculado para no repetir la FFT.
+
+``StreamingFeatures`` ofrece lo mismo de forma incremental a partir de
+sumas acumuladas, para ir alimentándolo paquete a paquete.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from signal_processing import (
+    DEFAULT_FMAX,
+    DEFAULT_FMIN,
+    FS,
+    compute_fft_batch,
+    spectral_plan,
+)
+
+# Bandas de RMS en Hz. Se recortan a Nyquist al calcularlas.
+ISO_BANDS: dict[str, tuple[float, float]] = {
+    "iso_10_1000": (10.0, 1000.0),   # ISO 10816, máquinas > 600 rpm
+    "iso_2_1000": (2.0, 1000.0),     # ISO 10816, máquinas lentas (120–600 rpm)
+    "proceso": (DEFAULT_FMIN, DEFAULT_FMAX),
+}
+
+
+class Features(NamedTuple):
+    """Indicadores por ventana y eje; cada campo tiene forma ``(B, 3)``."""
+
+    rms: np.ndarray
+    peak: np.ndarray
+    peak_to_peak: np.ndarray
+    crest: np.ndarray
+    skewness: np.ndarray
+    kurtosis: np.ndarray        # de Pearson: 3 para ruido gaussiano
+    bands: dict[str, np.ndarray]  # RMS por banda, cada uno (B, 3)
+
+
+def band_rms(
+    freqs: np.ndarray,
+    amps: np.ndarray,
+    bands: dict[str, tuple[float, float]] = ISO_BANDS,
+    power: float = 1.0,
+    n: int | None = None,
+) -> dict[str, np.ndarray]:
+    """RMS por banda a partir de un espectro de amplitud.
+
+    ``amps`` tiene la normalización de :func:`compute_fft` (2/N, 1/N en DC
+    y Nyquist) y forma ``(..., bins, 3)``. ``power`` es la potencia media de
+    la ventana usada (``SpectralPlan.power``) para compensar su pérdida de
+    energía, y ``n`` la longitud de la ventana (por defecto, la par que
+    corresponde a ``bins``). Por Parseval, la media cuadrática de un bin
+    interior es ``a²/2`` y la de DC/Nyquist ``a²``.
+    """
+    freqs = np.asarray(freqs)
+    amps = np.asarray(amps, dtype=float)
+    if n is None:
+        n = 2 * (freqs.size - 1)
+    weight = np.full(freqs.size, 0.5)
+    weight[0] = 1.0
+    if n % 2 == 0 and n > 0:
+        weight[-1] = 1.0
+    ms = amps ** 2 * (weight[:, None] / power)
+
+    out = {}
+    for name, (fmin, fmax) in bands.items():
+        mask = (freqs >= fmin) & (freqs <= fmax)
+        out[name] = np.sqrt(ms[..., mask, :].sum(axis=-2))
+    return out
+
+
+def _shape_features(m2c, m3c, m4c, peak, lo, hi, ms):
+    """Indicadores a partir de momentos centrales, extremos y media cuadrática."""
+    rms = np.sqrt(ms)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crest = peak / rms
+        skew = m3c / m2c ** 1.5
+        kurt = m4c / m2c ** 2
+    return rms, peak, hi - lo, crest, skew, kurt
+
+
+def extract_features(
+    windows: np.ndarray,
+    fs: int = FS,
+    bands: dict[str, tuple[float, float]] = ISO_BANDS,
+    window: str | None = "hann",
+    amps: np.ndarray | None = None,
+) -> Features:
+    """Calcular todos los indicadores de un lote ``(B, N, 3)``.
+
+    Parameters
+    ----------
+    windows : np.ndarray, shape (B, N, 3)
+        Ventanas de velocidad (mm/s) sin ventana aplicada.
+    fs : int
+        Frecuencia de muestreo en Hz.
+    bands : dict
+        Bandas ``nombre -> (fmin, fmax)`` para el RMS por banda.
+    window : str | None
+        Ventana usada en la FFT para las bandas.
+    amps : np.ndarray, shape (B, N//2 + 1, 3), opcional
+        Espectro ya calculado con ``compute_fft_batch(windows, fs, window)``.
+    """
+    arr = np.asarray(windows, dtype=float)
+    if arr.ndim != 3 or arr.shape[2] != 3:
+        raise ValueError("windows debe ser un array de forma (B, N, 3)")
+
+    mean = arr.mean(axis=1, keepdims=True)
+    centered = arr - mean
+    sq = centered ** 2
+    m2c = sq.mean(axis=1)
+    m3c = (sq * centered).mean(axis=1)
+    m4c = (sq * sq).mean(axis=1)
+    hi = arr.max(axis=1)
+    lo = arr.min(axis=1)
+    peak = np.maximum(hi, -lo)
+    ms = m2c + mean[:, 0] ** 2
+
+    if amps is None:
+        freqs, amps = compute_fft_batch(arr, fs, window)
+    else:
+        freqs = spectral_plan(arr.shape[1], fs).freqs
+    power = spectral_plan(arr.shape[1], fs, window).power
+
+    return Features(
+        *_shape_features(m2c, m3c, m4c, peak, lo, hi, ms),
+        band_rms(freqs, amps, bands, power, arr.shape[1]),
+    )
+
+
+class StreamingFeatures:
+    """Indicadores acumulados bloque a bloque desde el último ``reset()``.
+
+    Mantiene sumas de potencias (desplazadas respecto a la primera media
+    observada, para conservar precisión) y extremos por eje, de modo que
+    cada bloque cuesta O(bloque) y la memoria es constante.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self._shift: np.ndarray | None = None
+        self._sums = np.zeros((4, 3))    # Σd, Σd², Σd³, Σd⁴ con d = x - shift
+        self._hi = np.full(3, -np.inf)
+        self._lo = np.full(3, np.inf)
+
+    def add_block(self, block: np.ndarray) -> None:
+        """Incorporar un bloque ``(n, 3)``."""
+        arr = np.asarray(block, dtype=float)
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError("block debe ser un array de forma (n, 3)")
+        if arr.shape[0] == 0:
+            return
+        if self._shift is None:
+            self._shift = arr.mean(axis=0)
+        d = arr - self._shift
+        d2 = d * d
+        self._sums[0] += d.sum(axis=0)
+        self._sums[1] += d2.sum(axis=0)
+        self._sums[2] += (d2 * d).sum(axis=0)
+        self._sums[3] += (d2 * d2).sum(axis=0)
+        np.maximum(self._hi, arr.max(axis=0), out=self._hi)
+        np.minimum(self._lo, arr.min(axis=0), out=self._lo)
+        self.count += arr.shape[0]
+
+    def features(self, spectrum=None, bands: dict[str, tuple[float, float]] = ISO_BANDS,
+                 power: float = 1.0, n: int | None = None) -> Features:
+        """Indicadores actuales con forma ``(1, 3)`` por campo.
+
+        ``spectrum`` es un ``(freqs, amps)`` opcional (p. ej. de
+        ``SlidingDFT.spectrum()``) del que sacar el RMS por banda, con
+        ``power`` y ``n`` como en :func:`band_rms`.
+        """
+        if self.count == 0:
+            raise ValueError("No hay muestras acumuladas")
+        s1, s2, s3, s4 = self._sums / self.count   # momentos brutos de d
+        m2c = s2 - s1 ** 2
+        m3c = s3 - 3 * s1 * s2 + 2 * s1 ** 3
+        m4c = s4 - 4 * s1 * s3 + 6 * s1 ** 2 * s2 - 3 * s1 ** 4
+        mean = self._shift + s1
+        ms = m2c + mean ** 2
+        peak = np.maximum(self._hi, -self._lo)
+        values = _shape_features(m2c, m3c, m4c, peak, self._lo, self._hi, ms)
+        band_values = {} if spectrum is None else band_rms(*spectrum, bands, power, n)
+        return Features(
+            *(v[None, :] for v in values),
+            {k: np.atleast_2d(v) for k, v in band_values.items()},
+        )
@@ -81,7 +81,8 @@ es extraer el espectro de frecuencias (positivas) y sus amplitudes para cada eje
 """
 
 import numpy as np
-from signal_processing import compute_fft
+from peaks import find_peaks
+from signal_processing import apply_hanning_window, compute_fft, get_window
 
 
 if __name__ == "__main__":
@@ -95,12 +96,15 @@ if __name__ == "__main__":
     test_signal[:, 1] = 3.0 * np.sin(2 * np.pi * 46.34 * t) + 0.5 * np.random.standard_normal(N)
     test_signal[:, 2] = 2.0 * np.sin(2 * np.pi * 11.59 * t) + 0.5 * np.random.standard_normal(N)
 
-    freqs, amps = compute_fft(test_signal, fs)
+    freqs, amps = compute_fft(apply_hanning_window(test_signal), fs)
 
+    # Pico dominante con interpolación sub-bin (bins de 1 Hz); la amplitud
+    # se corrige por la ganancia coherente de la ventana
+    peaks = find_peaks(freqs, amps, k=1)
+    gain = get_window("hann", N).mean()
     for axis, label in enumerate(("X", "Y", "Z")):
-        idx_peak = np.argmax(amps[:, axis])
         print(
-            f"Eje {label}: frecuencia dominante = {freqs[idx_peak]:.2f} Hz, "
-            f"amplitud = {amps[idx_peak, axis]:.4f} mm/s"
+            f"Eje {label}: frecuencia dominante = {peaks.freqs[0, axis]:.2f} Hz, "
+            f"amplitud = {peaks.amps[0, axis] / gain:.4f} mm/s"
         )
     print("FFT completada con éxito.")
\ No newline at end of file
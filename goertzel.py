@@ -0,0 +1,194 @@
+"""Análisis en frecuencias seleccionadas: banco tipo Goertzel y zoom FFT.
+
+En los motores nos interesan unas pocas decenas de frecuencias conocidas
+(1×, 2× de la velocidad de giro, red eléctrica, órdenes de defecto de
+rodamiento). En lugar de calcular y enviar el espectro completo cada tick:
+
+- ``targeted_dft``: amplitud y fase en una lista arbitraria de frecuencias
+  (no limitadas a múltiplos de ``fs/N``) para lotes ``(…, N, 3)``, con una
+  única multiplicación matricial contra exponenciales cacheadas. Da lo mismo
+  que un banco de filtros de Goertzel, vectorizado.
+- ``ToneTracker``: la misma medida sobre una ventana deslizante, actualizada
+  con cada paquete en O(frecuencias × muestras_nuevas), como
+  ``SlidingDFT`` pero en frecuencias arbitrarias.
+- ``zoom_fft``: espectro denso en una banda estrecha (transformada chirp-z).
+
+Las amplitudes son de pico y están corregidas por la ganancia coherente de
+la ventana, así que un tono ``A·sin(2πft)`` da ``A``. La fase se refiere al
+instante de la primera muestra de la ventana (en ``ToneTracker``, al
+inicio del flujo), con la convención de ``cos``.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from scipy.signal import ZoomFFT
+
+from signal_processing import FS, get_window
+
+
+class Tones(NamedTuple):
+    freqs: np.ndarray   # (K,) Hz
+    amps: np.ndarray    # (..., K, 3) amplitud de pico
+    phases: np.ndarray  # (..., K, 3) rad
+
+
+def order_frequencies(shaft_hz: float, orders=(1, 2, 3), line_hz: float | None = 50.0):
+    """Frecuencias de interés típicas: órdenes de giro y, opcionalmente, red (1× y 2×)."""
+    freqs = [shaft_hz * o for o in orders]
+    if line_hz:
+        freqs += [line_hz, 2 * line_hz]
+    return np.array(freqs, dtype=float)
+
+
+@lru_cache(maxsize=32)
+def _kernel(freqs: tuple[float, ...], n: int, fs: float, window: str | None) -> np.ndarray:
+    """Matriz ``(K, N)`` de ventana × exponenciales, normalizada a amplitud de pico."""
+    omega = 2 * np.pi * np.asarray(freqs) / fs
+    win = np.ones(n) if window is None else get_window(window, n)
+    kernel = np.exp(-1j * omega[:, None] * np.arange(n)[None, :]) * win[None, :]
+    kernel *= 2.0 / win.sum()
+    kernel.flags.writeable = False
+    return kernel
+
+
+def _tones(freqs, X) -> Tones:
+    return Tones(freqs, np.abs(X), np.angle(X))
+
+
+def targeted_dft(signal: np.ndarray, freqs, fs: float = FS,
+                 window: str | None = "hann") -> Tones:
+    """Amplitud y fase de ``signal`` (``(N, 3)`` o ``(B, N, 3)``) en ``freqs``."""
+    arr = np.asarray(signal, dtype=float)
+    if arr.ndim not in (2, 3) or arr.shape[-1] != 3:
+        raise ValueError("signal debe tener forma (N, 3) o (B, N, 3)")
+    freqs = np.asarray(freqs, dtype=float)
+    kernel = _kernel(tuple(freqs), arr.shape[-2], float(fs), window)
+    return _tones(freqs, kernel @ arr)
+
+
+class ToneTracker:
+    """Amplitud y fase de frecuencias fijas sobre una ventana deslizante.
+
+    Mantiene la DFT (sin ventana) de la ventana en ``f`` y en ``f ± fs/n``, y
+    aplica la ventana de Hann periódica en frecuencia, como ``SlidingDFT``.
+    Cada ``resync_every`` muestras recalcula el estado de forma exacta.
+
+    Parameters
+    ----------
+    freqs : array_like
+        Frecuencias a seguir (Hz), cualesquiera.
+    n : int
+        Longitud de la ventana.
+    fs : float
+        Frecuencia de muestreo.
+    window : str | None
+        ``"hann"`` o ``None``.
+    resync_every : int | None
+        Muestras entre recálculos exactos (por defecto ``n``).
+    """
+
+    def __init__(self, freqs, n: int = FS, fs: float = FS,
+                 window: str | None = "hann", resync_every: int | None = None):
+        if window not in ("hann", None):
+            raise ValueError("window debe ser 'hann' o None")
+        self.freqs = np.asarray(freqs, dtype=float)
+        self.n = n
+        self.fs = fs
+        self.window = window
+        self.resync_every = resync_every or n
+
+        # Frecuencias internas: f, y sus vecinas a ±1 bin si hay ventana
+        step = fs / n
+        inner = [self.freqs]
+        if window == "hann":
+            inner += [self.freqs - step, self.freqs + step]
+        self._omega = 2 * np.pi * np.concatenate(inner) / fs
+        self._rot_n = np.exp(-1j * self._omega * n)[:, None]
+        self._buf = np.zeros((n, 3))
+        self._pos = 0
+        self._X = np.zeros((self._omega.size, 3), dtype=complex)
+        self._since_resync = 0
+        self.samples = 0   # muestras recibidas (índice absoluto de la siguiente)
+
+    def reset(self) -> None:
+        self._buf[:] = 0.0
+        self._pos = 0
+        self._X[:] = 0.0
+        self._since_resync = 0
+        self.samples = 0
+
+    def resync(self) -> None:
+        """Recalcular la DFT de la ventana actual de forma exacta."""
+        ordered = np.roll(self._buf, -self._pos, axis=0)
+        j = np.arange(self.n)
+        self._X[:] = np.exp(-1j * self._omega[:, None] * j[None, :]) @ ordered
+        self._since_resync = 0
+
+    def update(self, block: np.ndarray) -> None:
+        """Incorporar ``(m, 3)`` muestras nuevas."""
+        arr = np.asarray(block, dtype=float)
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError("block debe ser un array de forma (m, 3)")
+        m = arr.shape[0]
+        if m == 0:
+            return
+        self.samples += m
+        if m >= self.n:
+            self._buf[:] = arr[-self.n:]
+            self._pos = 0
+            self.resync()
+            return
+
+        # X' = e^{iωm} · (X - Σ_{j<m} x_j e^{-iωj} + Σ_{j<m} x_{n+j} e^{-iω(n+j)})
+        idx = (self._pos + np.arange(m)) % self.n
+        phase = np.exp(-1j * self._omega[:, None] * np.arange(m)[None, :])
+        self._X -= phase @ self._buf[idx]
+        self._X += (self._rot_n * phase) @ arr
+        self._X *= np.exp(1j * self._omega * m)[:, None]
+
+        self._buf[idx] = arr
+        self._pos = (self._pos + m) % self.n
+        self._since_resync += m
+        if self._since_resync >= self.resync_every:
+            self.resync()
+
+    def tones(self) -> Tones:
+        """Amplitud y fase actuales ``(K, 3)``; fase referida al inicio del flujo."""
+        k = self.freqs.size
+        X = self._X[:k]
+        gain = self.n
+        if self.window == "hann":
+            X = 0.5 * X - 0.25 * (self._X[k:2 * k] + self._X[2 * k:])
+            gain = 0.5 * self.n
+        X = X * (2.0 / gain)
+        # La DFT está referida al inicio de la ventana; pasarla al inicio del flujo
+        start = self.samples - self.n
+        X = X * np.exp(-1j * 2 * np.pi * self.freqs * start / self.fs)[:, None]
+        return _tones(self.freqs, X)
+
+
+@lru_cache(maxsize=16)
+def _zoom_plan(n: int, f1: float, f2: float, m: int, fs: float) -> ZoomFFT:
+    return ZoomFFT(n, (f1, f2), m, fs=fs, endpoint=True)
+
+
+def zoom_fft(signal: np.ndarray, f1: float, f2: float, m: int = 256,
+             fs: float = FS, window: str | None = "hann"):
+    """Espectro de ``m`` puntos entre ``f1`` y ``f2`` Hz (extremos incluidos).
+
+    Devuelve ``(freqs (m,), amps (..., m, 3))`` con la misma normalización
+    de amplitud que :func:`targeted_dft`.
+    """
+    arr = np.asarray(signal, dtype=float)
+    if arr.ndim not in (2, 3) or arr.shape[-1] != 3:
+        raise ValueError("signal debe tener forma (N, 3) o (B, N, 3)")
+    n = arr.shape[-2]
+    if not 0 <= f1 < f2 <= fs / 2:
+        raise ValueError("La banda debe cumplir 0 <= f1 < f2 <= fs/2")
+    win = np.ones(n) if window is None else get_window(window, n)
+    X = _zoom_plan(n, float(f1), float(f2), int(m), float(fs))(arr * win[:, None], axis=-2)
+    return np.linspace(f1, f2, m), np.abs(X) * (2.0 / win.sum())
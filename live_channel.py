@@ -0,0 +1,198 @@
+"""Canal en memoria compartida entre el productor y el dashboard.
+
+Sustituye el intercambio por ``velocity.csv`` / ``fft_result.csv``: el
+proceso de adquisición/procesamiento publica la última ventana de velocidad,
+su espectro y el RMS en un bloque ``multiprocessing.shared_memory``, y el
+dashboard (en otro proceso) lo lee sin formatear ni parsear texto.
+
+El bloque contiene un anillo de ``SLOTS`` ranuras. Cada publicación escribe
+en la ranura siguiente protegida por un *seqlock* (contador impar mientras se
+escribe), y después anuncia su generación en la cabecera. Los lectores nunca
+bloquean al escritor: copian la ranura más reciente y reintentan solo si el
+contador cambió durante la copia.
+"""
+
+from __future__ import annotations
+
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from signal_processing import FS
+
+CHANNEL_NAME = "vibraciones_live"
+SLOTS = 4
+READ_RETRIES = 100
+
+# Cabecera int64: generación publicada, longitud de ventana, bins, ranuras
+_HEADER_WORDS = 4
+# Cabecera de ranura int64: contador seqlock, generación
+_SLOT_WORDS = 2
+
+
+class LiveSnapshot(NamedTuple):
+    """Copia consistente de una publicación."""
+
+    generation: int
+    timestamp: float
+    velocity: np.ndarray  # (window, 3) mm/s
+    freqs: np.ndarray     # (bins,) Hz
+    amps: np.ndarray      # (bins, 3) mm/s
+    rms: np.ndarray       # (3,) mm/s
+
+
+def _slot_floats(window: int, bins: int) -> int:
+    # timestamp + velocidad + frecuencias + amplitudes + rms
+    return 1 + 3 * window + bins + 3 * bins + 3
+
+
+def _layout(buf, window: int, bins: int, slots: int):
+    """Vistas numpy sobre el bloque compartido."""
+    header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=buf)
+    offset = header.nbytes
+    seq = np.ndarray((slots, _SLOT_WORDS), dtype=np.int64, buffer=buf, offset=offset)
+    offset += seq.nbytes
+    n = _slot_floats(window, bins)
+    data = np.ndarray((slots, n), dtype=np.float64, buffer=buf, offset=offset)
+
+    views = []
+    for k in range(slots):
+        row = data[k]
+        a = 1
+        b = a + 3 * window
+        c = b + bins
+        d = c + 3 * bins
+        views.append((
+            row[0:1],
+            row[a:b].reshape(window, 3),
+            row[b:c],
+            row[c:d].reshape(bins, 3),
+            row[d:d + 3],
+        ))
+    return header, seq, views
+
+
+def _size(window: int, bins: int, slots: int) -> int:
+    return 8 * (_HEADER_WORDS + slots * _SLOT_WORDS + slots * _slot_floats(window, bins))
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Abrir un bloque existente sin que el resource_tracker lo elimine al salir."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: evitar el registro (bpo-39959)
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class LiveChannelPublisher:
+    """Lado productor: crea el bloque compartido y publica instantáneas.
+
+    Parameters
+    ----------
+    name : str
+        Nombre del bloque de memoria compartida.
+    window : int
+        Muestras de la ventana de velocidad.
+    bins : int | None
+        Número de bins del espectro (por defecto ``window // 2 + 1``).
+    slots : int
+        Ranuras del anillo.
+    """
+
+    def __init__(self, name: str = CHANNEL_NAME, window: int = FS,
+                 bins: int | None = None, slots: int = SLOTS):
+        self.name = name
+        self.window = window
+        self.bins = window // 2 + 1 if bins is None else bins
+        self.slots = slots
+        size = _size(window, self.bins, slots)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Bloque huérfano de una ejecución anterior: reemplazarlo
+            stale = attach_shared_memory(name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._header, self._seq, self._views = _layout(
+            self._shm.buf, window, self.bins, slots
+        )
+        self._header[:] = (0, window, self.bins, slots)
+        self._seq[:] = 0
+
+    @property
+    def generation(self) -> int:
+        return int(self._header[0])
+
+    def publish(self, velocity: np.ndarray, freqs: np.ndarray, amps: np.ndarray,
+                rms: np.ndarray, timestamp: float | None = None) -> int:
+        """Publicar una instantánea; devuelve su número de generación."""
+        gen = int(self._header[0]) + 1
+        k = gen % self.slots
+        ts, vel, fr, am, rm = self._views[k]
+        self._seq[k, 0] += 1          # impar: escritura en curso
+        ts[0] = time.time() if timestamp is None else timestamp
+        vel[:] = velocity
+        fr[:] = freqs
+        am[:] = amps
+        rm[:] = rms
+        self._seq[k, 1] = gen
+        self._seq[k, 0] += 1          # par: ranura consistente
+        self._header[0] = gen
+        return gen
+
+    def close(self, unlink: bool = True) -> None:
+        """Liberar las vistas y, por defecto, eliminar el bloque."""
+        del self._header, self._seq, self._views
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+
+class LiveChannelSubscriber:
+    """Lado lector: se conecta a un canal existente y lee instantáneas."""
+
+    def __init__(self, name: str = CHANNEL_NAME):
+        self.name = name
+        self._shm = attach_shared_memory(name)
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=self._shm.buf)
+        _, self.window, self.bins, self.slots = (int(v) for v in header)
+        del header
+        self._header, self._seq, self._views = _layout(
+            self._shm.buf, self.window, self.bins, self.slots
+        )
+        self.retries = 0
+
+    @property
+    def generation(self) -> int:
+        return int(self._header[0])
+
+    def read(self, since: int | None = None) -> LiveSnapshot | None:
+        """Última instantánea consistente, o None si no hay nada nuevo tras ``since``."""
+        for _ in range(READ_RETRIES):
+            gen = int(self._header[0])
+            if gen == 0 or gen == since:
+                return None
+            k = gen % self.slots
+            before = int(self._seq[k, 0])
+            if before % 2 or int(self._seq[k, 1]) != gen:
+                self.retries += 1
+                continue
+            ts, vel, fr, am, rm = self._views[k]
+            snap = LiveSnapshot(gen, float(ts[0]), vel.copy(), fr.copy(),
+                                am.copy(), rm.copy())
+            if int(self._seq[k, 0]) == before:
+                return snap
+            self.retries += 1
+        return None
+
+    def close(self) -> None:
+        del self._header, self._seq, self._views
+        self._shm.close()
@@ -17,23 +17,24 @@ from __future__ import annotations
 
 import numpy as np
 
-from conversion import acc_to_velocity
-from signal_processing import (
-    bandpass_filter,
-    apply_hanning_window,
-    compute_fft,
-)
-from storage import (
-    save_acceleration_csv,
-    save_velocity_csv,
-    save_fft_csv,
-)
+from pipeline import Integrate, Pipeline, Spectrum, Store, Tap, Window, array_source
+from signal_processing import DEFAULT_FMAX, DEFAULT_FMIN
+from storage import save_acceleration_csv
 
 # Parámetros globales
 duration = 1.0  # segundos
 fs = 800        # Hz
 
 
+def _report(analysis) -> None:
+    print("[3] Filtrado pasabanda y ventana de Hanning aplicados")
+    print("[4] FFT calculada")
+    dominant = analysis.freqs[analysis.amps[1:].argmax(axis=0) + 1]
+    for axis, f in zip("xyz", dominant):
+        print(f"    • Frecuencia dominante {axis}: {f:.1f} Hz")
+    print("[5] velocity.csv y fft_result.csv guardados")
+
+
 def main() -> None:
     """Ejecutar el pipeline completo de análisis de vibraciones."""
     # Datos de aceleración de entrada (reemplazar con captura real)
@@ -42,8 +43,17 @@ def main() -> None:
     save_acceleration_csv(accel, fs, "raw_acc.csv")
     print("    • raw_acc.csv guardado")
 
-    # Convertir a velocidad
-    vel = acc_to_velocity(accel, fs)
-    print("[2] Conversión a velocidad completada")
-    save_velocity_csv(vel, fs, "velocity.csv")
-    print("    • velocity.csv guardado")
\ No newline at end of file
+    pipe = Pipeline(
+        Integrate(fs),
+        Tap(lambda _: print("[2] Conversión a velocidad completada")),
+        Window(accel.shape[0], hop=accel.shape[0]),
+        Spectrum(fs, bandpass=(DEFAULT_FMIN, DEFAULT_FMAX)),
+        Store(fs),
+        Tap(_report),
+    )
+    for _ in pipe.run(array_source(accel)):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Diezmado polifásico en streaming y cascada de bandas multirresolución.
+
+La resolución espectral es ``fs / N``: con FS=800 y bloques de 800 muestras
+queda fija en 1 Hz. Para ver 0.1 Hz en maquinaria lenta no hace falta una
+FFT de 8000 puntos a plena frecuencia: basta con diezmar la banda baja
+(p. ej. 0–50 Hz a ÷8) y analizar ventanas largas a la frecuencia reducida.
+
+``PolyphaseDecimator`` filtra (FIR antialias) y diezma calculando solo las
+salidas que se conservan (equivalente a la forma polifásica), con el estado
+guardado entre bloques: el resultado no depende de cómo se trocee la señal.
+``MultirateCascade`` encadena decimadores y mantiene una ventana móvil por
+banda para obtener espectros de alta resolución de las bandas bajas.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+
+from ring_buffer import RingBuffer
+from signal_processing import FS, apply_hanning_window, compute_fft
+
+TAPS_PER_PHASE = 16     # coeficientes por fase del FIR antialias
+PASSBAND = 0.8          # fracción del nuevo Nyquist que se conserva
+
+
+@lru_cache(maxsize=32)
+def design_decimator(q: int, taps_per_phase: int = TAPS_PER_PHASE) -> np.ndarray:
+    """FIR antialias para diezmar por ``q`` (cacheado, solo lectura).
+
+    Devuelve los coeficientes invertidos, listos para el producto escalar
+    con ventanas en orden cronológico.
+    """
+    if q < 1:
+        raise ValueError("q debe ser un entero positivo")
+    if q == 1:
+        taps = np.ones(1)
+    else:
+        taps = firwin(q * taps_per_phase, PASSBAND / q)
+    taps = np.ascontiguousarray(taps[::-1])
+    taps.flags.writeable = False
+    return taps
+
+
+class PolyphaseDecimator:
+    """Filtro antialias + diezmado por ``q`` que conserva estado entre bloques.
+
+    Parameters
+    ----------
+    q : int
+        Factor de diezmado.
+    taps_per_phase : int
+        Longitud del FIR por fase (el filtro tiene ``q * taps_per_phase``).
+
+    Notes
+    -----
+    El retardo de grupo es ``(q * taps_per_phase - 1) / 2`` muestras de
+    entrada.
+    """
+
+    def __init__(self, q: int, taps_per_phase: int = TAPS_PER_PHASE):
+        self.q = int(q)
+        self.taps = design_decimator(self.q, taps_per_phase)
+        self.reset()
+
+    def reset(self) -> None:
+        self._hist: np.ndarray | None = None
+        self._phase = 0   # inicio (relativo al bloque) de la próxima ventana
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Diezmar un bloque ``(m, canales)``; devuelve las salidas completas."""
+        arr = np.asarray(block, dtype=float)
+        if arr.ndim != 2:
+            raise ValueError("block debe ser un array de forma (m, canales)")
+        m = arr.shape[0]
+        L = self.taps.size
+        if m == 0:
+            return np.empty((0, arr.shape[1]))
+        if self._hist is None:
+            # Arranque sin escalón: historia igual a la primera muestra
+            self._hist = np.repeat(arr[:1], L - 1, axis=0)
+
+        x = np.concatenate((self._hist, arr))
+        n_out = 0 if self._phase > m - 1 else (m - 1 - self._phase) // self.q + 1
+        if n_out:
+            windows = sliding_window_view(x, L, axis=0)[self._phase::self.q][:n_out]
+            out = windows @ self.taps               # (n_out, canales)
+        else:
+            out = np.empty((0, arr.shape[1]))
+        self._phase += n_out * self.q - m
+        self._hist = x[x.shape[0] - (L - 1):]
+        return out
+
+
+class MultirateCascade:
+    """Bandas de análisis a frecuencias decrecientes con ventana propia.
+
+    Parameters
+    ----------
+    factors : tuple[int, ...]
+        Factor de cada etapa respecto a la anterior; ``(8,)`` da las bandas
+        ``0–fs/2`` y ``0–fs/16``.
+    fs : float
+        Frecuencia de muestreo de entrada.
+    window : int
+        Muestras por ventana en cada banda (resolución ``fs_banda / window``).
+    """
+
+    def __init__(self, factors: tuple[int, ...] = (8,), fs: float = FS,
+                 window: int = FS, channels: int = 3):
+        self.stages = [PolyphaseDecimator(q) for q in factors]
+        self.rates = [float(fs)]
+        for q in factors:
+            self.rates.append(self.rates[-1] / q)
+        self.buffers = [RingBuffer(window, channels) for _ in self.rates]
+
+    def process(self, block: np.ndarray) -> list[np.ndarray]:
+        """Alimentar la cascada; devuelve las salidas nuevas de cada banda."""
+        outs = [np.asarray(block, dtype=float)]
+        for stage in self.stages:
+            outs.append(stage.process(outs[-1]))
+        for buf, out in zip(self.buffers, outs):
+            if out.shape[0]:
+                buf.append(out)
+        return outs
+
+    def ready(self, level: int) -> bool:
+        return self.buffers[level].is_full()
+
+    def spectrum(self, level: int):
+        """FFT con Hann de la ventana de la banda ``level``: ``(freqs, amps)``."""
+        if not self.ready(level):
+            raise ValueError("La ventana de esa banda aún no está completa")
+        window = self.buffers[level].unwrap()
+        return compute_fft(apply_hanning_window(window), self.rates[level])
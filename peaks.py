@@ -0,0 +1,219 @@
+"""Detección de picos espectrales con resolución sub-bin y seguimiento de armónicos.
+
+``find_peaks`` localiza los ``k`` máximos locales más altos de cada eje en un
+espectro ``(bins, 3)`` o en un lote ``(B, bins, 3)``, todo vectorizado, y
+afina frecuencia y amplitud interpolando los tres bins alrededor del máximo:
+
+- ``"parabolic"``: parábola sobre las amplitudes.
+- ``"gaussian"``: parábola sobre el logaritmo; exacta para una ventana
+  gaussiana y bastante mejor que la parabólica con Hann.
+
+Con N=800 y fs=800 Hz (bins de 1 Hz) una componente de 23.17 Hz se estima
+con un error de centésimas de Hz en lugar de redondearse a 23.00 Hz.
+
+``HarmonicTracker`` sigue la velocidad de giro (1×) y sus armónicos 2×, 3×
+trama a trama, buscando cada armónico alrededor de ``h·f0``.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+INTERPOLATIONS = (None, "parabolic", "gaussian")
+TOP_K = 5
+HARMONICS = (1, 2, 3)
+TRACK_TOLERANCE = 0.05   # variación relativa admitida de f0 entre tramas
+
+
+class Peaks(NamedTuple):
+    """Picos ordenados de mayor a menor; forma ``(..., k, 3)``.
+
+    Donde no hay suficientes máximos locales, ``freqs``/``amps`` son NaN y
+    ``bins`` es -1.
+    """
+
+    freqs: np.ndarray
+    amps: np.ndarray
+    bins: np.ndarray
+
+
+def _df(freqs: np.ndarray) -> float:
+    return float(freqs[1] - freqs[0])
+
+
+def refine(amps: np.ndarray, idx: np.ndarray, interpolation: str | None = "gaussian"):
+    """Desplazamiento sub-bin y amplitud en el vértice para los bins ``idx``.
+
+    ``amps`` tiene forma ``(..., bins, 3)`` e ``idx`` ``(..., k, 3)``, con
+    ``1 <= idx <= bins - 2``. Devuelve ``(delta, peak)`` con ``delta`` en
+    bins (entre -0.5 y 0.5).
+    """
+    if interpolation not in INTERPOLATIONS:
+        raise ValueError(f"interpolation debe ser uno de {INTERPOLATIONS}")
+    beta = np.take_along_axis(amps, idx, axis=-2)
+    if interpolation is None:
+        return np.zeros(beta.shape), beta
+    alpha = np.take_along_axis(amps, idx - 1, axis=-2)
+    gamma = np.take_along_axis(amps, idx + 1, axis=-2)
+    if interpolation == "gaussian":
+        tiny = np.finfo(float).tiny
+        alpha, beta, gamma = (np.log(np.maximum(v, tiny)) for v in (alpha, beta, gamma))
+    denom = alpha - 2 * beta + gamma
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.where(denom < 0, 0.5 * (alpha - gamma) / denom, 0.0)
+    delta = np.clip(delta, -0.5, 0.5)
+    peak = beta - 0.25 * (alpha - gamma) * delta
+    if interpolation == "gaussian":
+        peak = np.exp(peak)
+    return delta, peak
+
+
+def find_peaks(
+    freqs: np.ndarray,
+    amps: np.ndarray,
+    k: int = TOP_K,
+    interpolation: str | None = "gaussian",
+    min_amp: float = 0.0,
+) -> Peaks:
+    """Los ``k`` picos más altos por eje de un espectro ``(…, bins, 3)``."""
+    freqs = np.asarray(freqs, dtype=float)
+    amps = np.asarray(amps, dtype=float)
+    if amps.ndim not in (2, 3) or amps.shape[-1] != 3 or amps.shape[-2] != freqs.size:
+        raise ValueError("amps debe tener forma (bins, 3) o (B, bins, 3)")
+    bins = freqs.size
+    if bins < 3:
+        raise ValueError("Se necesitan al menos 3 bins")
+
+    # Máximos locales estrictos por la izquierda (mesetas: primer bin)
+    inner = amps[..., 1:-1, :]
+    is_peak = (inner > amps[..., :-2, :]) & (inner >= amps[..., 2:, :]) & (inner > min_amp)
+    score = np.where(is_peak, inner, -np.inf)
+
+    k = min(k, bins - 2)
+    top = np.argpartition(-score, k - 1, axis=-2)[..., :k, :]
+    order = np.argsort(-np.take_along_axis(score, top, axis=-2), axis=-2, kind="stable")
+    top = np.take_along_axis(top, order, axis=-2)
+    valid = np.isfinite(np.take_along_axis(score, top, axis=-2))
+    idx = top + 1
+
+    delta, peak = refine(amps, idx, interpolation)
+    f = freqs[0] + (idx + delta) * _df(freqs)
+    return Peaks(
+        np.where(valid, f, np.nan),
+        np.where(valid, peak, np.nan),
+        np.where(valid, idx, -1),
+    )
+
+
+class HarmonicState(NamedTuple):
+    """Resultado de una trama de ``HarmonicTracker``."""
+
+    fundamental: float        # Hz (NaN si no se ha encontrado)
+    freqs: np.ndarray         # (armónicos,) Hz
+    amps: np.ndarray          # (armónicos, 3) amplitud por eje
+    locked: bool              # True si continúa la pista de la trama anterior
+
+
+class HarmonicTracker:
+    """Seguimiento de la velocidad de giro y sus armónicos.
+
+    Parameters
+    ----------
+    fmin, fmax : float
+        Rango en el que buscar la fundamental (Hz).
+    harmonics : tuple[int, ...]
+        Órdenes a seguir (el primero debe ser 1).
+    tolerance : float
+        Variación relativa de ``f0`` admitida entre tramas; fuera de ella se
+        vuelve a adquirir la fundamental desde cero.
+    interpolation : str | None
+        Interpolación sub-bin (ver :func:`refine`).
+    k : int
+        Picos candidatos considerados al adquirir.
+    """
+
+    def __init__(
+        self,
+        fmin: float = 5.0,
+        fmax: float = 200.0,
+        harmonics: tuple[int, ...] = HARMONICS,
+        tolerance: float = TRACK_TOLERANCE,
+        interpolation: str | None = "gaussian",
+        k: int = TOP_K,
+    ):
+        if harmonics[0] != 1:
+            raise ValueError("El primer armónico debe ser 1")
+        self.fmin = fmin
+        self.fmax = fmax
+        self.harmonics = np.asarray(harmonics)
+        self.tolerance = tolerance
+        self.interpolation = interpolation
+        self.k = k
+        self.fundamental: float | None = None
+
+    def reset(self) -> None:
+        self.fundamental = None
+
+    def _near(self, freqs, mag, amps, targets, tol_hz):
+        """Pico más alto de ``mag`` alrededor de cada frecuencia objetivo."""
+        df = _df(freqs)
+        bins = freqs.size
+        centre = np.rint((targets - freqs[0]) / df).astype(int)
+        half = np.maximum(np.ceil(tol_hz / df).astype(int), 1)
+        offsets = np.arange(-half.max(), half.max() + 1)
+        cand = centre[:, None] + offsets[None, :]
+        ok = (np.abs(offsets)[None, :] <= half[:, None]) & (cand >= 1) & (cand <= bins - 2)
+        vals = np.where(ok, mag[np.clip(cand, 0, bins - 1)], -np.inf)
+        best = cand[np.arange(cand.shape[0]), np.argmax(vals, axis=1)]
+        found = np.isfinite(vals.max(axis=1))
+
+        idx = np.clip(best, 1, bins - 2)
+        delta, _ = refine(mag[:, None], idx[:, None], self.interpolation)
+        f = freqs[0] + (idx + delta[:, 0]) * df
+        _, peak = refine(amps, np.repeat(idx[:, None], 3, axis=1), self.interpolation)
+        return np.where(found, f, np.nan), np.where(found[:, None], peak, np.nan)
+
+    def _acquire(self, freqs, mag, amps) -> float | None:
+        """Elegir como f0 el candidato cuya serie armónica acumula más amplitud."""
+        band = (freqs >= self.fmin) & (freqs <= self.fmax)
+        masked = np.where(band, mag, 0.0)
+        cands = find_peaks(freqs, np.repeat(masked[:, None], 3, axis=1), self.k,
+                           self.interpolation).freqs[:, 0]
+        cands = cands[np.isfinite(cands)]
+        if cands.size == 0:
+            return None
+        tol = np.full(self.harmonics.size, 1.5 * _df(freqs))
+        scores = [
+            np.nansum(self._near(freqs, mag, mag[:, None].repeat(3, axis=1),
+                                 f0 * self.harmonics, tol)[1][:, 0])
+            for f0 in cands
+        ]
+        return float(cands[int(np.argmax(scores))])
+
+    def update(self, freqs: np.ndarray, amps: np.ndarray) -> HarmonicState:
+        """Procesar un espectro ``(bins, 3)`` y devolver el estado actual."""
+        freqs = np.asarray(freqs, dtype=float)
+        amps = np.asarray(amps, dtype=float)
+        mag = np.sqrt((amps ** 2).sum(axis=1))   # módulo de los tres ejes
+
+        locked = False
+        f0 = None
+        if self.fundamental is not None:
+            tol = np.array([max(self.tolerance * self.fundamental, _df(freqs))])
+            f, _ = self._near(freqs, mag, amps, np.array([self.fundamental]), tol)
+            if np.isfinite(f[0]) and abs(f[0] - self.fundamental) <= tol[0]:
+                f0, locked = float(f[0]), True
+        if f0 is None:
+            f0 = self._acquire(freqs, mag, amps)
+        self.fundamental = f0
+
+        n = self.harmonics.size
+        if f0 is None:
+            return HarmonicState(np.nan, np.full(n, np.nan), np.full((n, 3), np.nan), False)
+        targets = f0 * self.harmonics
+        tol = np.maximum(self.tolerance * targets, 1.5 * _df(freqs))
+        hf, ha = self._near(freqs, mag, amps, targets, tol)
+        hf[0] = f0
+        return HarmonicState(f0, hf, ha, locked)
@@ -0,0 +1,378 @@
+"""Framework de etapas para el procesamiento de vibraciones en streaming.
+
+La cadena int16 → g → velocidad → offset de calibración → pasabanda →
+ventana → FFT/RMS → almacenamiento estaba copiada a mano, con pequeñas
+diferencias, en ``main.py``, ``real_time.py``, ``data_processor.py`` y el
+dashboard. Aquí cada eslabón es una etapa con su propio estado (integrador,
+``zi`` del filtro, ventana móvil preasignada), y un ``Pipeline`` las encadena:
+
+    pipe = Pipeline(Scale(ACC_LSB_TO_G), Integrate(FS), Calibrate(),
+                    Window(FS, hop=FS // 4), Spectrum(FS))
+    for analysis in pipe.run(udp_source(), queue_size=64):
+        ...
+
+Modelo *push*: ``Pipeline.push(item)`` pasa el elemento por las etapas y
+devuelve lo que sale del final (cero, uno o varios elementos: una ventana
+puede emitirse varias veces por bloque o ninguna). ``Pipeline.run`` consume
+una fuente; con ``queue_size`` la fuente se lee en un hilo aparte y la cola
+acotada frena al productor cuando el procesamiento no da abasto
+(backpressure).
+
+Los elementos que circulan son ``Chunk`` (muestras con su índice absoluto y
+marca de hueco) hasta ``Spectrum``, que produce ``Analysis``.
+"""
+
+from __future__ import annotations
+
+import queue
+import socket
+import threading
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from acquisition import udp_receiver
+from acquisition.sequencing import split_on_gaps
+from calibration import Calibration, calibration
+from conversion import VelocityIntegrator
+from ring_buffer import RingBuffer
+from signal_processing import (
+    DEFAULT_FMAX,
+    DEFAULT_FMIN,
+    FS,
+    StreamingBandpass,
+    bandpass_filter,
+    compute_fft_batch,
+    compute_rms,
+    get_window,
+)
+import storage
+
+ACC_LSB_TO_G = 0.004   # Sensibilidad del ADXL345 en rango ±2g
+QUEUE_SIZE = 64        # elementos en vuelo entre fuente y etapas
+
+
+class Chunk(NamedTuple):
+    """Bloque de muestras contiguas."""
+
+    index: int           # índice absoluto de la primera muestra
+    data: np.ndarray     # (n, 3)
+    gap: bool = False    # hubo muestras perdidas justo antes
+
+
+class Analysis(NamedTuple):
+    """Resultado de ``Spectrum`` para una ventana."""
+
+    index: int             # índice absoluto de la primera muestra de la ventana
+    velocity: np.ndarray   # (N, 3) ventana tal como llegó a Spectrum
+    filtered: np.ndarray   # (N, 3) tras el pasabanda (== velocity si no hay)
+    freqs: np.ndarray      # (N//2 + 1,)
+    amps: np.ndarray       # (N//2 + 1, 3)
+    rms: np.ndarray        # (3,) de 'filtered'
+
+# ──── Etapas ───────────────────────────────────────────────────────
+
+class Stage:
+    """Etapa con estado. ``process`` devuelve la lista de elementos emitidos."""
+
+    def process(self, item) -> list:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Descartar el estado interno (p. ej. tras reconectar una fuente)."""
+
+    def flush(self) -> list:
+        """Emitir lo que quede retenido al terminar la fuente."""
+        return []
+
+
+class Map(Stage):
+    """Etapa uno-a-uno: las subclases implementan ``apply``."""
+
+    def apply(self, item):
+        raise NotImplementedError
+
+    def process(self, item) -> list:
+        return [self.apply(item)]
+
+
+class Scale(Map):
+    """Multiplicar las muestras por una constante (p. ej. LSB → g)."""
+
+    def __init__(self, factor: float = ACC_LSB_TO_G):
+        self.factor = factor
+
+    def apply(self, chunk: Chunk) -> Chunk:
+        return chunk._replace(data=np.multiply(chunk.data, self.factor, dtype=float))
+
+
+class Integrate(Map):
+    """Aceleración (g) → velocidad (mm/s), continua entre bloques."""
+
+    def __init__(self, fs: int = FS, highpass_hz: float | None = None):
+        self.integrator = VelocityIntegrator(fs, highpass_hz)
+
+    def reset(self) -> None:
+        self.integrator.reset()
+
+    def apply(self, chunk: Chunk) -> Chunk:
+        if chunk.gap:
+            self.integrator.reset()
+        return chunk._replace(data=self.integrator.process(chunk.data))
+
+
+class Calibrate(Map):
+    """Alimentar la calibración en curso y restar el offset vigente."""
+
+    def __init__(self, cal: Calibration = calibration):
+        self.calibration = cal
+
+    def apply(self, chunk: Chunk) -> Chunk:
+        cal = self.calibration
+        cal.add_block(chunk.data)
+        cal.finish()   # solo esta etapa cierra la captura (ver Calibration.finish)
+        return chunk._replace(data=chunk.data - cal.offset)
+
+
+class Bandpass(Map):
+    """Pasabanda causal con estado entre bloques (reinicia tras un hueco)."""
+
+    def __init__(self, fs: int = FS, fmin: float = DEFAULT_FMIN,
+                 fmax: float = DEFAULT_FMAX):
+        self.filter = StreamingBandpass(fs, fmin, fmax)
+
+    def reset(self) -> None:
+        self.filter.reset()
+
+    def apply(self, chunk: Chunk) -> Chunk:
+        if chunk.gap:
+            self.filter.reset()
+        return chunk._replace(data=self.filter.process(chunk.data))
+
+
+class Window(Stage):
+    """Ventana móvil de ``size`` muestras emitida cada ``hop`` muestras.
+
+    Con ``hop=None`` se emite una vez por bloque recibido (si está llena).
+    Las muestras se guardan una sola vez en un ``RingBuffer``. Tras un hueco
+    la ventana vuelve a llenarse desde cero. Con ``prefill=True`` arranca
+    llena de ceros y emite desde el primer ``hop``.
+    """
+
+    def __init__(self, size: int = FS, hop: int | None = None, prefill: bool = False):
+        if hop is not None and hop <= 0:
+            raise ValueError("hop debe ser positivo")
+        self.size = size
+        self.hop = hop
+        self.prefill = prefill
+        self.buffer = RingBuffer(size)
+        self.reset()
+
+    def reset(self) -> None:
+        self.buffer.clear()
+        if self.prefill:
+            self.buffer.append(np.zeros((self.size, self.buffer.channels)))
+        # Muestras hasta la próxima emisión: las ventanas empiezan en 0, hop,
+        # 2·hop… desde el inicio (o desde el último hueco), como en StreamingSTFT
+        self._due = (self.hop or 0) if self.prefill else self.size
+        self._next_index = None   # índice absoluto de la próxima muestra
+
+    def process(self, chunk: Chunk) -> list:
+        if chunk.gap:
+            self.reset()
+        if self._next_index is None:
+            self._next_index = chunk.index
+        if self.hop is None:
+            self.buffer.append(chunk.data)
+            self._next_index += chunk.data.shape[0]
+            if not self.buffer.is_full():
+                return []
+            return [Chunk(self._next_index - self.size, self.buffer.unwrap())]
+
+        out = []
+        data = chunk.data
+        while data.shape[0]:
+            take = min(self._due, data.shape[0])
+            self.buffer.append(data[:take])
+            self._next_index += take
+            self._due -= take
+            data = data[take:]
+            if self._due == 0:
+                self._due = self.hop
+                out.append(Chunk(self._next_index - self.size, self.buffer.unwrap()))
+        return out
+
+
+class Spectrum(Map):
+    """Pasabanda de fase cero opcional, ventana de Hann, FFT y RMS por ventana.
+
+    La copia enventanada se escribe en un buffer propio de la etapa que se
+    reutiliza en cada emisión. Las amplitudes no: viajan en cada
+    ``Analysis`` y un mismo bloque puede emitir varias ventanas.
+    """
+
+    def __init__(self, fs: int = FS, bandpass: tuple[float, float] | None = None,
+                 window: str | None = "hann"):
+        self.fs = fs
+        self.bandpass = bandpass
+        self.window = window
+        self._windowed = np.empty((0, 3))
+
+    def apply(self, chunk: Chunk) -> Analysis:
+        vel = chunk.data
+        filtered = vel if self.bandpass is None else bandpass_filter(vel, self.fs, *self.bandpass)
+        n = filtered.shape[0]
+        if self._windowed.shape[0] != n:
+            self._windowed = np.empty((n, 3))
+        if self.window is None:
+            self._windowed[:] = filtered
+        else:
+            np.multiply(filtered, get_window(self.window, n)[:, None], out=self._windowed)
+        amps = np.empty((1, n // 2 + 1, 3))
+        freqs, _ = compute_fft_batch(self._windowed[None], self.fs, None, out=amps)
+        return Analysis(chunk.index, vel, filtered, freqs, amps[0], compute_rms(filtered))
+
+
+class Tap(Map):
+    """Llamar a ``fn(item)`` y dejar pasar el elemento (sumideros, logs)."""
+
+    def __init__(self, fn: Callable):
+        self.fn = fn
+
+    def apply(self, item):
+        self.fn(item)
+        return item
+
+
+class Store(Tap):
+    """Guardar velocidad y espectro de cada ``Analysis`` en CSV.
+
+    Con ``writer`` (p. ej. ``storage.AsyncStorageWriter``) la escritura se
+    encola; sin él se escribe en el momento.
+    """
+
+    def __init__(self, fs: int = FS, writer=None, velocity: str | None = "velocity.csv",
+                 fft: str | None = "fft_result.csv"):
+        save_velocity = writer.save_velocity if writer else storage.save_velocity_csv
+        save_fft = writer.save_fft if writer else storage.save_fft_csv
+
+        def _store(a: Analysis) -> None:
+            if velocity:
+                save_velocity(a.velocity, fs, velocity)
+            if fft:
+                save_fft(a.freqs, a.amps, fft)
+
+        super().__init__(_store)
+
+
+class Publish(Tap):
+    """Publicar cada ``Analysis`` en un ``LiveChannelPublisher``.
+
+    Se publica la ventana filtrada, la misma de la que salen espectro y RMS
+    (y la que muestra el dashboard con el motor UDP).
+    """
+
+    def __init__(self, channel):
+        super().__init__(
+            lambda a: channel.publish(a.filtered, a.freqs, a.amps, a.rms)
+        )
+
+# ──── Pipeline ─────────────────────────────────────────────────────
+
+_DONE = object()
+
+
+class Pipeline:
+    """Cadena de etapas ``push``.
+
+    Parameters
+    ----------
+    *stages : Stage
+        Etapas en orden de aplicación.
+    """
+
+    def __init__(self, *stages: Stage):
+        self.stages = list(stages)
+
+    def push(self, item) -> list:
+        """Pasar un elemento por todas las etapas; devuelve lo emitido al final."""
+        items = [item]
+        for stage in self.stages:
+            if not items:
+                break
+            items = [out for it in items for out in stage.process(it)]
+        return items
+
+    def flush(self) -> list:
+        """Vaciar las etapas en orden, propagando lo que emitan."""
+        items: list = []
+        for stage in self.stages:
+            items = [out for it in items for out in stage.process(it)] + stage.flush()
+        return items
+
+    def reset(self) -> None:
+        for stage in self.stages:
+            stage.reset()
+
+    def run(self, source: Iterable, queue_size: int | None = None) -> Iterator:
+        """Procesar una fuente y producir lo que salga del final.
+
+        Con ``queue_size`` la fuente se consume en un hilo propio y una cola
+        acotada de ese tamaño aplica backpressure sobre ella.
+        """
+        items = source if queue_size is None else _threaded(source, queue_size)
+        for item in items:
+            yield from self.push(item)
+        yield from self.flush()
+
+
+def _threaded(source: Iterable, size: int) -> Iterator:
+    """Iterar ``source`` desde un hilo productor a través de una cola acotada."""
+    q: queue.Queue = queue.Queue(size)
+
+    def produce():
+        try:
+            for item in source:
+                q.put(item)          # bloquea si el consumidor va por detrás
+        except BaseException as e:   # se relanza en el consumidor
+            q.put(e)
+        q.put(_DONE)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = q.get()
+        if item is _DONE:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+# ──── Fuentes ──────────────────────────────────────────────────────
+
+def array_source(array: np.ndarray, block: int | None = None, start: int = 0) -> Iterator[Chunk]:
+    """Trocear un array ``(N, 3)`` en ``Chunk`` de ``block`` muestras."""
+    arr = np.asarray(array)
+    block = block or arr.shape[0]
+    for a in range(0, arr.shape[0], block):
+        yield Chunk(start + a, arr[a:a + block])
+
+
+def batch_chunks(index: np.ndarray, data: np.ndarray,
+                 prev_index: int | None = None) -> list[Chunk]:
+    """Lote ``(index, muestras)`` de un receptor → ``Chunk`` por tramo contiguo."""
+    return [Chunk(start, segment, gap)
+            for start, segment, gap in split_on_gaps(index, data, prev_index)]
+
+
+def udp_source(get_batch: Callable | None = None, timeout: float = 0.2) -> Iterator[Chunk]:
+    """``Chunk`` desde el receptor UDP (``udp_receiver.get_batch`` por defecto)."""
+    if get_batch is None:
+        get_batch = udp_receiver.get_batch
+    last = None
+    while True:
+        try:
+            index, data = get_batch(timeout=timeout, with_index=True)
+        except socket.timeout:
+            continue
+        yield from batch_chunks(index, data, last)
+        last = int(index[-1])
@@ -0,0 +1,478 @@
+"""Procesamiento por sensor en varios procesos con bloques en memoria compartida.
+
+En un solo proceso el GIL serializa integración, filtrado y FFT de todos los
+sensores, y además compite con el hilo de ``UDPReceiver``. ``ProcessingPool``
+reparte los sensores entre procesos trabajadores:
+
+- El proceso principal (donde corre el receptor) copia cada bloque
+  decodificado, tramo contiguo a tramo contiguo, en una ranura libre de un
+  bloque ``shared_memory`` y envía por una cola solo la descripción
+  ``(ranura, sensor, índice, n, hueco)``.
+- Cada sensor se asigna a un trabajador fijo (reparto rotatorio en su primera
+  aparición), que mantiene su ``pipeline.Pipeline`` (escala → velocidad →
+  calibración → pasabanda → ventana) y calcula espectro e indicadores
+  (``features.extract_features``).
+- Los resultados, unos pocos floats por ventana, se escriben en las filas
+  de resultados de la misma ranura (tantas como ventanas pueda emitir un
+  bloque con el ``hop`` elegido); el principal las lee en orden, libera la
+  ranura y llama a ``on_result`` por cada ventana.
+
+La calibración de offset de cada sensor vive en su trabajador:
+``start_capture(sensor)`` le envía la orden por la misma cola que los
+bloques, de modo que la captura empieza justo tras lo ya encolado. Cada
+resultado informa de si la captura sigue en curso y del offset vigente, y
+el principal lo reenvía si el trabajador se reinicia.
+
+Si todas las ranuras están ocupadas, ``submit`` espera (backpressure) y al
+agotar el tiempo descarta el bloque y lo cuenta en ``dropped``. Un hilo de
+salud reinicia los trabajadores que mueren o dejan de dar latido; las
+ranuras que tenían en vuelo se recuperan y sus sensores empiezan de cero en
+el proceso nuevo.
+
+Uso:
+
+    pool = ProcessingPool(workers=4, on_result=print)
+    pool.start()
+    pool.attach("esp32-a", receptor_a.get_batch)
+    ...
+    pool.close()
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue
+import socket
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Hashable, NamedTuple
+
+import numpy as np
+
+from acquisition.sequencing import split_on_gaps
+from calibration import Calibration, get_calibration
+from features import ISO_BANDS, Features, extract_features
+from live_channel import attach_shared_memory
+from pipeline import (
+    ACC_LSB_TO_G,
+    Bandpass,
+    Calibrate,
+    Chunk,
+    Integrate,
+    Map,
+    Pipeline,
+    Scale,
+    Window,
+)
+from signal_processing import FS, compute_fft_batch
+
+POOL_WORKERS = min(os.cpu_count() or 1, 4)
+POOL_SLOTS = 64            # bloques en vuelo entre receptor y trabajadores
+SLOT_SAMPLES = 2048        # muestras máx. por ranura (bloques mayores se trocean)
+SUBMIT_TIMEOUT = 1.0       # s de espera por una ranura libre antes de descartar
+HEALTH_INTERVAL = 1.0      # s entre revisiones de los trabajadores
+HEARTBEAT_TIMEOUT = 10.0   # s sin latido para dar un trabajador por colgado
+
+_SHAPE_FIELDS = ("rms", "peak", "peak_to_peak", "crest", "skewness", "kurtosis")
+
+# Mensajes de control en la cola de un trabajador (los bloques empiezan por
+# el número de ranura)
+_START_CAPTURE = "start_capture"
+_SET_OFFSET = "set_offset"
+
+
+class SensorResult(NamedTuple):
+    """Indicadores de una ventana de un sensor."""
+
+    sensor: Hashable
+    index: int             # índice absoluto de la primera muestra de la ventana
+    features: Features     # cada campo (3,); ``bands`` nombre -> (3,)
+    dominant: np.ndarray   # (3,) Hz, pico del espectro por eje (sin DC)
+    calibrating: bool      # captura de calibración en curso
+    offset: np.ndarray     # (3,) mm/s, offset de calibración aplicado
+
+# ──── Memoria compartida ───────────────────────────────────────────
+
+def _row_floats(n_bands: int) -> int:
+    # válido + índice + calibrando + campos de forma + bandas + dominante + offset
+    return 3 + 3 * (len(_SHAPE_FIELDS) + n_bands + 2)
+
+
+def _input_layout(buf, slots: int, slot_samples: int) -> np.ndarray:
+    return np.ndarray((slots, slot_samples, 3), dtype=np.int16, buffer=buf)
+
+
+def windows_per_slot(slot_samples: int, hop: int | None) -> int:
+    """Máximo de ventanas que puede emitir un bloque de ``slot_samples`` muestras."""
+    return 1 if hop is None else -(-slot_samples // hop)
+
+
+def _output_layout(buf, workers: int, slots: int, per_slot: int, n_bands: int):
+    """Latidos ``(workers,)`` y filas de resultado ``(slots, per_slot, floats)``."""
+    heartbeat = np.ndarray((workers,), dtype=np.float64, buffer=buf)
+    rows = np.ndarray((slots, per_slot, _row_floats(n_bands)), dtype=np.float64,
+                      buffer=buf, offset=heartbeat.nbytes)
+    return heartbeat, rows
+
+
+def _pack(row: np.ndarray, index: int, feats: Features, dominant: np.ndarray,
+          cal: Calibration) -> None:
+    values = [feats[k][0] for k in range(len(_SHAPE_FIELDS))]
+    values += [b[0] for b in feats.bands.values()]
+    row[1] = index
+    row[2] = cal.capturing
+    row[3:] = np.concatenate(values + [dominant, cal.offset])
+    row[0] = 1.0
+
+
+def _unpack(sensor, row: np.ndarray, bands) -> SensorResult:
+    values = row[3:].reshape(-1, 3).copy()
+    n = len(_SHAPE_FIELDS)
+    feats = Features(*values[:n], dict(zip(bands, values[n:-2])))
+    return SensorResult(sensor, int(row[1]), feats, values[-2], bool(row[2]), values[-1])
+
+# ──── Trabajador ───────────────────────────────────────────────────
+
+class _Summarize(Map):
+    """Ventana → (índice, indicadores, frecuencia dominante)."""
+
+    def __init__(self, fs: int, bands: dict):
+        self.fs = fs
+        self.bands = bands
+
+    def apply(self, chunk: Chunk):
+        windows = chunk.data[None]
+        freqs, amps = compute_fft_batch(windows, self.fs, "hann")
+        feats = extract_features(windows, self.fs, self.bands, "hann", amps)
+        dominant = freqs[amps[0, 1:].argmax(axis=0) + 1]
+        return chunk.index, feats, dominant
+
+
+def _sensor_pipeline(sensor, fs: int, window: int, hop: int | None, bands: dict) -> Pipeline:
+    return Pipeline(
+        Scale(ACC_LSB_TO_G),
+        Integrate(fs),
+        Calibrate(get_calibration(sensor)),
+        Bandpass(fs),
+        Window(window, hop),
+        _Summarize(fs, bands),
+    )
+
+
+def _worker_main(k: int, epoch: int, input_name: str, output_name: str,
+                 workers: int, slots: int, slot_samples: int, fs: int,
+                 window: int, hop: int | None, bands: dict, tasks, done) -> None:
+    """Bucle de un trabajador: ranura → pipeline del sensor → fila de resultado.
+
+    ``epoch`` distingue esta instancia de las anteriores del mismo ``k``: un
+    aviso tardío de un proceso ya reiniciado no debe liberar una ranura que
+    se ha vuelto a asignar.
+    """
+    inp = attach_shared_memory(input_name)
+    out = attach_shared_memory(output_name)
+    samples = _input_layout(inp.buf, slots, slot_samples)
+    per_slot = windows_per_slot(slot_samples, hop)
+    heartbeat, rows = _output_layout(out.buf, workers, slots, per_slot, len(bands))
+    pipes: dict[Hashable, Pipeline] = {}
+    try:
+        while True:
+            heartbeat[k] = time.time()
+            try:
+                task = tasks.get(timeout=HEALTH_INTERVAL / 2)
+            except queue.Empty:
+                continue
+            if task is None:
+                break
+            if task[0] == _START_CAPTURE:
+                get_calibration(task[1]).start_capture()
+                continue
+            if task[0] == _SET_OFFSET:
+                get_calibration(task[1]).offset = np.asarray(task[2], dtype=float)
+                continue
+            slot, sensor, index, n, gap = task
+            pipe = pipes.get(sensor)
+            if pipe is None:
+                pipe = pipes[sensor] = _sensor_pipeline(sensor, fs, window, hop, bands)
+            emitted = pipe.push(Chunk(index, samples[slot, :n], gap))
+            rows[slot, :, 0] = 0.0
+            cal = get_calibration(sensor)
+            for row, item in zip(rows[slot], emitted):
+                _pack(row, *item, cal)
+            done.put((slot, k, epoch))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del samples, heartbeat, rows
+        inp.close()
+        out.close()
+
+# ──── Pool ─────────────────────────────────────────────────────────
+
+class ProcessingPool:
+    """Pool de procesos con reparto por sensor y ranuras en memoria compartida.
+
+    Parameters
+    ----------
+    workers : int
+        Procesos trabajadores.
+    fs : int
+        Frecuencia de muestreo en Hz.
+    window : int
+        Muestras por ventana de análisis.
+    hop : int | None
+        Muestras entre ventanas; ``None`` = una por bloque recibido.
+    bands : dict
+        Bandas de RMS (ver ``features.ISO_BANDS``).
+    slots : int
+        Ranuras de entrada/salida en memoria compartida.
+    slot_samples : int
+        Capacidad de cada ranura en muestras.
+    on_result : callable | None
+        ``on_result(SensorResult)``, llamado desde el hilo colector.
+    health_interval : float
+        Segundos entre revisiones de salud.
+
+    Notas
+    -----
+    Contadores: ``submitted`` y ``dropped`` (muestras), ``processed``
+    (bloques) y ``restarts``.
+    """
+
+    def __init__(self, workers: int = POOL_WORKERS, fs: int = FS, window: int = FS,
+                 hop: int | None = None, bands: dict = ISO_BANDS,
+                 slots: int = POOL_SLOTS, slot_samples: int = SLOT_SAMPLES,
+                 on_result: Callable | None = None,
+                 health_interval: float = HEALTH_INTERVAL):
+        if workers < 1 or slots < workers:
+            raise ValueError("Se necesita al menos un trabajador y una ranura por trabajador")
+        self.workers = workers
+        self.fs = fs
+        self.window = window
+        self.hop = hop
+        self.bands = dict(bands)
+        self.slots = slots
+        self.slot_samples = slot_samples
+        self.on_result = on_result
+        self.health_interval = health_interval
+
+        self.submitted = 0
+        self.dropped = 0
+        self.processed = 0
+        self.restarts = 0
+
+        self._ctx = mp.get_context("spawn")
+        self._running = False
+        self._lock = threading.Lock()
+        self._free: queue.Queue = queue.Queue()
+        self._inflight: dict[int, tuple] = {}        # ranura -> (trabajador, época, sensor)
+        self._epoch: list[int] = [0] * workers       # generación de cada trabajador
+        self._shard: dict[Hashable, int] = {}        # sensor -> trabajador
+        self._last_index: dict[Hashable, int] = {}
+        self._resync: set = set()                    # sensores con muestras descartadas
+        self._latest: dict[Hashable, SensorResult] = {}
+        self._offsets: dict[Hashable, np.ndarray] = {}   # último offset confirmado
+        self._procs: list = [None] * workers
+        self._tasks: list = [None] * workers
+        self._threads: list[threading.Thread] = []
+
+    # ── Ciclo de vida ──────────────────────────────────────────────
+    def start(self) -> None:
+        """Crear la memoria compartida, lanzar trabajadores e hilos auxiliares."""
+        in_size = self.slots * self.slot_samples * 3 * np.dtype(np.int16).itemsize
+        per_slot = windows_per_slot(self.slot_samples, self.hop)
+        out_size = 8 * (self.workers
+                        + self.slots * per_slot * _row_floats(len(self.bands)))
+        self._in_shm = shared_memory.SharedMemory(create=True, size=in_size)
+        self._out_shm = shared_memory.SharedMemory(create=True, size=out_size)
+        self._samples = _input_layout(self._in_shm.buf, self.slots, self.slot_samples)
+        self._heartbeat, self._rows = _output_layout(
+            self._out_shm.buf, self.workers, self.slots, per_slot, len(self.bands)
+        )
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._done = self._ctx.Queue()
+        for k in range(self.workers):
+            self._spawn(k)
+        self._running = True
+        for target in (self._collect, self._monitor):
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._threads.append(t)
+        print(f"[POOL] {self.workers} trabajadores en marcha")
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Detener trabajadores e hilos y liberar la memoria compartida."""
+        self._running = False
+        for t in self._threads:
+            t.join()
+        self._threads.clear()
+        for k, proc in enumerate(self._procs):
+            if proc is None:
+                continue
+            self._tasks[k].put(None)
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        self._procs = [None] * self.workers
+        del self._samples, self._heartbeat, self._rows
+        for shm in (self._in_shm, self._out_shm):
+            shm.close()
+            shm.unlink()
+
+    def _spawn(self, k: int) -> None:
+        self._heartbeat[k] = time.time()   # margen para el arranque
+        self._tasks[k] = self._ctx.Queue()
+        self._epoch[k] += 1
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(k, self._epoch[k], self._in_shm.name, self._out_shm.name, self.workers,
+                  self.slots, self.slot_samples, self.fs, self.window,
+                  self.hop, self.bands, self._tasks[k], self._done),
+            daemon=True,
+        )
+        proc.start()
+        self._procs[k] = proc
+
+    # ── Entrada ────────────────────────────────────────────────────
+    def worker_for(self, sensor: Hashable) -> int:
+        """Trabajador asignado a ``sensor`` (reparto rotatorio al aparecer)."""
+        with self._lock:
+            if sensor not in self._shard:
+                self._shard[sensor] = len(self._shard) % self.workers
+            return self._shard[sensor]
+
+    def submit(self, sensor: Hashable, index: np.ndarray, data: np.ndarray,
+               timeout: float = SUBMIT_TIMEOUT) -> bool:
+        """Encolar un lote ``(index (n,), muestras int16 (n, 3))`` de ``sensor``.
+
+        Devuelve False si hubo que descartar alguna parte por falta de ranuras.
+        """
+        k = self.worker_for(sensor)
+        ok = True
+        # Varios hilos de attach() comparten contadores y estado por sensor
+        with self._lock:
+            lost = sensor in self._resync   # lo siguiente a un descarte va tras un hueco
+            last = self._last_index.get(sensor)
+        for start, segment, gap in split_on_gaps(index, data, last):
+            for a in range(0, segment.shape[0], self.slot_samples):
+                part = segment[a:a + self.slot_samples]
+                n = part.shape[0]
+                try:
+                    slot = self._free.get(timeout=timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.submitted += n
+                        self.dropped += n
+                    ok = False
+                    lost = True
+                    continue
+                self._samples[slot, :n] = part
+                with self._lock:
+                    self.submitted += n
+                    self._inflight[slot] = (k, self._epoch[k], sensor)
+                    tasks = self._tasks[k]
+                tasks.put((slot, sensor, start + a, n, (gap and a == 0) or lost))
+                lost = False
+        with self._lock:
+            if lost:
+                self._resync.add(sensor)
+            else:
+                self._resync.discard(sensor)
+            if index.size:
+                self._last_index[sensor] = int(index[-1])
+        return ok
+
+    def start_capture(self, sensor: Hashable) -> None:
+        """Iniciar la captura de calibración de ``sensor`` en su trabajador.
+
+        El progreso se ve en ``SensorResult.calibrating`` y el offset
+        resultante en ``SensorResult.offset``.
+        """
+        k = self.worker_for(sensor)
+        with self._lock:
+            self._tasks[k].put((_START_CAPTURE, sensor))
+
+    def attach(self, sensor: Hashable, get_batch: Callable) -> threading.Thread:
+        """Alimentar el pool desde ``get_batch(timeout=..., with_index=True)``."""
+        def feed():
+            while self._running:
+                try:
+                    index, data = get_batch(timeout=0.2, with_index=True)
+                except socket.timeout:
+                    continue
+                self.submit(sensor, index, data)
+
+        t = threading.Thread(target=feed, daemon=True)
+        t.start()
+        self._threads.append(t)
+        return t
+
+    # ── Salida ─────────────────────────────────────────────────────
+    def latest(self, sensor: Hashable) -> SensorResult | None:
+        """Último resultado de ``sensor`` (o None)."""
+        return self._latest.get(sensor)
+
+    def sensors(self) -> list:
+        return list(self._shard)
+
+    def _collect(self) -> None:
+        while self._running:
+            try:
+                slot, k, epoch = self._done.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            with self._lock:
+                # Una ranura recuperada tras reiniciar a su trabajador ya no es
+                # suya, aunque se haya vuelto a asignar al mismo ``k``
+                owner = self._inflight.get(slot)
+                if owner is None or owner[:2] != (k, epoch):
+                    continue
+                del self._inflight[slot]
+            results = [_unpack(owner[2], row, self.bands)
+                       for row in self._rows[slot] if row[0]]
+            self._free.put(slot)
+            self.processed += 1
+            for result in results:
+                self._latest[result.sensor] = result
+                if not result.calibrating:
+                    self._offsets[result.sensor] = result.offset
+                if self.on_result is not None:
+                    try:
+                        self.on_result(result)
+                    except Exception as e:
+                        print(f"[ERROR] ProcessingPool on_result: {e}")
+
+    def _monitor(self) -> None:
+        while self._running:
+            time.sleep(self.health_interval)
+            now = time.time()
+            for k, proc in enumerate(self._procs):
+                if not self._running:
+                    return
+                stalled = now - self._heartbeat[k] > HEARTBEAT_TIMEOUT
+                if proc.is_alive() and not stalled:
+                    continue
+                reason = "sin latido" if proc.is_alive() else f"código {proc.exitcode}"
+                print(f"[POOL] Trabajador {k} caído ({reason}); reiniciando")
+                self._restart(k)
+
+    def _restart(self, k: int) -> None:
+        proc = self._procs[k]
+        if proc.is_alive():
+            proc.terminate()
+        proc.join()
+        with self._lock:
+            lost = [slot for slot, owner in self._inflight.items() if owner[0] == k]
+            for slot in lost:
+                del self._inflight[slot]
+                self._free.put(slot)
+            self._spawn(k)
+            # El proceso nuevo no conoce las calibraciones: restaurar offsets
+            # (una captura interrumpida hay que repetirla)
+            for sensor, w in self._shard.items():
+                if w == k and sensor in self._offsets:
+                    self._tasks[k].put((_SET_OFFSET, sensor, self._offsets[sensor]))
+        self.restarts += 1
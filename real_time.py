@@ -4,14 +4,19 @@ Archivo: real_time.py
 Este script simula un flujo de datos “en tiempo real”:
 - Cada segundo (800 muestras a 800 Hz) genera un bloque de datos nuevos con 
   simulate_vibration_data.
-- Convierte ese bloque de aceleraciones a velocidades.
-- Aplica filtrado pasabanda + ventana de Hanning sobre ese bloque.
-- Calcula la FFT de ese bloque.
-- Sobreescribe los archivos velocity.csv y fft_result.csv para que el dashboard
-  los lea y actualice sus gráficos.
+- Convierte ese bloque de aceleraciones a velocidades (integración continua
+  entre bloques) y lo añade a una ventana móvil de WINDOW_S segundos.
+- Aplica filtrado pasabanda + ventana de Hanning sobre esa ventana.
+- Calcula la FFT de la ventana.
+- Publica la velocidad filtrada, su espectro y su RMS en el canal de
+  memoria compartida (live_channel) y sobreescribe velocity.csv y
+  fft_result.csv.
 
-Para ejecutar en paralelo al dashboard:
+Las etapas son las de pipeline.py; este script solo las configura.
+
+Para ejecutar en paralelo al dashboard (que lee el canal en otro proceso):
     python real_time.py
+    python app.py vibraciones_live
 
 Requisitos:
 - numpy, pandas, scipy, y que 
@@ -19,57 +24,67 @@ Requisitos:
 """
 
 import time
-import pandas as pd
 import numpy as np
 
-from conversion           import acc_to_velocity
-from signal_processing    import (
-    bandpass_filter,
-    apply_hanning_window,
-    compute_fft,
+from signal_processing    import DEFAULT_FMAX, DEFAULT_FMIN
+from storage              import AsyncStorageWriter
+from live_channel         import CHANNEL_NAME, LiveChannelPublisher
+from pipeline             import (
+    Chunk,
+    Integrate,
+    Pipeline,
+    Publish,
+    Spectrum,
+    Store,
+    Window,
 )
-from storage              import save_velocity_csv, save_fft_csv
 
 # Parámetros de “streaming”
 FS = 800             # Hz
 DURATION = 1.0       # segundos por bloque (800 muestras)
 SLEEP_TIME = 1.0     # segundos entre bloques (puedes ajustar)
+WINDOW_S = 1.0       # segundos de la ventana móvil analizada (≥ DURATION)
+
+
+def bloques():
+    """Fuente: un bloque de aceleración cada SLEEP_TIME segundos."""
+    n = int(DURATION * FS)
+    index = 0
+    while True:
+        # Reemplazar con captura real
+        yield Chunk(index, np.zeros((n, 3)))
+        index += n
+        time.sleep(SLEEP_TIME)
+
 
 def main():
     """
     Bucle infinito que cada SLEEP_TIME segundos genera y procesa un nuevo bloque
-    de datos de 1 segundo (800 muestras), y sobreescribe los CSVs usados por el dashboard.
+    de datos de 1 segundo (800 muestras), lo publica en el canal compartido y
+    sobreescribe los CSVs.
     """
-    bloque_id = 0
-    while True:
-        # 1) Obtener bloque de aceleración (reemplazar con captura real)
-        accel = np.zeros((int(DURATION * FS), 3))
+    window = int(WINDOW_S * FS)
+    writer = AsyncStorageWriter()   # E/S en segundo plano, reemplazo atómico
+    canal = LiveChannelPublisher(CHANNEL_NAME, window=window)
+    descartadas = 0
 
-        # 2) Convertir a velocidad (mm/s)
-        vel = acc_to_velocity(accel, FS)
-
-        # 3) Filtrar y ventana para el bloque completo
-        filtered = bandpass_filter(vel, FS)
-        windowed = apply_hanning_window(filtered)
-
-        # 4) FFT del bloque
-        freqs, amps = compute_fft(windowed, FS)
-
-        # 5) Guardar “velocity.csv” y “fft_result.csv” (sobrescribe cada vez)
-        #    Usamos el mismo nombre de archivo cada iteración para que el dashboard lo re-lea.
-        try:
-            save_velocity_csv(vel, FS, "velocity.csv")
-            save_fft_csv(freqs, amps, "fft_result.csv")
-        except Exception as e:
-            print(f"[ERROR al guardar CSVs] {e}")
-
-        # 6) Mensaje en consola para confirmar que el bloque salió
-        print(f"[{time.strftime('%H:%M:%S')}] Bloque #{bloque_id:03d} generado y guardado.")
-        bloque_id += 1
-
-        # 7) Dormir antes de la siguiente iteración
-        time.sleep(SLEEP_TIME)
+    # Si el disco va lento se descarta la escritura en lugar de frenar el bucle.
+    pipe = Pipeline(
+        Integrate(FS),
+        Window(window, prefill=True),
+        Spectrum(FS, bandpass=(DEFAULT_FMIN, DEFAULT_FMAX)),
+        Publish(canal),
+        Store(FS, writer),
+    )
+    try:
+        for bloque_id, _ in enumerate(pipe.run(bloques())):
+            if writer.dropped != descartadas:
+                descartadas = writer.dropped
+                print(f"[AVISO] Escrituras descartadas: {descartadas}")
+            print(f"[{time.strftime('%H:%M:%S')}] Bloque #{bloque_id:03d} generado y guardado.")
+    finally:
+        canal.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,106 @@
+"""Buffer circular preasignado para ventanas móviles de muestras tri-axiales.
+
+Sustituye el patrón ``buf = np.vstack([buf[m:], nuevo])``, que reserva y
+copia la ventana completa en cada paquete. Aquí la memoria se reserva una
+sola vez, cada eje se guarda contiguo (``(canales, capacidad)``) y
+``append`` solo copia las muestras nuevas. ``view_last`` devuelve vistas sin
+copia (uno o dos tramos, según la ventana cruce o no el final del anillo) y
+``unwrap`` produce una copia contigua en orden cronológico solo cuando se
+pide.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class RingBuffer:
+    """Anillo de capacidad fija de muestras ``(n, canales)``.
+
+    Parameters
+    ----------
+    capacity : int
+        Número máximo de muestras retenidas.
+    channels : int
+        Número de ejes por muestra.
+    dtype : numpy dtype
+        Tipo de las muestras almacenadas.
+    """
+
+    def __init__(self, capacity: int, channels: int = 3, dtype=float):
+        if capacity <= 0:
+            raise ValueError("capacity debe ser positivo")
+        self.capacity = int(capacity)
+        self.channels = int(channels)
+        self._data = np.zeros((self.channels, self.capacity), dtype=dtype)
+        self._head = 0    # posición donde se escribirá la próxima muestra
+        self._size = 0
+        self.total = 0    # muestras añadidas desde el último clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    def is_full(self) -> bool:
+        return self._size == self.capacity
+
+    def clear(self) -> None:
+        """Vaciar el anillo sin liberar memoria."""
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def append(self, block: np.ndarray) -> None:
+        """Añadir un bloque ``(m, canales)`` (o una muestra ``(canales,)``)."""
+        arr = np.asarray(block)
+        if arr.ndim == 1:
+            arr = arr[None, :]
+        if arr.ndim != 2 or arr.shape[1] != self.channels:
+            raise ValueError(f"block debe tener forma (m, {self.channels})")
+        m = arr.shape[0]
+        self.total += m
+        if m >= self.capacity:
+            self._data[:] = arr[-self.capacity:].T
+            self._head = 0
+            self._size = self.capacity
+            return
+        first = min(m, self.capacity - self._head)
+        self._data[:, self._head:self._head + first] = arr[:first].T
+        self._data[:, :m - first] = arr[first:].T
+        self._head = (self._head + m) % self.capacity
+        self._size = min(self._size + m, self.capacity)
+
+    def view_last(self, n: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Últimas ``n`` muestras como dos vistas ``(k, canales)`` sin copia.
+
+        La concatenación de ambos tramos está en orden cronológico; el
+        segundo está vacío si la ventana no cruza el final del anillo. Las
+        vistas dejan de ser válidas tras el siguiente ``append``.
+        """
+        n = self._size if n is None else int(n)
+        if not 0 <= n <= self._size:
+            raise ValueError(f"n debe estar entre 0 y {self._size}")
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[:, start:start + n].T, self._data[:, :0].T
+        return self._data[:, start:].T, self._data[:, :self._head].T
+
+    def unwrap(self, n: int | None = None, out: np.ndarray | None = None) -> np.ndarray:
+        """Copia contigua ``(n, canales)`` de las últimas ``n`` muestras."""
+        a, b = self.view_last(n)
+        if out is None:
+            out = np.empty((a.shape[0] + b.shape[0], self.channels), dtype=self.dtype)
+        out[:a.shape[0]] = a
+        out[a.shape[0]:] = b
+        return out
+
+    def mean(self, n: int | None = None) -> np.ndarray:
+        """Media por eje de las últimas ``n`` muestras, sin desenrollar."""
+        a, b = self.view_last(n)
+        count = a.shape[0] + b.shape[0]
+        if count == 0:
+            raise ValueError("El buffer está vacío")
+        return (a.sum(axis=0) + b.sum(axis=0)) / count
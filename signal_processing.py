@@ -9,8 +9,11 @@ comparten una frecuencia de muestreo global FS=800 Hz.
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import NamedTuple
+
 import numpy as np
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
 
 FS = 800  # Hz
 ORDER = 4
@@ -18,28 +21,71 @@ DEFAULT_FMIN = 5.0
 DEFAULT_FMAX = 400.0
 
 
+WINDOWS = {
+    "hann": np.hanning,
+    "hann_periodic": lambda n: np.hanning(n + 1)[:-1],   # la de scipy.signal
+    "boxcar": np.ones,
+}
+
+
+class SpectralPlan(NamedTuple):
+    """Arrays precalculados para FFT de bloques de N muestras."""
+
+    window: np.ndarray | None  # (N,) o None si no se aplica ventana
+    freqs: np.ndarray          # (N//2 + 1,)
+    scale: np.ndarray          # (N//2 + 1,) 2/N salvo DC y Nyquist (1/N)
+    power: float               # media de window**2 (1.0 sin ventana)
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+@lru_cache(maxsize=32)
+def get_window(kind: str, n: int) -> np.ndarray:
+    """Ventana de longitud ``n`` cacheada (solo lectura)."""
+    if kind not in WINDOWS:
+        raise ValueError(f"Ventana desconocida: {kind}")
+    return _readonly(WINDOWS[kind](n).astype(float))
+
+
+@lru_cache(maxsize=32)
+def spectral_plan(n: int, fs: float = FS, window: str | None = None) -> SpectralPlan:
+    """Obtener (y cachear) ventana, frecuencias y factores de amplitud."""
+    if n < 1:
+        raise ValueError("n debe ser positivo")
+    freqs = np.fft.rfftfreq(n, 1.0 / fs)
+    scale = np.full(freqs.size, 2.0 / n)
+    scale[0] = 1.0 / n
+    if n % 2 == 0:
+        scale[-1] = 1.0 / n
+    win = None if window is None else get_window(window, n)
+    power = 1.0 if win is None else float(np.mean(win ** 2))
+    return SpectralPlan(win, _readonly(freqs), _readonly(scale), power)
+
+
 def apply_hanning_window(signal: np.ndarray) -> np.ndarray:
     """Aplicar una ventana de Hanning a una señal 1-D o 2-D."""
     arr = np.asarray(signal, dtype=float)
     if arr.ndim == 1:
-        window = np.hanning(arr.size)
-        return arr * window
+        return arr * get_window("hann", arr.size)
     if arr.ndim == 2:
-        window = np.hanning(arr.shape[0])[:, None]
-        return arr * window
+        return arr * get_window("hann", arr.shape[0])[:, None]
     raise ValueError("signal debe ser un array de 1 o 2 dimensiones")
 
 
-def bandpass_filter(
-    signal: np.ndarray,
-    fs: int,
+@lru_cache(maxsize=32)
+def design_bandpass(
+    fs: float,
     fmin: float = DEFAULT_FMIN,
     fmax: float = DEFAULT_FMAX,
+    order: int = ORDER,
 ) -> np.ndarray:
-    """Filtrado Butterworth pasabanda para señal tri-axial."""
-    if signal.ndim != 2 or signal.shape[1] != 3:
-        raise ValueError("signal debe ser un array de forma (N, 3)")
+    """Diseñar (una sola vez por combinación) un Butterworth pasabanda en SOS.
 
+    El array devuelto es compartido por la caché: no debe modificarse.
+    """
     nyq = 0.5 * fs
     if fmax >= nyq:
         fmax = nyq * 0.999
@@ -48,11 +94,72 @@ def bandpass_filter(
     if not (0 < low < high < 1):
         raise ValueError("Frecuencias de corte no válidas")
 
-    b, a = butter(ORDER, [low, high], btype="bandpass", analog=False)
-    filtered = np.zeros_like(signal, dtype=float)
-    for axis in range(3):
-        filtered[:, axis] = filtfilt(b, a, signal[:, axis])
-    return filtered
+    sos = butter(order, [low, high], btype="bandpass", analog=False, output="sos")
+    return sos
+
+
+@lru_cache(maxsize=32)
+def design_lowpass(fs: float, fc: float, order: int = ORDER) -> np.ndarray:
+    """Diseñar (una sola vez por combinación) un Butterworth pasabajos en SOS.
+
+    Como en :func:`design_bandpass`, el array es compartido y no debe
+    modificarse.
+    """
+    wn = fc / (0.5 * fs)
+    if not 0 < wn < 1:
+        raise ValueError("Frecuencia de corte no válida")
+    return butter(order, wn, btype="lowpass", output="sos")
+
+
+def bandpass_filter(
+    signal: np.ndarray,
+    fs: int,
+    fmin: float = DEFAULT_FMIN,
+    fmax: float = DEFAULT_FMAX,
+) -> np.ndarray:
+    """Filtrado Butterworth pasabanda (fase cero) para señal tri-axial."""
+    if signal.ndim != 2 or signal.shape[1] != 3:
+        raise ValueError("signal debe ser un array de forma (N, 3)")
+
+    sos = design_bandpass(fs, fmin, fmax, ORDER)
+    return sosfiltfilt(sos, np.asarray(signal, dtype=float), axis=0)
+
+
+class StreamingBandpass:
+    """Filtro pasabanda causal que conserva su estado entre bloques (N, 3).
+
+    El diseño se toma de la caché de :func:`design_bandpass` y el estado
+    ``zi`` de ``sosfilt`` se guarda entre llamadas, por lo que filtrar un
+    paquete cuesta O(paquete) y el resultado no depende de cómo se troceó
+    la señal. A diferencia de :func:`bandpass_filter` no es de fase cero.
+    """
+
+    def __init__(
+        self,
+        fs: int = FS,
+        fmin: float = DEFAULT_FMIN,
+        fmax: float = DEFAULT_FMAX,
+        order: int = ORDER,
+    ):
+        self.sos = design_bandpass(fs, fmin, fmax, order)
+        self._zi: np.ndarray | None = None
+
+    def reset(self) -> None:
+        """Descartar el estado interno del filtro."""
+        self._zi = None
+
+    def process(self, signal: np.ndarray) -> np.ndarray:
+        """Filtrar un bloque (N, 3) continuando desde el bloque anterior."""
+        arr = np.asarray(signal, dtype=float)
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError("signal debe ser un array de forma (N, 3)")
+        if arr.shape[0] == 0:
+            return arr.copy()
+        if self._zi is None:
+            # Arranque en régimen permanente para el primer valor recibido
+            self._zi = sosfilt_zi(self.sos)[:, :, None] * arr[0]
+        out, self._zi = sosfilt(self.sos, arr, axis=0, zi=self._zi)
+        return out
 
 
 def compute_rms(signal: np.ndarray) -> np.ndarray:
@@ -62,29 +169,62 @@ def compute_rms(signal: np.ndarray) -> np.ndarray:
 
 
 def compute_fft(signal: np.ndarray, fs: int = FS):
-    """Obtener frecuencia y amplitud de la FFT de una señal ya en mm/s."""
-    arr = np.asarray(signal, dtype=float)
-    if arr.ndim == 1:
-        N = arr.size
-        freqs = np.fft.rfftfreq(N, 1.0 / fs)
-        Y = np.fft.rfft(arr)
-        mag = np.abs(Y) * (2.0 / N)
-        mag[0] = np.abs(Y[0]) / N
-        if N % 2 == 0:
-            mag[-1] = np.abs(Y[-1]) / N
-        return freqs, mag
+    """Obtener frecuencia y amplitud de la FFT de una señal ya en mm/s.
 
-    if arr.ndim == 2:
-        N = arr.shape[0]
-        freqs = np.fft.rfftfreq(N, 1.0 / fs)
-        amps = np.zeros((freqs.size, arr.shape[1]), dtype=float)
-        for axis in range(arr.shape[1]):
-            Y = np.fft.rfft(arr[:, axis])
-            mag = np.abs(Y) * (2.0 / N)
-            mag[0] = np.abs(Y[0]) / N
-            if N % 2 == 0:
-                mag[-1] = np.abs(Y[-1]) / N
-            amps[:, axis] = mag
-        return freqs, amps
-
-    raise ValueError("signal debe ser 1-D o 2-D")
\ No newline at end of file
+    El vector de frecuencias devuelto es compartido (caché) y de solo lectura.
+    """
+    arr = np.asarray(signal, dtype=float)
+    if arr.ndim not in (1, 2):
+        raise ValueError("signal debe ser 1-D o 2-D")
+
+    plan = spectral_plan(arr.shape[0], fs)
+    Y = np.fft.rfft(arr, axis=0)
+    amps = np.abs(Y)
+    amps *= plan.scale if arr.ndim == 1 else plan.scale[:, None]
+    return plan.freqs, amps
+
+
+def compute_fft_batch(
+    windows: np.ndarray,
+    fs: int = FS,
+    window: str | None = "hann",
+    out: np.ndarray | None = None,
+):
+    """FFT de una pila de bloques ``(B, N, 3)`` en una sola llamada.
+
+    Parameters
+    ----------
+    windows : np.ndarray, shape (B, N, 3)
+        Bloques en el dominio del tiempo (sin ventana aplicada).
+    fs : int
+        Frecuencia de muestreo en Hz.
+    window : str | None
+        Ventana a aplicar (``"hann"``, ``"boxcar"`` o ``None``).
+    out : np.ndarray, shape (B, N//2 + 1, 3), opcional
+        Buffer donde escribir las amplitudes para reutilizarlo entre
+        llamadas.
+
+    Returns
+    -------
+    freqs : np.ndarray, shape (N//2 + 1,)
+    amps : np.ndarray, shape (B, N//2 + 1, 3)
+        Misma normalización que :func:`compute_fft` aplicada sobre
+        ``apply_hanning_window(bloque)``.
+    """
+    arr = np.asarray(windows, dtype=float)
+    if arr.ndim != 3 or arr.shape[2] != 3:
+        raise ValueError("windows debe ser un array de forma (B, N, 3)")
+
+    plan = spectral_plan(arr.shape[1], fs, window)
+    if plan.window is not None:
+        arr = arr * plan.window[:, None]
+    Y = np.fft.rfft(arr, axis=1)
+
+    shape = (arr.shape[0], plan.freqs.size, 3)
+    if out is None:
+        out = np.empty(shape, dtype=float)
+    elif out.shape != shape:
+        raise ValueError(f"out debe tener forma {shape}")
+    np.abs(Y, out=out)
+    out *= plan.scale[:, None]
+    return plan.freqs, out
@@ -0,0 +1,131 @@
+"""Espectro incremental mediante DFT deslizante (sliding DFT).
+
+Mantiene la DFT de las últimas ``N`` muestras tri-axiales y la actualiza con
+cada paquete recibido en O(bins × muestras_nuevas), en lugar de recalcular
+una FFT completa de la ventana. La ventana de Hann se aplica en el dominio
+de la frecuencia (convolución de tres términos), y cada ``resync_every``
+muestras el estado se recalcula con una FFT exacta para eliminar la deriva
+numérica acumulada por la recursión.
+
+La normalización de amplitud es la misma que la de
+``signal_processing.compute_fft`` (2/N, y 1/N para DC y Nyquist).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from signal_processing import FS, spectral_plan
+
+
+class SlidingDFT:
+    """DFT deslizante tri-axial sobre una ventana de ``n`` muestras.
+
+    Parameters
+    ----------
+    n : int
+        Longitud de la ventana de análisis (resolución ``fs / n``).
+    fs : int
+        Frecuencia de muestreo en Hz.
+    window : str | None
+        ``"hann"`` aplica una ventana de Hann periódica en frecuencia;
+        ``None`` devuelve el espectro sin ventana.
+    resync_every : int | None
+        Número de muestras entre recálculos exactos (por defecto ``n``).
+
+    Notes
+    -----
+    La ventana de Hann periódica difiere de ``np.hanning(n)`` (simétrica)
+    en O(1/n); con ``window=None`` el resultado coincide con
+    ``compute_fft`` sobre la misma ventana.
+    """
+
+    def __init__(
+        self,
+        n: int = FS,
+        fs: int = FS,
+        window: str | None = "hann",
+        resync_every: int | None = None,
+    ):
+        if window not in ("hann", None):
+            raise ValueError("window debe ser 'hann' o None")
+        self.n = n
+        self.fs = fs
+        self.window = window
+        self.resync_every = resync_every or n
+
+        plan = spectral_plan(n, fs)
+        self.freqs = plan.freqs
+        self._scale = plan.scale[:, None]
+        self._k = np.arange(self.freqs.size)
+
+        self._buf = np.zeros((n, 3), dtype=float)
+        self._pos = 0  # índice de la muestra más antigua en _buf
+        self._X = np.zeros((self.freqs.size, 3), dtype=complex)
+        self._since_resync = 0
+        self._twiddles: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    def _get_twiddles(self, m: int) -> tuple[np.ndarray, np.ndarray]:
+        """Rotación r**m y matriz r**(m-i) para ``m`` muestras nuevas."""
+        tw = self._twiddles.get(m)
+        if tw is None:
+            step = 2j * np.pi * self._k / self.n
+            rot = np.exp(step * m)[:, None]
+            kernel = np.exp(step[:, None] * np.arange(m, 0, -1)[None, :])
+            tw = self._twiddles[m] = (rot, kernel)
+        return tw
+
+    def reset(self) -> None:
+        """Vaciar la ventana y el espectro."""
+        self._buf[:] = 0.0
+        self._pos = 0
+        self._X[:] = 0.0
+        self._since_resync = 0
+
+    def resync(self) -> None:
+        """Recalcular el estado con una FFT exacta de la ventana actual."""
+        ordered = np.roll(self._buf, -self._pos, axis=0)
+        self._X[:] = np.fft.rfft(ordered, axis=0)
+        self._since_resync = 0
+
+    def update(self, block: np.ndarray) -> None:
+        """Incorporar un bloque ``(m, 3)`` de muestras nuevas."""
+        arr = np.asarray(block, dtype=float)
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError("block debe ser un array de forma (m, 3)")
+        m = arr.shape[0]
+        if m == 0:
+            return
+        if m >= self.n:
+            self._buf[:] = arr[-self.n:]
+            self._pos = 0
+            self.resync()
+            return
+
+        idx = (self._pos + np.arange(m)) % self.n
+        delta = arr - self._buf[idx]
+        rot, kernel = self._get_twiddles(m)
+        self._X *= rot
+        self._X += kernel @ delta
+
+        self._buf[idx] = arr
+        self._pos = (self._pos + m) % self.n
+        self._since_resync += m
+        if self._since_resync >= self.resync_every:
+            self.resync()
+
+    def spectrum(self, out: np.ndarray | None = None):
+        """Devolver ``(freqs, amps)`` con amps de forma ``(n//2 + 1, 3)``."""
+        X = self._X
+        if self.window == "hann":
+            # Extensión con simetría conjugada para los vecinos k-1 y k+1
+            ext = np.empty((X.shape[0] + 2, 3), dtype=complex)
+            ext[1:-1] = X
+            ext[0] = np.conj(X[1 % X.shape[0]])
+            ext[-1] = np.conj(X[self.n - X.shape[0]])
+            X = 0.5 * ext[1:-1] - 0.25 * (ext[:-2] + ext[2:])
+        if out is None:
+            out = np.empty(X.shape, dtype=float)
+        np.abs(X, out=out)
+        out *= self._scale
+        return self.freqs, out
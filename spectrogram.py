@@ -0,0 +1,224 @@
+"""Estimación espectral promediada: Welch, STFT solapada y cascada (waterfall).
+
+``compute_fft`` da un único periodograma por bloque: ruidoso y usando cada
+muestra una sola vez. Aquí las ventanas se solapan (``hop`` < ``nperseg``)
+y los espectros de cada trama se promedian:
+
+- ``welch``: PSD de Welch de una señal completa (como ``scipy.signal.welch``
+  con ``detrend=False``).
+- ``StreamingSTFT``: la misma estimación de forma incremental. Las muestras
+  recibidas se guardan una sola vez y cada ``update`` solo transforma las
+  tramas nuevas que ya están completas; el promedio (lineal, exponencial o
+  retención de picos) y la cascada de las últimas tramas se actualizan con
+  ellas.
+
+Escalas: ``"amplitude"`` usa la normalización de ``compute_fft`` (mm/s de
+pico por bin) y ``"psd"`` la densidad espectral de potencia unilateral
+((mm/s)²/Hz). Los promedios lineal y exponencial se hacen en potencia.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ring_buffer import RingBuffer
+from signal_processing import FS, spectral_plan
+
+SCALINGS = ("amplitude", "psd")
+AVERAGING = (None, "linear", "exponential", "peak")
+WATERFALL_FRAMES = 120
+EXP_ALPHA = 0.2
+# Las PSD usan la Hann periódica, como scipy.signal.welch/stft
+PSD_WINDOWS = {"hann": "hann_periodic"}
+
+
+def _frames(signal: np.ndarray, nperseg: int, hop: int) -> np.ndarray:
+    """Vista ``(F, nperseg, 3)`` de las tramas completas, sin copiar."""
+    view = sliding_window_view(signal, nperseg, axis=0)[::hop]
+    return view.transpose(0, 2, 1)
+
+
+def _window_for(window: str | None, scaling: str) -> str | None:
+    return PSD_WINDOWS.get(window, window) if scaling == "psd" else window
+
+
+def _power_weights(nperseg: int, fs: float, window: str | None, scaling: str) -> np.ndarray:
+    """Factores ``(bins,)`` que convierten ``|Y|²`` en la escala pedida (al cuadrado)."""
+    window = _window_for(window, scaling)
+    plan = spectral_plan(nperseg, fs, window)
+    if scaling == "amplitude":
+        return plan.scale ** 2
+    win = np.ones(nperseg) if plan.window is None else plan.window
+    weights = np.full(plan.freqs.size, 2.0 / (fs * np.sum(win ** 2)))
+    weights[0] /= 2.0
+    if nperseg % 2 == 0:
+        weights[-1] /= 2.0
+    return weights
+
+
+def frame_power(frames: np.ndarray, fs: float = FS, window: str | None = "hann",
+                scaling: str = "psd") -> np.ndarray:
+    """Potencia por trama ``(F, bins, 3)`` de un lote de tramas ``(F, N, 3)``.
+
+    Con ``scaling="amplitude"`` es el cuadrado de la amplitud de
+    ``compute_fft``; con ``"psd"``, la densidad espectral de potencia
+    (con ``"hann"`` periódica, ver ``PSD_WINDOWS``).
+    """
+    if scaling not in SCALINGS:
+        raise ValueError(f"scaling debe ser uno de {SCALINGS}")
+    n = frames.shape[1]
+    plan = spectral_plan(n, fs, _window_for(window, scaling))
+    data = frames if plan.window is None else frames * plan.window[:, None]
+    Y = np.fft.rfft(data, axis=1)
+    power = Y.real ** 2 + Y.imag ** 2
+    power *= _power_weights(n, fs, window, scaling)[:, None]
+    return power
+
+
+def welch(signal: np.ndarray, fs: float = FS, nperseg: int = FS,
+          hop: int | None = None, window: str | None = "hann"):
+    """PSD de Welch de una señal ``(N, 3)``: devuelve ``(freqs, psd (bins, 3))``.
+
+    Coincide con ``scipy.signal.welch(..., detrend=False)`` con la misma
+    ventana (Hann periódica) y solape.
+    """
+    arr = np.asarray(signal, dtype=float)
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError("signal debe ser un array de forma (N, 3)")
+    if arr.shape[0] < nperseg:
+        raise ValueError("La señal es más corta que nperseg")
+    hop = hop or nperseg // 2
+    psd = frame_power(_frames(arr, nperseg, hop), fs, window, "psd").mean(axis=0)
+    return spectral_plan(nperseg, fs).freqs, psd
+
+
+class StreamingSTFT:
+    """STFT solapada incremental con promedio y cascada.
+
+    Parameters
+    ----------
+    nperseg : int
+        Muestras por trama (resolución ``fs / nperseg``).
+    hop : int | None
+        Avance entre tramas (por defecto ``nperseg // 2``, 50 % de solape).
+    fs : int
+        Frecuencia de muestreo en Hz.
+    window : str | None
+        Ventana de cada trama.
+    scaling : str
+        ``"amplitude"`` o ``"psd"``.
+    averaging : str | None
+        ``"linear"`` (media desde el último ``reset``), ``"exponential"``
+        (peso ``alpha`` a la trama nueva), ``"peak"`` (máximo) o ``None``
+        (última trama).
+    alpha : float
+        Factor del promedio exponencial.
+    frames : int
+        Tramas retenidas en la cascada.
+    """
+
+    def __init__(
+        self,
+        nperseg: int = FS,
+        hop: int | None = None,
+        fs: int = FS,
+        window: str | None = "hann",
+        scaling: str = "amplitude",
+        averaging: str | None = "linear",
+        alpha: float = EXP_ALPHA,
+        frames: int = WATERFALL_FRAMES,
+    ):
+        if scaling not in SCALINGS:
+            raise ValueError(f"scaling debe ser uno de {SCALINGS}")
+        if averaging not in AVERAGING:
+            raise ValueError(f"averaging debe ser uno de {AVERAGING}")
+        self.nperseg = nperseg
+        self.hop = hop or nperseg // 2
+        if not 0 < self.hop <= nperseg:
+            raise ValueError("hop debe estar entre 1 y nperseg")
+        self.fs = fs
+        self.window = window
+        self.scaling = scaling
+        self.averaging = averaging
+        self.alpha = alpha
+        self.freqs = spectral_plan(nperseg, fs).freqs
+
+        bins = self.freqs.size
+        self._waterfall = RingBuffer(frames, channels=bins * 3)
+        self._times = RingBuffer(frames, channels=1)
+        self._avg = np.zeros((bins, 3))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Vaciar tramas pendientes, promedio y cascada."""
+        with self._lock:
+            self._pending = np.empty((0, 3))
+            self._start = 0          # índice absoluto de _pending[0]
+            self._avg[:] = 0.0
+            self.count = 0           # tramas promediadas
+            self._waterfall.clear()
+            self._times.clear()
+
+    def update(self, block: np.ndarray) -> int:
+        """Añadir muestras ``(m, 3)``; devuelve cuántas tramas nuevas se calcularon."""
+        arr = np.asarray(block, dtype=float)
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError("block debe ser un array de forma (m, 3)")
+        with self._lock:
+            data = np.concatenate((self._pending, arr)) if self._pending.size else arr
+            if data.shape[0] < self.nperseg:
+                self._pending = data.copy()
+                return 0
+            frames = _frames(data, self.nperseg, self.hop)
+            power = frame_power(frames, self.fs, self.window, self.scaling)
+            n_new = power.shape[0]
+
+            consumed = n_new * self.hop
+            centers = self._start + self.hop * np.arange(n_new) + self.nperseg / 2
+            self._pending = data[consumed:].copy()
+            self._start += consumed
+
+            self._accumulate(power)
+            self._waterfall.append(self._to_output(power).reshape(n_new, -1))
+            self._times.append((centers / self.fs)[:, None])
+            return n_new
+
+    def _accumulate(self, power: np.ndarray) -> None:
+        n = power.shape[0]
+        if self.averaging == "linear":
+            self._avg += (power.sum(axis=0) - n * self._avg) / (self.count + n)
+        elif self.averaging == "exponential":
+            frames = power
+            if not self.count:
+                # La primera trama es el punto de partida (sin sesgo hacia cero)
+                self._avg[:] = power[0]
+                frames = power[1:]
+            for frame in frames:
+                self._avg += self.alpha * (frame - self._avg)
+        elif self.averaging == "peak":
+            np.maximum(self._avg, power.max(axis=0), out=self._avg)
+        else:
+            self._avg[:] = power[-1]
+        self.count += n
+
+    def _to_output(self, power: np.ndarray) -> np.ndarray:
+        return np.sqrt(power) if self.scaling == "amplitude" else power
+
+    def average(self):
+        """Espectro promediado ``(freqs, valores (bins, 3))`` en la escala elegida."""
+        with self._lock:
+            return self.freqs, self._to_output(self._avg.copy())
+
+    def waterfall(self):
+        """Cascada: ``(tiempos (F,), freqs, valores (F, bins, 3))``, más antigua primero.
+
+        Los tiempos son el centro de cada trama en segundos desde el inicio.
+        """
+        with self._lock:
+            values = self._waterfall.unwrap().reshape(-1, self.freqs.size, 3)
+            times = self._times.unwrap()[:, 0]
+        return times, self.freqs, values
@@ -57,8 +57,79 @@ lectura en etapas posteriores o en el dashboard.
 
 from __future__ import annotations
 
+import glob
+import os
+import queue
+import tempfile
+import threading
+import time
+
 import numpy as np
-import pandas as pd
+
+
+def _format_csv(header: tuple[str, ...], columns: tuple[np.ndarray, ...]) -> str:
+    """Formatear columnas numéricas como CSV ``%.6f`` en una sola operación.
+
+    Equivale a ``DataFrame.to_csv(index=False, float_format="%.6f")`` sin
+    construir el DataFrame: una única interpolación ``%`` sobre el bloque.
+    """
+    arr = np.column_stack(columns).astype(float, copy=False)
+    row = ",".join(["%.6f"] * arr.shape[1]) + "\n"
+    body = (row * arr.shape[0]) % tuple(arr.ravel().tolist())
+    return ",".join(header) + "\n" + body
+
+
+def _read_umask() -> int:
+    """Umask del proceso sin modificarla: Linux la publica en /proc/self/status."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    return -1
+
+
+# Sin /proc solo se puede leer cambiándola: una única vez al importar, antes
+# de que haya otros hilos creando ficheros
+_UMASK = _read_umask()
+if _UMASK < 0:
+    _UMASK = os.umask(0o022)
+    os.umask(_UMASK)
+
+
+def _file_mode(filename: str) -> int:
+    """Permisos del fichero existente o, si no existe, los de ``open`` (0o666 & ~umask)."""
+    try:
+        return os.stat(filename).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+def _umask() -> int:
+    umask = _read_umask()
+    return _UMASK if umask < 0 else umask
+
+
+def _atomic_write(filename: str, text: str) -> None:
+    """Escribir en un temporal del mismo directorio y sustituir con os.replace.
+
+    ``mkstemp`` crea el temporal con 0600; se le dan los permisos que tendría
+    el fichero escrito directamente para no cerrar el acceso a otros usuarios.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    mode = _file_mode(filename)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".csv", dir=directory)
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            f.write(text)
+        os.chmod(tmp, mode)
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
 
 
 def save_acceleration_csv(accel_array: np.ndarray, fs: int, filename: str) -> None:
@@ -78,20 +149,14 @@ def save_acceleration_csv(accel_array: np.ndarray, fs: int, filename: str) -> No
     El archivo resultante contiene las columnas:
     "time", "ax", "ay", "az".
     El tiempo se calcula como ``k / fs`` y los valores se guardan con
-    seis decimales de precisión.
+    seis decimales de precisión. El fichero se sustituye de forma atómica.
     """
     if accel_array.ndim != 2 or accel_array.shape[1] != 3:
         raise ValueError("accel_array debe tener forma (N, 3)")
 
     N = accel_array.shape[0]
     times = np.arange(N) / fs
-    df = pd.DataFrame({
-        "time": times,
-        "ax": accel_array[:, 0],
-        "ay": accel_array[:, 1],
-        "az": accel_array[:, 2],
-    })
-    df.to_csv(filename, index=False, float_format="%.6f")
+    _atomic_write(filename, _format_csv(("time", "ax", "ay", "az"), (times, accel_array)))
 
 
 def save_velocity_csv(vel_array: np.ndarray, fs: int, filename: str) -> None:
@@ -110,20 +175,15 @@ def save_velocity_csv(vel_array: np.ndarray, fs: int, filename: str) -> None:
     -----
     El archivo resultante contiene las columnas:
     "time", "vx", "vy", "vz". El tiempo se calcula como ``k / fs`` y los
-    valores se guardan con seis decimales de precisión.
+    valores se guardan con seis decimales de precisión. El fichero se
+    sustituye de forma atómica.
     """
     if vel_array.ndim != 2 or vel_array.shape[1] != 3:
         raise ValueError("vel_array debe tener forma (N, 3)")
 
     N = vel_array.shape[0]
     times = np.arange(N) / fs
-    df = pd.DataFrame({
-        "time": times,
-        "vx": vel_array[:, 0],
-        "vy": vel_array[:, 1],
-        "vz": vel_array[:, 2],
-    })
-    df.to_csv(filename, index=False, float_format="%.6f")
+    _atomic_write(filename, _format_csv(("time", "vx", "vy", "vz"), (times, vel_array)))
 
 
 def save_fft_csv(freqs: np.ndarray, amps: np.ndarray, filename: str) -> None:
@@ -142,20 +202,355 @@ def save_fft_csv(freqs: np.ndarray, amps: np.ndarray, filename: str) -> None:
     -----
     El archivo resultante contiene las columnas:
     "frequency", "amp_x", "amp_y", "amp_z".
-    Se verifica que ``freqs`` y ``amps`` tengan la misma longitud.
+    Se verifica que ``freqs`` y ``amps`` tengan la misma longitud. El
+    fichero se sustituye de forma atómica.
     """
     if freqs.ndim != 1:
         raise ValueError("freqs debe ser un vector 1D")
     if amps.ndim != 2 or amps.shape[1] != 3 or amps.shape[0] != freqs.shape[0]:
         raise ValueError("amps debe tener forma (N_fft, 3) y coincidir con freqs")
 
-    df = pd.DataFrame({
-        "frequency": freqs,
-        "amp_x": amps[:, 0],
-        "amp_y": amps[:, 1],
-        "amp_z": amps[:, 2],
-    })
-    df.to_csv(filename, index=False, float_format="%.6f")
+    header = ("frequency", "amp_x", "amp_y", "amp_z")
+    _atomic_write(filename, _format_csv(header, (freqs, amps)))
+
+
+# ---------------------------------------------------------------------------
+# Escritura asíncrona de los CSV de resultados
+# ---------------------------------------------------------------------------
+
+STORAGE_QUEUE_JOBS = 8   # escrituras pendientes antes de aplicar backpressure
+
+
+class AsyncStorageWriter:
+    """Cola acotada + hilo escritor para ``save_*_csv``.
+
+    Las funciones ``save_*`` encolan una copia de los arrays y vuelven de
+    inmediato; un hilo en segundo plano formatea y sustituye el fichero de
+    forma atómica, así la latencia del disco nunca llega al bucle de
+    procesamiento.
+
+    Parameters
+    ----------
+    max_pending : int
+        Capacidad de la cola de escrituras.
+    block : bool
+        Si es True, ``save_*`` espera hasta ``timeout`` s cuando la cola
+        está llena (backpressure); si es False descarta la escritura.
+    timeout : float
+        Espera máxima con ``block=True``.
+
+    Notas
+    -----
+    Contadores: ``submitted``, ``written``, ``dropped`` y ``errors``
+    (con la última excepción en ``last_error``).
+    """
+
+    def __init__(self, max_pending: int = STORAGE_QUEUE_JOBS,
+                 block: bool = False, timeout: float = 0.1):
+        self.block = block
+        self.timeout = timeout
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Exception | None = None
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def save_acceleration(self, accel_array: np.ndarray, fs: int, filename: str) -> bool:
+        """Encolar :func:`save_acceleration_csv`; False si se descartó."""
+        return self._submit(save_acceleration_csv, np.array(accel_array), fs, filename)
+
+    def save_velocity(self, vel_array: np.ndarray, fs: int, filename: str) -> bool:
+        """Encolar :func:`save_velocity_csv`; False si se descartó."""
+        return self._submit(save_velocity_csv, np.array(vel_array), fs, filename)
+
+    def save_fft(self, freqs: np.ndarray, amps: np.ndarray, filename: str) -> bool:
+        """Encolar :func:`save_fft_csv`; False si se descartó."""
+        return self._submit(save_fft_csv, np.array(freqs), np.array(amps), filename)
+
+    def close(self) -> None:
+        """Esperar a que se escriba todo lo encolado y detener el hilo."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _submit(self, func, *args) -> bool:
+        self.submitted += 1
+        try:
+            if self.block:
+                self._queue.put((func, args), timeout=self.timeout)
+            else:
+                self._queue.put_nowait((func, args))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            func, args = job
+            try:
+                func(*args)
+                self.written += 1
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                print(f"[ERROR al guardar {args[-1]}] {e}")
+
+
+# ---------------------------------------------------------------------------
+# Almacén binario de datos crudos (int16) por segmentos
+# ---------------------------------------------------------------------------
+
+RAW_SAMPLE_DTYPE = np.dtype("<i2")      # x, y, z por muestra (6 bytes)
+RAW_INDEX_DTYPE = np.dtype([
+    ("seq", "<u2"),            # seq original del paquete (0xFFFF si relleno)
+    ("count", "<u2"),          # muestras del registro
+    ("sample_index", "<i8"),   # índice absoluto de la primera muestra
+    ("offset", "<i8"),         # posición (en muestras) dentro del segmento
+    ("timestamp", "<f8"),      # instante de recepción (s, epoch)
+])
+RAW_SEGMENT_BYTES = 64 * 1024 * 1024    # rotar al superar este tamaño
+RAW_SEGMENT_SECONDS = 3600.0            # ... o esta antigüedad
+RAW_FLUSH_INTERVAL = 1.0                # s máx. entre escrituras a disco
+RAW_QUEUE_BLOCKS = 4096                 # bloques pendientes antes de descartar
+
+
+class RawSegmentWriter:
+    """Escritor en segundo plano de muestras int16 crudas en segmentos.
+
+    Cada segmento es un par de ficheros ``raw_<t0_ms>.bin`` (registros
+    ``(N, 3)`` int16 contiguos, sin cabecera) y ``raw_<t0_ms>.idx`` (un
+    registro ``RAW_INDEX_DTYPE`` por bloque). Los bloques se encolan con
+    :meth:`append` y un hilo los escribe agrupados cada
+    ``flush_interval`` segundos, rotando por tamaño o por tiempo.
+
+    Parameters
+    ----------
+    directory : str
+        Carpeta destino (se crea si no existe).
+    max_segment_bytes : int
+        Tamaño máximo del fichero ``.bin`` antes de rotar.
+    max_segment_seconds : float
+        Antigüedad máxima de un segmento antes de rotar.
+    flush_interval : float
+        Tiempo máximo que un bloque espera en memoria.
+    queue_blocks : int
+        Capacidad de la cola; si se llena, los bloques se descartan y se
+        contabilizan en ``dropped_blocks``.
+
+    Notas
+    -----
+    Si una escritura falla (p. ej. disco lleno) el hilo lo informa, marca
+    ``failed`` (con la excepción en ``last_error``) y termina; desde ese
+    momento, igual que tras :meth:`close`, ``append`` devuelve False.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = RAW_SEGMENT_BYTES,
+        max_segment_seconds: float = RAW_SEGMENT_SECONDS,
+        flush_interval: float = RAW_FLUSH_INTERVAL,
+        queue_blocks: int = RAW_QUEUE_BLOCKS,
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.flush_interval = flush_interval
+        self.dropped_blocks = 0
+        self.written_samples = 0
+        self.failed = False
+        self.last_error: Exception | None = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._queue: queue.Queue = queue.Queue(queue_blocks)
+        self._data_file = None
+        self._index_file = None
+        self._segment_start = 0.0
+        self._segment_samples = 0
+        self._pending: list = []   # bloques leídos de la cola aún sin escribir
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def append(
+        self,
+        samples: np.ndarray,
+        seq: int = 0xFFFF,
+        sample_index: int = -1,
+        timestamp: float | None = None,
+    ) -> bool:
+        """Encolar un bloque ``(n, 3)`` int16; devuelve False si se descartó."""
+        if samples.ndim != 2 or samples.shape[1] != 3:
+            raise ValueError("samples debe tener forma (n, 3)")
+        if self.failed or self._stop.is_set():
+            self.dropped_blocks += 1
+            return False
+        ts = time.time() if timestamp is None else timestamp
+        item = (np.asarray(samples, dtype=RAW_SAMPLE_DTYPE), seq, sample_index, ts)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped_blocks += 1
+            return False
+        if self.failed:   # el hilo murió mientras tanto: nadie lo escribirá
+            self.dropped_blocks += 1
+            return False
+        return True
+
+    def close(self) -> None:
+        """Vaciar la cola, escribir lo pendiente y cerrar el segmento."""
+        self._stop.set()
+        self._thread.join()
+
+    # -- hilo escritor ------------------------------------------------------
+    def _run(self) -> None:
+        try:
+            self._loop()
+        except Exception as e:
+            self.last_error = e
+            self.failed = True
+            print(f"[ERROR] RawSegmentWriter ({self.directory}): {e}")
+            # Lo pendiente y lo que quedaba en la cola ya no se escribirá
+            self.dropped_blocks += len(self._pending)
+            self._pending = []
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.dropped_blocks += 1
+            try:
+                self._close_segment()
+            except OSError:
+                pass
+
+    def _loop(self) -> None:
+        self._pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                self._pending.append(self._queue.get(timeout=0.1))
+            except queue.Empty:
+                pass
+            if self._pending and (time.monotonic() >= deadline or self._stop.is_set()):
+                self._write(self._pending)
+                self._pending = []
+                deadline = time.monotonic() + self.flush_interval
+        if self._pending:
+            self._write(self._pending)
+            self._pending = []
+        self._close_segment()
+
+    def _open_segment(self, t0: float) -> None:
+        base = os.path.join(self.directory, f"raw_{int(t0 * 1000):013d}")
+        self._data_file = open(base + ".bin", "ab")
+        self._index_file = open(base + ".idx", "ab")
+        self._segment_start = t0
+        record = 3 * RAW_SAMPLE_DTYPE.itemsize
+        self._segment_samples = self._data_file.tell() // record
+
+    def _close_segment(self) -> None:
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+            self._data_file = self._index_file = None
+
+    def _write(self, items: list) -> None:
+        t0 = items[0][3]
+        if self._data_file is not None and (
+            self._data_file.tell() >= self.max_segment_bytes
+            or t0 - self._segment_start >= self.max_segment_seconds
+        ):
+            self._close_segment()
+        if self._data_file is None:
+            self._open_segment(t0)
+
+        index = np.empty(len(items), dtype=RAW_INDEX_DTYPE)
+        counts = np.fromiter((it[0].shape[0] for it in items), dtype=np.int64,
+                             count=len(items))
+        index["seq"] = [it[1] for it in items]
+        index["count"] = counts
+        index["sample_index"] = [it[2] for it in items]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        index["offset"] = self._segment_samples + starts
+        index["timestamp"] = [it[3] for it in items]
+
+        self._data_file.write(np.concatenate([it[0] for it in items]).tobytes())
+        self._index_file.write(index.tobytes())
+        self._data_file.flush()
+        self._index_file.flush()
+        total = int(counts.sum())
+        self._segment_samples += total
+        self.written_samples += total
+
+
+class RawSegmentReader:
+    """Lectura por rango de tiempo de los segmentos de :class:`RawSegmentWriter`.
+
+    Los ficheros ``.bin`` se abren con ``np.memmap``, de modo que una
+    consulta solo toca las páginas del rango pedido.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def segments(self) -> list[str]:
+        """Rutas base (sin extensión) de los segmentos, en orden temporal."""
+        paths = glob.glob(os.path.join(self.directory, "raw_*.idx"))
+        return sorted(p[:-4] for p in paths)
+
+    def open_segment(self, base: str):
+        """Devolver ``(index, samples)`` de un segmento; samples es un memmap (N, 3)."""
+        index = np.fromfile(base + ".idx", dtype=RAW_INDEX_DTYPE)
+        n = int(index["offset"][-1] + index["count"][-1]) if index.size else 0
+        if n == 0:
+            return index, np.zeros((0, 3), dtype=RAW_SAMPLE_DTYPE)
+        samples = np.memmap(base + ".bin", dtype=RAW_SAMPLE_DTYPE, mode="r",
+                            shape=(n, 3))
+        return index, samples
+
+    def read_range(self, t_start: float, t_end: float, fs: int = 800):
+        """Muestras registradas entre ``t_start`` y ``t_end`` (s, epoch).
+
+        Returns
+        -------
+        times : np.ndarray, shape (n,)
+            Instante de cada muestra: marca del bloque + ``k / fs``.
+        samples : np.ndarray, shape (n, 3)
+            Muestras int16 crudas.
+        sample_index : np.ndarray, shape (n,)
+            Índice absoluto de cada muestra (-1 si se desconoce).
+        """
+        times, chunks, indices = [], [], []
+        for base in self.segments():
+            index, samples = self.open_segment(base)
+            if index.size == 0 or index["timestamp"][0] > t_end:
+                continue
+            # Bloques cuyo intervalo [ts, ts + count/fs) corta el rango
+            block_end = index["timestamp"] + index["count"] / fs
+            sel = index[(block_end > t_start) & (index["timestamp"] <= t_end)]
+            if sel.size == 0:
+                continue
+            lo = int(sel["offset"][0])
+            hi = int(sel["offset"][-1] + sel["count"][-1])
+            k = np.arange(lo, hi) - np.repeat(sel["offset"], sel["count"])
+            t = np.repeat(sel["timestamp"], sel["count"]) + k / fs
+            first = np.repeat(sel["sample_index"], sel["count"])
+            idx = np.where(first >= 0, first + k, -1)
+            keep = (t >= t_start) & (t <= t_end)
+            times.append(t[keep])
+            chunks.append(np.asarray(samples[lo:hi])[keep])
+            indices.append(idx[keep])
+        if not chunks:
+            return (np.zeros(0), np.zeros((0, 3), dtype=RAW_SAMPLE_DTYPE),
+                    np.zeros(0, dtype=np.int64))
+        return np.concatenate(times), np.concatenate(chunks), np.concatenate(indices)
 
 
 if __name__ == "__main__":
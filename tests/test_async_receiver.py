@@ -0,0 +1,101 @@
+import asyncio
+import os
+import socket
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from acquisition.async_receiver import AsyncUDPReceiver, SyncReceiverAdapter
+from acquisition.udp_receiver import BATCH_SIZE, PACKET_DTYPE
+
+def _packet(seq, value):
+    pkt = np.zeros(1, dtype=PACKET_DTYPE)
+    pkt["seq"] = seq
+    pkt["cnt"] = BATCH_SIZE
+    pkt["samples"] = value
+    return pkt.tobytes()
+
+def test_demux_by_source_and_stream():
+    async def scenario():
+        rx = AsyncUDPReceiver("127.0.0.1", 0, key=lambda addr, pkt: addr[1])
+        await rx.start()
+        dest = rx.transport.get_extra_info("sockname")
+        tx_a = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx_b = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx_a.bind(("127.0.0.1", 0))
+        tx_b.bind(("127.0.0.1", 0))
+        for seq in range(3):
+            tx_a.sendto(_packet(seq, 1), dest)
+            tx_b.sendto(_packet(100 + seq, 2), dest)
+        got = []
+        async for seq, block in rx.stream(tx_b.getsockname()[1]):
+            got.append((seq, int(block[0, 0])))
+            if len(got) == 3:
+                break
+        rx.close()
+        tx_a.close()
+        tx_b.close()
+        return got, len(rx.sensors())
+
+    got, n_sensors = asyncio.run(scenario())
+    assert got == [(100, 2), (101, 2), (102, 2)]
+    assert n_sensors == 2
+
+def test_sync_adapter_get_next():
+    adapter = SyncReceiverAdapter(AsyncUDPReceiver("127.0.0.1", 0))
+    adapter.start()
+    try:
+        dest = adapter.receiver.transport.get_extra_info("sockname")
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx.sendto(_packet(5, 3), dest)
+        seq, block = adapter.get_next(timeout=1.0)
+        tx.close()
+        assert seq == 5 and block.shape == (BATCH_SIZE, 3)
+        try:
+            adapter.get_next(timeout=0.01)
+            assert False, "debería expirar"
+        except socket.timeout:
+            pass
+    finally:
+        adapter.stop()
+
+def test_get_next_requires_start_and_close_keeps_counters():
+    async def scenario():
+        rx = AsyncUDPReceiver("127.0.0.1", 0, queue_packets=2)
+        try:
+            await rx.get_next(timeout=0.01)
+            assert False, "debería exigir start()"
+        except RuntimeError:
+            pass
+        await rx.start()
+        buf = rx.buffer("a")
+        for seq in range(2):
+            buf.put(seq)
+        rx.close()
+        return buf.received, buf.dropped, [buf.queue.get_nowait() for _ in range(2)]
+
+    received, dropped, pending = asyncio.run(scenario())
+    assert (received, dropped) == (2, 0)
+    assert pending == [0, 1]
+
+def test_get_next_without_sensor_honours_a_single_deadline():
+    async def scenario():
+        rx = AsyncUDPReceiver("127.0.0.1", 0)
+        await rx.start()
+        loop = asyncio.get_running_loop()
+
+        def first_seen():   # el primer sensor aparece, pero sin más paquetes
+            rx._default_sensor = "a"
+            rx._first_packet.set()
+
+        loop.call_later(0.15, first_seen)
+        t0 = loop.time()
+        try:
+            await rx.get_next(timeout=0.2)
+        except socket.timeout:
+            pass
+        elapsed = loop.time() - t0
+        rx.close()
+        return elapsed
+
+    assert asyncio.run(scenario()) < 0.3
@@ -0,0 +1,36 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from calibration import Calibration, RunningStats, get_calibration
+
+def test_running_stats_match_numpy_over_blocks():
+    rng = np.random.default_rng(1)
+    data = rng.normal(5.0, 2.0, size=(1000, 3))
+    stats = RunningStats()
+    for block in np.array_split(data, [1, 7, 300, 301, 999]):
+        stats.add_block(block)
+    assert stats.count == 1000
+    np.testing.assert_allclose(stats.mean, data.mean(axis=0))
+    np.testing.assert_allclose(stats.variance, data.var(axis=0, ddof=1))
+
+def test_calibration_takes_blocks_and_stops_at_required_samples():
+    cal = Calibration(duration_s=0.5)   # 400 muestras
+    cal.add_block(np.ones((100, 3)))    # ignorado: no está capturando
+    cal.start_capture()
+    cal.add_block(np.full((300, 3), 2.0))
+    assert cal.capturing
+    cal.add_block(np.vstack([np.full((100, 3), 4.0), np.full((50, 3), 100.0)]))
+    assert cal.is_complete()
+    np.testing.assert_allclose(cal.compute_offset(), [2.5, 2.5, 2.5])
+    assert get_calibration("a") is get_calibration("a") is not get_calibration("b")
+
+def test_finish_is_idempotent_once_offset_is_computed():
+    cal = Calibration(duration_s=0.5)
+    assert not cal.finish()
+    cal.start_capture()
+    cal.add_block(np.full((400, 3), 3.0))
+    assert cal.finish()
+    assert not cal.finish()   # otro hilo llegando tarde no falla
+    np.testing.assert_allclose(cal.offset, 3.0)
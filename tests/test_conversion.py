@@ -0,0 +1,17 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from conversion import G_TO_M_S2, M_S_TO_MM_S, VelocityIntegrator, acc_to_velocity
+
+def test_constant_acceleration():
+    vel = acc_to_velocity(np.ones((801, 3)), 800)
+    assert np.allclose(vel[-1], G_TO_M_S2 * M_S_TO_MM_S)
+
+def test_streaming_matches_block():
+    rng = np.random.default_rng(0)
+    acc = rng.standard_normal((800, 3))
+    integ = VelocityIntegrator(800)
+    vel = np.vstack([integ.process(acc[i : i + 16]) for i in range(0, 800, 16)])
+    assert np.allclose(vel, acc_to_velocity(acc, 800))
@@ -0,0 +1,19 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from dashboard.downsample import lttb, lttb_indices
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500.0)
+    y[4321] = 25.0
+    idx = lttb_indices(x, y, 200)
+    assert idx.size == 200
+    assert idx[0] == 0 and idx[-1] == x.size - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+
+    xs, ys = lttb(x[:50], y[:50], 200)
+    np.testing.assert_array_equal(xs, x[:50])
@@ -0,0 +1,65 @@
+import os
+import socket
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from calibration import Calibration
+from dashboard.engine import ProcessingEngine
+
+def test_engine_publishes_snapshots_from_source():
+    batches = [(np.arange(k * 64, (k + 1) * 64), np.full((64, 3), 250, dtype=np.int16))
+               for k in range(10)]
+
+    def source(timeout, with_index):
+        if batches:
+            return batches.pop(0)
+        time.sleep(timeout)
+        raise socket.timeout
+
+    engine = ProcessingEngine(source, fs=800, window=128, cal=Calibration())
+    assert engine.latest().generation == 0
+    engine.ensure_started()
+    deadline = time.monotonic() + 2.0
+    while batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.2)
+    engine.stop()
+
+    snap = engine.latest()
+    assert snap.generation > 0
+    assert snap.velocity.shape == (128, 3) and snap.amps.shape == (65, 3)
+    assert not snap.velocity.flags.writeable
+
+def test_engine_publishes_the_expected_tone_window_and_rms():
+    fs, window, f, amplitude = 800, 128, 100.0, 250   # 100 Hz: bin 16 exacto
+    t = np.arange(25 * 64) / fs
+    raw = np.round(amplitude * np.cos(2 * np.pi * f * t)).astype(np.int16)
+    raw = np.repeat(raw[:, None], 3, axis=1)
+    batches = [(np.arange(k, k + 64), raw[k:k + 64]) for k in range(0, raw.shape[0], 64)]
+
+    def source(timeout, with_index):
+        if batches:
+            return batches.pop(0)
+        time.sleep(timeout)
+        raise socket.timeout
+
+    engine = ProcessingEngine(source, fs=fs, window=window, cal=Calibration())
+    engine.ensure_started()
+    deadline = time.monotonic() + 2.0
+    while batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    engine.stop()
+
+    # 1 g a 100 Hz integrado por trapecios: seno de amplitud g/ω·(ωT/2)/tan(ωT/2)
+    wt = 2 * np.pi * f / fs
+    peak = amplitude * 0.004 * 9.80665e3 / (2 * np.pi * f) * (wt / 2) / np.tan(wt / 2)
+    snap = engine.latest()
+    assert snap.samples == raw.shape[0]
+    np.testing.assert_allclose(snap.velocity, engine.buffer.unwrap())
+    np.testing.assert_allclose(np.abs(snap.velocity).max(axis=0), peak, rtol=0.02)
+    np.testing.assert_allclose(snap.rms, peak / np.sqrt(2), rtol=0.01)
+    assert np.all(snap.freqs[snap.amps.argmax(axis=0)] == f)
+    np.testing.assert_allclose(snap.amps[16], peak / 2, rtol=0.01)   # ganancia Hann 1/2
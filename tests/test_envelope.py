@@ -0,0 +1,34 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from envelope import EnvelopeAnalyzer, envelope_spectrum
+
+FS = 800
+
+def _bearing_signal(n, fault_hz, rng):
+    t = np.arange(n) / FS
+    carrier = np.sin(2 * np.pi * 260 * t)
+    modulation = 1.0 + 0.8 * np.cos(2 * np.pi * fault_hz * t)
+    low = 2.0 * np.sin(2 * np.pi * 25 * t)          # desbalance: fuera de la banda
+    x = modulation * carrier + low + 0.05 * rng.normal(size=n)
+    return np.repeat(x[:, None], 3, axis=1)
+
+def test_envelope_spectrum_reveals_modulation_frequency_in_batch():
+    rng = np.random.default_rng(6)
+    batch = np.stack([_bearing_signal(4 * FS, f, rng) for f in (37.0, 53.0)])
+    res = envelope_spectrum(batch, FS)
+    assert res.amps.shape[:2] == (2, res.freqs.size)
+    assert res.fs < FS
+    for b, f in enumerate((37.0, 53.0)):
+        peak = res.freqs[np.argmax(res.amps[b, :, 0])]
+        assert abs(peak - f) <= res.freqs[1]
+
+    single = envelope_spectrum(batch[1], FS)
+    np.testing.assert_allclose(single.amps[0], res.amps[1])
+
+    analyzer = EnvelopeAnalyzer(window=4 * FS)
+    for block in np.array_split(batch[0], 50):
+        analyzer.update(block)
+    np.testing.assert_allclose(analyzer.spectrum().amps, res.amps[0])
@@ -0,0 +1,37 @@
+import os
+import sys
+import numpy as np
+from scipy.stats import kurtosis, skew
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from features import StreamingFeatures, extract_features
+
+FS = 800
+
+def test_batch_features_match_reference():
+    rng = np.random.default_rng(2)
+    t = np.arange(FS) / FS
+    tone = 4.0 * np.sin(2 * np.pi * 50 * t)
+    windows = rng.normal(0.0, 0.1, size=(5, FS, 3)) + tone[None, :, None]
+    windows[2, 100, 1] = 40.0  # impacto
+
+    feats = extract_features(windows, FS)
+    ref_rms = np.sqrt((windows ** 2).mean(axis=1))
+    np.testing.assert_allclose(feats.rms, ref_rms)
+    np.testing.assert_allclose(feats.peak, np.abs(windows).max(axis=1))
+    np.testing.assert_allclose(feats.crest, feats.peak / ref_rms)
+    np.testing.assert_allclose(feats.skewness, skew(windows, axis=1))
+    np.testing.assert_allclose(feats.kurtosis, kurtosis(windows, axis=1, fisher=False))
+    assert feats.kurtosis[2, 1] > 3 * feats.kurtosis[0, 1]
+    # 50 Hz en la banda ISO: RMS de banda ≈ RMS total (salvo ruido/fugas)
+    np.testing.assert_allclose(feats.bands["iso_10_1000"][0], ref_rms[0], rtol=0.03)
+
+def test_streaming_features_match_batch():
+    rng = np.random.default_rng(3)
+    data = rng.normal(1.0, 2.0, size=(FS, 3))
+    stream = StreamingFeatures()
+    for block in np.array_split(data, 13):
+        stream.add_block(block)
+    got, ref = stream.features(), extract_features(data[None], FS)
+    for field in ("rms", "peak", "peak_to_peak", "crest", "skewness", "kurtosis"):
+        np.testing.assert_allclose(getattr(got, field), getattr(ref, field))
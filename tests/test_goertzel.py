@@ -0,0 +1,46 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from goertzel import ToneTracker, order_frequencies, targeted_dft, zoom_fft
+
+FS = 800
+F0 = 23.17
+
+def _signal(n, start=0):
+    t = (start + np.arange(n)) / FS
+    x = np.stack([
+        5.0 * np.cos(2 * np.pi * F0 * t + 0.3),
+        2.0 * np.cos(2 * np.pi * 2 * F0 * t - 1.0),
+        1.0 * np.cos(2 * np.pi * 50.0 * t),
+    ], axis=1)
+    return x
+
+def test_targeted_dft_measures_off_bin_tones():
+    freqs = order_frequencies(F0, orders=(1, 2), line_hz=50.0)[:3]
+    tones = targeted_dft(_signal(4 * FS), freqs, FS)
+    np.testing.assert_allclose(np.diag(tones.amps), [5.0, 2.0, 1.0], rtol=0.01)
+    np.testing.assert_allclose(np.diag(tones.phases), [0.3, -1.0, 0.0], atol=0.02)
+
+def test_tone_tracker_matches_direct_computation_per_packet():
+    freqs = [F0, 2 * F0, 50.0]
+    tracker = ToneTracker(freqs, n=FS, fs=FS, resync_every=10 * FS)
+    x = _signal(3 * FS + 48)
+    for block in np.array_split(x, len(x) // 16):
+        tracker.update(block)
+    tones = tracker.tones()
+    np.testing.assert_allclose(np.diag(tones.amps), [5.0, 2.0, 1.0], rtol=0.02)
+    np.testing.assert_allclose(np.diag(tones.phases), [0.3, -1.0, 0.0], atol=0.03)
+
+    tracker.resync()
+    np.testing.assert_allclose(tracker.tones().amps, tones.amps, atol=1e-9)
+
+def test_zoom_fft_resolves_close_tones():
+    t = np.arange(4 * FS) / FS
+    x = np.sin(2 * np.pi * 23.17 * t) + np.sin(2 * np.pi * 23.9 * t)
+    freqs, amps = zoom_fft(np.repeat(x[:, None], 3, axis=1), 20.0, 27.0, m=701)
+    np.testing.assert_allclose(np.diff(freqs), 0.01)
+    local = (amps[1:-1, 0] > amps[:-2, 0]) & (amps[1:-1, 0] > amps[2:, 0])
+    top = freqs[1:-1][local][np.argsort(amps[1:-1, 0][local])[-2:]]
+    np.testing.assert_allclose(np.sort(top), [23.17, 23.9], atol=0.02)
@@ -0,0 +1,23 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from live_channel import LiveChannelPublisher, LiveChannelSubscriber
+
+def test_publish_and_read_snapshot():
+    pub = LiveChannelPublisher(f"test_live_{os.getpid()}", window=32)
+    sub = LiveChannelSubscriber(pub.name)
+    try:
+        assert sub.read() is None
+        freqs = np.arange(17, dtype=float)
+        for k in range(1, 7):
+            gen = pub.publish(np.full((32, 3), k), freqs, np.full((17, 3), k), np.full(3, k))
+        snap = sub.read()
+        assert snap.generation == gen == 6
+        assert np.all(snap.velocity == 6) and np.all(snap.rms == 6)
+        assert np.array_equal(snap.freqs, freqs)
+        assert sub.read(since=snap.generation) is None
+    finally:
+        sub.close()
+        pub.close()
@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+from flask import Flask
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from dashboard.engine import _EngineThread
+from dashboard.live_stream import register_stream
+
+class _FakeEngine(_EngineThread):
+    def _run(self):
+        samples = 0
+        while self._running:
+            samples += 2
+            self._publish(samples, np.ones((64, 3)), np.arange(33.0),
+                          np.zeros((33, 3)), np.ones(3))
+            time.sleep(0.005)
+
+def test_stream_sends_full_window_then_rate_limited_deltas():
+    class App:
+        server = Flask(__name__)
+    engine = _FakeEngine(64)
+    register_stream(App, lambda: engine, 800)
+    response = App.server.test_client().get("/live/stream?rate=10", buffered=False)
+    messages, stamps = [], []
+    for chunk in response.response:
+        if chunk.startswith(b"data: "):
+            messages.append(json.loads(chunk[6:]))
+            stamps.append(time.monotonic())
+        if len(messages) == 3:
+            break
+    response.close()
+    engine.stop()
+
+    first, second = messages[0], messages[1]
+    assert len(first["time"]["x"][0]) == 64 and first["fft"]["x"] is not None
+    assert first["time"]["full"] and not second["time"]["full"]
+    assert second["fft"]["x"] is None
+    assert second["time"]["x"][0][0] == (first["time"]["x"][0][-1] * 800 + 1) / 800
+    assert stamps[2] - stamps[1] >= 0.09
@@ -0,0 +1,34 @@
+import os
+import sys
+import numpy as np
+from scipy.signal import lfilter
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from multirate import MultirateCascade, PolyphaseDecimator, design_decimator
+
+FS = 800
+
+def test_decimator_is_chunk_invariant_and_matches_fir():
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=(4000, 3))
+    whole = PolyphaseDecimator(8).process(x)
+    dec = PolyphaseDecimator(8)
+    chunked = np.vstack([dec.process(c) for c in np.array_split(x, 37)])
+    np.testing.assert_allclose(chunked, whole)
+
+    taps = design_decimator(8)[::-1]
+    padded = np.vstack([np.repeat(x[:1], taps.size - 1, axis=0), x])
+    ref = lfilter(taps, 1.0, padded, axis=0)[taps.size - 1::8]
+    np.testing.assert_allclose(whole, ref)
+
+def test_cascade_gives_fine_resolution_in_low_band():
+    t = np.arange(80 * FS) / FS
+    x = np.sin(2 * np.pi * 3.3 * t) + np.sin(2 * np.pi * 300.0 * t)
+    cascade = MultirateCascade((8,), FS, window=800)
+    for block in np.array_split(np.repeat(x[:, None], 3, axis=1), 200):
+        cascade.process(block)
+    freqs, amps = cascade.spectrum(1)
+    assert freqs[1] == 0.125
+    assert abs(freqs[np.argmax(amps[:, 0])] - 3.3) <= 0.125
+    # 300 Hz no debe plegarse en la banda 0–50 Hz
+    assert amps[freqs > 10, 0].max() < 1e-3 * amps[:, 0].max()
@@ -0,0 +1,35 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from peaks import HarmonicTracker, find_peaks
+from signal_processing import apply_hanning_window, compute_fft, compute_fft_batch
+
+FS = 800
+t = np.arange(FS) / FS
+
+def test_find_peaks_sub_bin_accuracy_in_batch():
+    f = np.array([23.17, 46.34, 11.59])
+    sig = np.sin(2 * np.pi * f[None, :] * t[:, None])
+    sig[:, 0] += 0.3 * np.sin(2 * np.pi * 120.6 * t)
+    freqs, amps = compute_fft_batch(np.stack([sig, 2 * sig]), FS)
+    peaks = find_peaks(freqs, amps, k=2)
+    assert peaks.freqs.shape == (2, 2, 3)
+    np.testing.assert_allclose(peaks.freqs[:, 0, :], np.broadcast_to(f, (2, 3)), atol=0.02)
+    np.testing.assert_allclose(peaks.freqs[0, 1, 0], 120.6, atol=0.02)
+    np.testing.assert_allclose(peaks.amps[1, 0], 2 * peaks.amps[0, 0])
+    assert np.isnan(peaks.freqs[0, 1, 1])   # el eje Y solo tiene un pico
+
+    coarse = find_peaks(freqs, amps[0], k=1, interpolation=None)
+    assert coarse.freqs[0, 0] == 23.0
+
+def test_harmonic_tracker_follows_speed_change():
+    tracker = HarmonicTracker(fmin=10, fmax=100)
+    for f0 in (23.17, 23.6, 24.1):
+        sig = sum(a * np.sin(2 * np.pi * h * f0 * t) for h, a in ((1, 3.0), (2, 1.0), (3, 0.5)))
+        sig = np.repeat(sig[:, None], 3, axis=1)
+        freqs, amps = compute_fft(apply_hanning_window(sig), FS)
+        state = tracker.update(freqs, amps)
+        np.testing.assert_allclose(state.freqs, [f0, 2 * f0, 3 * f0], atol=0.05)
+    assert state.locked
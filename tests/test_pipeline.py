@@ -0,0 +1,73 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from conversion import acc_to_velocity
+from pipeline import (
+    Chunk,
+    Integrate,
+    Pipeline,
+    Publish,
+    Scale,
+    Spectrum,
+    Window,
+    array_source,
+)
+
+
+def _windows(block):
+    x = np.random.default_rng(0).normal(size=(1000, 3))
+    pipe = Pipeline(Scale(0.004), Integrate(800), Window(200, hop=150))
+    return [c for c in pipe.run(array_source(x, block))]
+
+
+def test_window_output_independent_of_block_size():
+    a, b = _windows(37), _windows(1000)
+    assert [c.index for c in a] == [c.index for c in b] == [0, 150, 300, 450, 600, 750]
+    for ca, cb in zip(a, b):
+        np.testing.assert_allclose(ca.data, cb.data)
+
+    x = np.random.default_rng(0).normal(size=(1000, 3))
+    np.testing.assert_allclose(b[-1].data, acc_to_velocity(x * 0.004, 800)[750:950])
+
+
+def test_window_restarts_after_gap():
+    pipe = Pipeline(Window(100))
+    assert len(pipe.push(Chunk(0, np.ones((100, 3))))) == 1
+    assert pipe.push(Chunk(150, np.ones((60, 3)), gap=True)) == []
+    out = pipe.push(Chunk(210, np.ones((40, 3))))
+    assert [c.index for c in out] == [150]
+
+
+def test_spectrum_and_threaded_run():
+    t = np.arange(1600) / 800
+    x = np.repeat(np.sin(2 * np.pi * 50 * t)[:, None], 3, axis=1)
+    pipe = Pipeline(Window(800, hop=800), Spectrum(800))
+    res = list(pipe.run(array_source(x, 100), queue_size=2))
+    assert [a.index for a in res] == [0, 800]
+    assert res[0].freqs[res[0].amps[:, 0].argmax()] == 50
+    np.testing.assert_allclose(res[0].rms, np.sqrt(0.5), rtol=1e-6)
+
+
+def test_threaded_run_propagates_source_errors():
+    def source():
+        yield Chunk(0, np.zeros((10, 3)))
+        raise RuntimeError("fallo")
+
+    with pytest.raises(RuntimeError):
+        list(Pipeline(Window(5)).run(source(), queue_size=1))
+
+
+def test_publish_sends_the_filtered_window():
+    class Channel:
+        def publish(self, velocity, freqs, amps, rms):
+            self.velocity, self.rms = velocity, rms
+
+    channel = Channel()
+    x = np.random.default_rng(2).normal(size=(800, 3)) + 10.0
+    pipe = Pipeline(Window(800), Spectrum(800, bandpass=(5.0, 300.0)), Publish(channel))
+    (a,) = pipe.push(Chunk(0, x))
+    assert channel.velocity is a.filtered
+    np.testing.assert_allclose(channel.rms, np.sqrt((a.filtered ** 2).mean(axis=0)))
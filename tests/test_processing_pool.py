@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from processing_pool import ProcessingPool
+
+
+def _tone(freq, start, n, fs=800):
+    t = np.arange(start, start + n) / fs
+    x = 1000 * np.sin(2 * np.pi * freq * t)
+    return np.repeat(x[:, None], 3, axis=1).astype(np.int16)
+
+
+def _wait(cond, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return cond()
+
+
+def _feed(pool, start, blocks, block=400):
+    for k in range(start, start + blocks):
+        index = np.arange(k * block, (k + 1) * block)
+        pool.submit("a", index, _tone(40, k * block, block))
+        pool.submit("b", index, _tone(120, k * block, block))
+
+
+def test_pool_shards_sensors_and_restarts_workers():
+    pool = ProcessingPool(workers=2, window=800, slots=16, health_interval=0.1)
+    pool.start()
+    try:
+        assert pool.worker_for("a") != pool.worker_for("b")
+        _feed(pool, 0, 6)
+        assert _wait(lambda: pool.processed == 12)
+        a, b = pool.latest("a"), pool.latest("b")
+        np.testing.assert_allclose(a.dominant, 40)
+        np.testing.assert_allclose(b.dominant, 120)
+        assert a.index == 6 * 400 - 800
+        assert set(a.features.bands) == {"iso_10_1000", "iso_2_1000", "proceso"}
+        assert np.all(a.features.rms > 0)
+        assert not a.calibrating and np.all(a.offset == 0)
+
+        pool.start_capture("a")   # 2 s = 1600 muestras
+        _feed(pool, 6, 5)
+        assert _wait(lambda: pool.processed == 22)
+        a = pool.latest("a")
+        assert not a.calibrating and np.all(a.offset != 0)
+        assert np.all(pool.latest("b").offset == 0)
+
+        pool._procs[pool.worker_for("a")].kill()
+        assert _wait(lambda: pool.restarts == 1)
+        _feed(pool, 11, 4)
+        assert _wait(lambda: pool.latest("a").index == 15 * 400 - 800)
+        np.testing.assert_allclose(pool.latest("a").dominant, 40)
+        np.testing.assert_array_equal(pool.latest("a").offset, a.offset)
+        assert pool.dropped == 0
+    finally:
+        pool.close()
+
+
+def test_pool_reports_every_window_of_a_slot():
+    seen = []
+    pool = ProcessingPool(workers=1, window=400, hop=200, slot_samples=1024,
+                          slots=4, on_result=seen.append)
+    pool.start()
+    try:
+        pool.submit("a", np.arange(2048), _tone(40, 0, 2048))
+        assert _wait(lambda: pool.processed == 2)
+        assert [r.index for r in seen] == list(range(0, 1648 + 1, 200))
+    finally:
+        pool.close()
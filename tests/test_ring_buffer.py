@@ -0,0 +1,21 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from ring_buffer import RingBuffer
+
+def test_ring_buffer_matches_vstack_window():
+    rng = np.random.default_rng(0)
+    ring = RingBuffer(50)
+    ref = np.zeros((0, 3))
+    for m in (7, 13, 1, 40, 3, 64, 9):
+        block = rng.normal(size=(m, 3))
+        ring.append(block)
+        ref = np.vstack([ref, block])[-50:]
+        assert len(ring) == ref.shape[0]
+        np.testing.assert_array_equal(ring.unwrap(), ref)
+        a, b = ring.view_last(min(20, len(ring)))
+        np.testing.assert_array_equal(np.vstack([a, b]), ref[-20:])
+        assert np.shares_memory(a, ring._data)
+    np.testing.assert_allclose(ring.mean(), ref.mean(axis=0))
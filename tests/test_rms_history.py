@@ -0,0 +1,24 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from dashboard.rms_history import RmsHistory
+
+def test_history_is_bounded_and_uses_rollups_for_old_ranges():
+    hist = RmsHistory(raw_points=100, rollups=((1.0, 50), (10.0, 50)))
+    t = np.arange(0, 300, 0.1)   # 10 puntos/s durante 5 min
+    for ti in t:
+        hist.append(ti, np.array([ti, 1.0, -ti]))
+
+    recent = hist.query(t[-50], t[-1])
+    assert recent.resolution is None and recent.t.size == 50
+
+    whole = hist.query(max_points=100)
+    assert whole.resolution == 10.0 and whole.t.size <= 100
+    assert whole.t[0] == 0.0
+    np.testing.assert_allclose(whole.lo[0], [0.0, 1.0, -9.9])
+    np.testing.assert_allclose(whole.hi[0], [9.9, 1.0, 0.0])
+    np.testing.assert_allclose(whole.mean[0, 1], 1.0)
+
+    assert hist.query(max_points=5).t.size <= 5
@@ -0,0 +1,34 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from signal_processing import (
+    FS,
+    StreamingBandpass,
+    apply_hanning_window,
+    compute_fft,
+    compute_fft_batch,
+    design_bandpass,
+)
+
+def test_design_is_cached():
+    assert design_bandpass(FS, 5.0, 400.0, 4) is design_bandpass(FS, 5.0, 400.0, 4)
+
+def test_streaming_bandpass_chunking():
+    rng = np.random.default_rng(1)
+    sig = rng.standard_normal((800, 3))
+    chunked = StreamingBandpass(FS)
+    out = np.vstack([chunked.process(sig[i : i + 16]) for i in range(0, 800, 16)])
+    assert np.allclose(out, StreamingBandpass(FS).process(sig))
+
+def test_fft_batch_matches_single():
+    rng = np.random.default_rng(2)
+    blocks = rng.standard_normal((4, 800, 3))
+    out = np.empty((4, 401, 3))
+    freqs, amps = compute_fft_batch(blocks, FS, out=out)
+    assert amps is out
+    for b in range(4):
+        f, a = compute_fft(apply_hanning_window(blocks[b]), FS)
+        assert np.allclose(a, amps[b])
+    assert np.array_equal(f, freqs)
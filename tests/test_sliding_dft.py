@@ -0,0 +1,30 @@
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from signal_processing import FS, compute_fft
+from sliding_dft import SlidingDFT
+
+def _feed(sdft, sig):
+    for i in range(0, sig.shape[0], 16):
+        sdft.update(sig[i : i + 16])
+
+def test_matches_compute_fft_without_window():
+    rng = np.random.default_rng(3)
+    sig = rng.standard_normal((1200, 3))
+    sdft = SlidingDFT(FS, FS, window=None, resync_every=10 ** 9)
+    _feed(sdft, sig)
+    freqs, amps = sdft.spectrum()
+    f, a = compute_fft(sig[-FS:], FS)
+    assert np.allclose(freqs, f)
+    assert np.allclose(amps, a, atol=1e-9)
+
+def test_hann_in_frequency_domain():
+    rng = np.random.default_rng(4)
+    sig = rng.standard_normal((1000, 3))
+    sdft = SlidingDFT(FS, FS)
+    _feed(sdft, sig)
+    win = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(FS) / FS)
+    _, expected = compute_fft(sig[-FS:] * win[:, None], FS)
+    assert np.allclose(sdft.spectrum()[1], expected, atol=1e-9)
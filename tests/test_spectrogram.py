@@ -0,0 +1,37 @@
+import os
+import sys
+import numpy as np
+from scipy import signal as sps
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from spectrogram import StreamingSTFT, welch
+
+FS = 800
+
+def test_welch_matches_scipy():
+    x = np.random.default_rng(4).normal(size=(4 * FS, 3))
+    freqs, psd = welch(x, FS, nperseg=256)
+    ref_f, ref = sps.welch(x, FS, window="hann", nperseg=256, detrend=False, axis=0)
+    np.testing.assert_allclose(freqs, ref_f)
+    np.testing.assert_allclose(psd, ref, rtol=1e-10)
+
+def test_welch_matches_scipy_with_odd_segments_and_overlap():
+    x = np.random.default_rng(6).normal(size=(3 * FS, 3))
+    _, psd = welch(x, FS, nperseg=301, hop=75)
+    _, ref = sps.welch(x, FS, window="hann", nperseg=301, noverlap=226,
+                       detrend=False, axis=0)
+    np.testing.assert_allclose(psd, ref, rtol=1e-10)
+
+def test_streaming_stft_matches_batch_welch_in_any_chunking():
+    x = np.random.default_rng(5).normal(size=(3 * FS + 37, 3))
+    stft = StreamingSTFT(nperseg=256, scaling="psd", averaging="linear", frames=8)
+    total = sum(stft.update(chunk) for chunk in np.array_split(x, 29))
+    assert total == stft.count == (x.shape[0] - 256) // 128 + 1
+
+    _, ref = welch(x[:(total - 1) * 128 + 256], FS, nperseg=256)
+    np.testing.assert_allclose(stft.average()[1], ref)
+
+    times, freqs, values = stft.waterfall()
+    assert values.shape == (8, freqs.size, 3)
+    np.testing.assert_allclose(np.diff(times), 128 / FS)
+    assert times[-1] == ((total - 1) * 128 + 128) / FS
@@ -0,0 +1,83 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from storage import (
+    AsyncStorageWriter,
+    RawSegmentReader,
+    RawSegmentWriter,
+    save_velocity_csv,
+)
+
+def test_raw_segments_roundtrip_and_rotation(tmp_path):
+    writer = RawSegmentWriter(str(tmp_path), max_segment_bytes=200, flush_interval=0.0)
+    blocks = [np.full((16, 3), k, dtype=np.int16) for k in range(6)]
+    t0 = 1000.0
+    for k, block in enumerate(blocks):
+        writer.append(block, seq=k, sample_index=16 * k, timestamp=t0 + 0.02 * k)
+    writer.close()
+
+    reader = RawSegmentReader(str(tmp_path))
+    assert len(reader.segments()) > 1
+    times, samples, index = reader.read_range(t0, t0 + 1.0)
+    assert np.array_equal(samples, np.vstack(blocks))
+    assert np.array_equal(index, np.arange(96))
+
+    times, samples, _ = reader.read_range(t0 + 0.04, t0 + 0.059)
+    assert set(samples[:, 0]) == {2}
+
+def test_async_writer_replaces_csv(tmp_path):
+    target = str(tmp_path / "fft.csv")
+    writer = AsyncStorageWriter()
+    freqs = np.arange(5, dtype=float)
+    writer.save_fft(freqs, np.ones((5, 3)), target)
+    writer.save_fft(freqs, 2 * np.ones((5, 3)), target)
+    writer.close()
+    lines = open(target).read().splitlines()
+    assert lines[0] == "frequency,amp_x,amp_y,amp_z"
+    assert lines[1] == "0.000000,2.000000,2.000000,2.000000"
+    assert writer.written == 2 and writer.dropped == 0
+    assert os.listdir(tmp_path) == ["fft.csv"]
+
+def test_csv_mode_follows_umask_and_existing_file(tmp_path):
+    target = str(tmp_path / "velocity.csv")
+    old = os.umask(0o022)
+    try:
+        save_velocity_csv(np.zeros((4, 3)), 800, target)
+        assert os.stat(target).st_mode & 0o777 == 0o644
+        os.chmod(target, 0o664)
+        save_velocity_csv(np.ones((4, 3)), 800, target)
+        assert os.stat(target).st_mode & 0o777 == 0o664
+    finally:
+        os.umask(old)
+
+def test_csv_matches_pandas_output(tmp_path):
+    pd = pytest.importorskip("pandas")
+    vel = np.random.default_rng(1).normal(scale=50.0, size=(100, 3))
+    target = str(tmp_path / "velocity.csv")
+    save_velocity_csv(vel, 800, target)
+    df = pd.DataFrame({"time": np.arange(100) / 800, "vx": vel[:, 0],
+                       "vy": vel[:, 1], "vz": vel[:, 2]})
+    expected = df.to_csv(index=False, float_format="%.6f", lineterminator="\n")
+    assert open(target, newline="").read() == expected
+
+def test_raw_writer_reports_write_errors_and_rejects_after_close(tmp_path, monkeypatch):
+    writer = RawSegmentWriter(str(tmp_path), flush_interval=0.0)
+
+    def fail(items):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(writer, "_write", fail)
+    block = np.zeros((16, 3), dtype=np.int16)
+    assert writer.append(block)
+    writer._thread.join(2.0)
+    assert writer.failed and isinstance(writer.last_error, OSError)
+    assert not writer.append(block)
+    assert writer.dropped_blocks == 2
+    writer.close()
+
+    writer = RawSegmentWriter(str(tmp_path / "ok"))
+    writer.close()
+    assert not writer.append(block)
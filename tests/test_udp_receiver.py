@@ -0,0 +1,138 @@
+import errno
+import os
+import socket
+import sys
+import time
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from acquisition.sequencing import SequenceTracker
+from acquisition.udp_receiver import (
+    BATCH_SIZE,
+    PACKET_DTYPE,
+    UDPReceiver,
+    new_slab,
+    open_socket,
+    recv_packets,
+)
+from storage import RawSegmentReader
+
+def test_get_batch_keeps_every_packet_in_order():
+    rx = UDPReceiver("127.0.0.1", 0, ring_capacity=4 * BATCH_SIZE)
+    packets = np.zeros(6, dtype=PACKET_DTYPE)
+    packets["seq"] = np.arange(6)
+    packets["samples"] = np.arange(6)[:, None, None]
+    for pkt in packets:
+        rx._push(pkt[None])
+    batch = rx.get_batch()
+    assert batch.shape == (4 * BATCH_SIZE, 3)
+    assert np.array_equal(batch[::BATCH_SIZE, 0], [2, 3, 4, 5])
+    assert rx.overflow_samples == 2 * BATCH_SIZE
+
+def test_recv_packets_decodes_burst():
+    rx_sock = open_socket("127.0.0.1", 0)
+    tx_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        packets = np.zeros(3, dtype=PACKET_DTYPE)
+        packets["seq"] = [7, 8, 9]
+        packets["cnt"] = BATCH_SIZE
+        packets["samples"] = np.arange(BATCH_SIZE * 3).reshape(BATCH_SIZE, 3)
+        for pkt in packets:
+            tx_sock.sendto(pkt.tobytes(), rx_sock.getsockname())
+        tx_sock.sendto(b"corto", rx_sock.getsockname())
+        time.sleep(0.05)
+        got = recv_packets(rx_sock, new_slab(), timeout=1.0)
+        assert list(got["seq"]) == [7, 8, 9]
+        assert np.array_equal(got["samples"], packets["samples"])
+    finally:
+        rx_sock.close()
+        tx_sock.close()
+
+class _FailingSocket:
+    """Socket legible según select() cuyo recv_into falla con ``err``."""
+
+    def __init__(self, sock, err):
+        self.sock = sock
+        self.err = err
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def recv_into(self, buf):
+        raise OSError(self.err, os.strerror(self.err))
+
+def test_recv_packets_stops_on_closed_socket():
+    rx_sock = open_socket("127.0.0.1", 0)
+    tx_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        tx_sock.sendto(b"x", rx_sock.getsockname())
+        time.sleep(0.05)
+        got = recv_packets(_FailingSocket(rx_sock, errno.EBADF), new_slab(), timeout=1.0)
+        assert got.size == 0
+        with pytest.raises(OSError):
+            recv_packets(_FailingSocket(rx_sock, errno.ECONNRESET), new_slab(), timeout=1.0)
+    finally:
+        rx_sock.close()
+        tx_sock.close()
+
+def test_sequence_tracker_wraparound_and_loss():
+    tracker = SequenceTracker(BATCH_SIZE, reorder_window=2)
+    block = np.zeros((BATCH_SIZE, 3), dtype=np.int16)
+    released = []
+    for seq in (65534, 65535, 1, 0, 4, 5, 6, 0):
+        released += tracker.push(seq, block)
+    assert [r.index // BATCH_SIZE for r in released] == [0, 1, 2, 3, 6, 7, 8]
+    assert [r.gap for r in released] == [False] * 4 + [True, False, False]
+    assert tracker.stats.lost == 2
+    assert tracker.stats.reordered == 1
+    assert tracker.stats.duplicates == 1
+
+def test_sequence_tracker_resyncs_after_sender_restart():
+    tracker = SequenceTracker(BATCH_SIZE, reorder_window=2)
+    block = np.zeros((BATCH_SIZE, 3), dtype=np.int16)
+    released = []
+    for seq in list(range(5000, 5100)) + list(range(200)):
+        released += tracker.push(seq, block)
+    released += tracker.flush()
+    assert len(released) == 300
+    assert tracker.stats.duplicates == 0
+    assert tracker.stats.restarts == 1
+    index = np.array([r.index for r in released])
+    assert np.all(np.diff(index) > 0)
+    assert released[100].gap and released[100].index == 101 * BATCH_SIZE
+
+def test_sequence_tracker_needs_a_run_to_restart_after_a_short_jump():
+    tracker = SequenceTracker(BATCH_SIZE, reorder_window=2)
+    block = np.zeros((BATCH_SIZE, 3), dtype=np.int16)
+    released = []
+    # Rezagados aislados muy atrás: no reinician la numeración
+    for seq in list(range(100)) + [40, 100, 41, 101, 102]:
+        released += tracker.push(seq, block)
+    assert tracker.stats.restarts == 0
+    assert tracker.stats.duplicates == 2
+    # Una racha de paquetes consecutivos sí: el emisor volvió a empezar
+    for seq in range(20):
+        released += tracker.push(seq, block)
+    released += tracker.flush()
+    assert tracker.stats.restarts == 1
+    assert len(released) == 103 + 20
+    index = np.array([r.index for r in released])
+    assert np.all(np.diff(index) > 0)
+    assert released[103].gap and released[103].seq == 0
+
+def test_raw_blocks_of_one_burst_get_consecutive_times(tmp_path):
+    rx = UDPReceiver("127.0.0.1", 0, raw_dir=str(tmp_path))
+    packets = np.zeros(10, dtype=PACKET_DTYPE)
+    packets["seq"] = np.arange(10)
+    packets["samples"] = np.arange(10)[:, None, None]
+    rx._push(packets, timestamp=1000.0)
+    rx.raw_writer.close()
+
+    t0 = 1000.0 - 10 * BATCH_SIZE / 800
+    times, samples, index = RawSegmentReader(str(tmp_path)).read_range(t0, t0 + 0.005)
+    assert np.array_equal(index, np.arange(5))
+    assert np.all(np.diff(times) > 0)
+    assert set(samples[:, 0]) == {0}
+    times, _, index = RawSegmentReader(str(tmp_path)).read_range(t0, 1000.0)
+    assert np.array_equal(index, np.arange(10 * BATCH_SIZE))